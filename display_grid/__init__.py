@@ -1,17 +1,20 @@
 """This package provides tools for creating grid-based terminal and Pygame applications.
 
 It exports key classes and constants for easy access, including Grid implementations 
-(Grid, TermGrid, PygameGrid), Modules for application structure (Module, MainModule), 
+(Grid, TermGrid, PygameGrid), compositing Layers, Modules for application structure (Module, MainModule), 
 and various constants and utility functions.
 """
+import importlib
+import importlib.util
+import typing
 
-
-from display_grid.locals import TA_NONE, TA_BOLD, TA_ITALIC, TA_UNDERLINE, TA_BLINK, TA_INVERT, TA_STRIKETHROUGH, KM_NONE, KM_SHIFT, KM_META, KM_CTRL
-from display_grid.util import SUPPORTS_TRUECOLOR, BLOCKS, HORZ_BLOCKS, format_time, KeyEvent, MouseEvent, Event
-from display_grid.graphics import GRAPHICS, load_graphics
+from display_grid.locals import TA_NONE, TA_BOLD, TA_ITALIC, TA_UNDERLINE, TA_BLINK, TA_INVERT, TA_STRIKETHROUGH, TA_UNDERCURL, KM_NONE, KM_SHIFT, KM_META, KM_CTRL
+from display_grid.util import SUPPORTS_TRUECOLOR, BLOCKS, HORZ_BLOCKS, format_time, KeyEvent, MouseEvent, ResizeEvent, Event
+from display_grid.graphics import GRAPHICS, SPRITES, load_graphics, load_sprite_sheet, save_sprite_sheet, Sprite, Frame, Animation
 from display_grid.grid import Grid, SubGrid
+from display_grid.layers import Layer, Compositor
 from display_grid.modules import Module, MainModule
-from display_grid import locals, util, graphics, grid, modules
+from display_grid import locals, util, text, graphics, grid, layers, image, palette, ansi, stream, shared, render, modules, layout
 
 
 __all__ = [
@@ -23,6 +26,7 @@ __all__ = [
     "TA_BLINK",
     "TA_INVERT",
     "TA_STRIKETHROUGH",
+    "TA_UNDERCURL",
     "KM_NONE",
     "KM_SHIFT",
     "KM_META",
@@ -34,29 +38,53 @@ __all__ = [
     "format_time",
     "KeyEvent",
     "MouseEvent",
+    "ResizeEvent",
     "Event",
+    "text",
     "graphics",
     "GRAPHICS",
     "load_graphics",
+    "SPRITES",
+    "load_sprite_sheet",
+    "save_sprite_sheet",
+    "Sprite",
+    "Frame",
+    "Animation",
     "grid",
     "Grid",
     "SubGrid",
+    "layers",
+    "Layer",
+    "Compositor",
+    "image",
+    "palette",
+    "ansi",
+    "stream",
+    "shared",
+    "render",
     "modules",
     "Module",
     "MainModule",
+    "layout",
 ]
 
-try:
-    from display_grid import term_grid
-    from display_grid.term_grid import TermGrid
-    __all__ += ["term_grid", "TermGrid"]
+# The backends import urwid and pygame, which are slow to import and may not be
+# installed, so they are only imported when first accessed.
+_BACKENDS = {
+    "term_grid": ("term_grid", None, "urwid"),
+    "TermGrid": ("term_grid", "TermGrid", "urwid"),
+    "pygame_grid": ("pygame_grid", None, "pygame"),
+    "PygameGrid": ("pygame_grid", "PygameGrid", "pygame"),
+}
+__all__ += [name for name, (_, _, package) in _BACKENDS.items() if importlib.util.find_spec(package)]
 
-except ImportError:
-    pass
-try:
-    from display_grid import pygame_grid
-    from display_grid.pygame_grid import PygameGrid
-    __all__ += ["pygame_grid", "PygameGrid"]
 
-except ImportError:
-    pass
\ No newline at end of file
+def __getattr__(name: str) -> typing.Any:
+    """Imports a display backend the first time it is accessed."""
+    if name not in _BACKENDS:
+        raise AttributeError(f"module 'display_grid' has no attribute {name!r}")
+    module_name, attr, _ = _BACKENDS[name]
+    module = importlib.import_module(f"display_grid.{module_name}")
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
@@ -0,0 +1,440 @@
+"""This module generates ANSI escape sequences for terminal output.
+
+It provides a `TermProfile` describing what the terminal supports, detected
+once from the environment, and an SGR (Select Graphic Rendition) encoder for
+each color depth. The encoder for a profile is picked once, so the per-frame
+code that turns cell styles into escape sequences has no capability checks.
+"""
+import abc
+import os
+import functools
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+import display_grid as dg
+
+ESC = b"\x1b"
+CSI = ESC + b"["
+
+@dataclass(frozen=True)
+class TermProfile:
+    """Describes the capabilities of a terminal.
+
+    Attributes:
+        depth: The number of colors the terminal can show: 2**24, 256 or 16.
+        sync_update: Whether the terminal supports synchronized updates
+            (DEC private mode 2026), which prevent tearing of large frames.
+        styled_underline: Whether the terminal supports styled underlines
+            (SGR 4:x). If True, `dg.TA_UNDERCURL` draws a curly underline,
+            otherwise a straight one.
+        wide_chars: Whether the terminal draws East Asian wide characters
+            across two columns. If True, the cell after a wide character is
+            not written.
+    """
+
+    depth: int = 256
+    sync_update: bool = False
+    styled_underline: bool = False
+    wide_chars: bool = True
+
+
+# Terminals known to support synchronized updates and styled underlines,
+# identified by TERM_PROGRAM or a prefix of TERM.
+_MODERN_TERM_PROGRAMS = ("WezTerm", "iTerm.app", "ghostty", "contour")
+_MODERN_TERMS = ("xterm-kitty", "foot", "wezterm", "xterm-ghostty", "contour")
+
+
+@functools.cache
+def detect_profile() -> TermProfile:
+    """Detects the capabilities of the current terminal from the environment.
+
+    The result is cached, so the environment is only inspected once.
+
+    Returns:
+        The detected `TermProfile`.
+    """
+    term = os.environ.get("TERM", "")
+    program = os.environ.get("TERM_PROGRAM", "")
+    modern = program in _MODERN_TERM_PROGRAMS or term.startswith(_MODERN_TERMS) or "KITTY_WINDOW_ID" in os.environ
+
+    if dg.SUPPORTS_TRUECOLOR or modern:
+        depth = 2**24
+    elif "256" in term or program in ("Apple_Terminal", "vscode"):
+        depth = 256
+    else:
+        depth = 16
+
+    vte_version = os.environ.get("VTE_VERSION", "0")
+    vte = int(vte_version) if vte_version.isdigit() else 0
+    return TermProfile(
+        depth=depth,
+        sync_update=modern or "WT_SESSION" in os.environ or program == "vscode",
+        styled_underline=modern or vte >= 5102,
+    )
+
+
+# SGR parameters for every combination of text attribute bits.
+_ATTR_CODES = [
+    (dg.TA_BOLD, "1"),
+    (dg.TA_ITALIC, "3"),
+    (dg.TA_UNDERLINE, "4"),
+    (dg.TA_BLINK, "5"),
+    (dg.TA_INVERT, "7"),
+    (dg.TA_STRIKETHROUGH, "9"),
+    (dg.TA_UNDERCURL, "4:3"),
+]
+ATTR_SGR = ["".join(";" + code for bit, code in _ATTR_CODES if attrs & bit) for attrs in range(256)]
+
+# SGR parameters turning off every combination of text attribute bits.
+_ATTR_OFF_CODES = [
+    (dg.TA_BOLD, "22"),
+    (dg.TA_ITALIC, "23"),
+    (dg.TA_UNDERLINE, "24"),
+    (dg.TA_BLINK, "25"),
+    (dg.TA_INVERT, "27"),
+    (dg.TA_STRIKETHROUGH, "29"),
+    (dg.TA_UNDERCURL, "24"),
+]
+ATTR_OFF_SGR = ["".join(";" + code for bit, code in _ATTR_OFF_CODES if attrs & bit) for attrs in range(256)]
+
+# The attribute bits that have an SGR code. Other bits are left out of style
+# keys, as they do not change how a cell looks.
+_ATTR_MASK = sum(bit for bit, _ in _ATTR_CODES)
+
+
+@functools.cache
+def _attr_keys(styled_underline: bool) -> np.ndarray[np.int64]:
+    """Maps every attribute bitmask to the bits packed into style keys.
+
+    Bits without an SGR code are dropped. A curly underline replaces a
+    straight one, or becomes one if the terminal has no styled underlines.
+    """
+    attrs = np.arange(256, dtype=np.int64) & _ATTR_MASK
+    curly = (attrs & dg.TA_UNDERCURL) != 0
+    if styled_underline:
+        attrs[curly] &= ~dg.TA_UNDERLINE
+    else:
+        attrs[curly] = attrs[curly] & ~dg.TA_UNDERCURL | dg.TA_UNDERLINE
+    return attrs
+
+# Cached style transitions are dropped once there are this many.
+_MAX_TRANSITIONS = 1 << 16
+
+
+class SGREncoder(abc.ABC):
+    """Turns cell styles into SGR escape sequences for one color depth.
+
+    Styles are handled as packed integer keys, so a whole grid's styles can
+    be computed and compared with vectorized operations. Subclasses define
+    how keys are packed and how colors become SGR parameters; sequences are
+    cached by key.
+
+    Attributes:
+        depth (int): The color depth this encoder produces.
+        styled_underline (bool): Whether curly underlines are drawn as such.
+    """
+    depth = 0
+    # The background color is packed in the low bits of a key, above which
+    # is the foreground color.
+    _BG_BITS = 0
+
+    def __init__(self, styled_underline: bool = False) -> None:
+        """Constructs an SGREncoder with empty sequence caches.
+
+        Args:
+            styled_underline: Whether the terminal supports styled underlines.
+        """
+        self.styled_underline = styled_underline
+        self._attr_keys = _attr_keys(styled_underline)
+        self._cache: dict[int, bytes] = {}
+        self._transitions: dict[tuple[int, int], bytes] = {}
+
+    @abc.abstractmethod
+    def keys(
+        self,
+        fg: np.ndarray[np.uint8],
+        bg: np.ndarray[np.uint8],
+        attrs: np.ndarray[np.uint8],
+        dither: bool = False,
+    ) -> np.ndarray[np.int64]:
+        """Packs the style of every cell into an integer key.
+
+        Args:
+            fg: Foreground colors of shape (rows, cols, 3).
+            bg: Background colors of shape (rows, cols, 3).
+            attrs: Text attribute bitmasks of shape (rows, cols).
+            dither: Whether to dither colors that are mapped to a palette.
+
+        Returns:
+            An int64 array of shape (rows, cols).
+        """
+
+    def sgr(self, key: int) -> bytes:
+        """Returns the escape sequence that selects the style of `key`.
+
+        The sequence starts with a reset, so it does not depend on the style
+        that was active before it.
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            fg, bg = key >> self._BG_BITS & 0xFFFFFF, key & (1 << self._BG_BITS) - 1
+            params = "0" + ATTR_SGR[key >> 48] + self._fg(fg) + self._bg(bg)
+            seq = self._cache[key] = CSI + params.encode() + b"m"
+            return seq
+
+    def transition(self, prev: typing.Optional[int], key: int) -> bytes:
+        """Returns the shortest escape sequence changing style `prev` to `key`.
+
+        Only the attributes and colors that differ are changed, unless a
+        full reset is shorter.
+
+        Args:
+            prev: The style currently active, or None if it is not known.
+            key: The style to select.
+
+        Returns:
+            The escape sequence, which is empty if the styles are the same.
+        """
+        if prev == key:
+            return b""
+        if prev is None:
+            return self.sgr(key)
+        try:
+            return self._transitions[prev, key]
+        except KeyError:
+            pass
+
+        attrs, prev_attrs = key >> 48, prev >> 48
+        params = ATTR_OFF_SGR[prev_attrs & ~attrs] + ATTR_SGR[attrs & ~prev_attrs]
+        mask = (1 << self._BG_BITS) - 1
+        if (key ^ prev) >> self._BG_BITS & 0xFFFFFF:
+            params += self._fg(key >> self._BG_BITS & 0xFFFFFF)
+        if (key ^ prev) & mask:
+            params += self._bg(key & mask)
+        # An empty parameter list would be a full reset.
+        seq = min(CSI + params[1:].encode() + b"m", self.sgr(key), key=len) if params else b""
+
+        if len(self._transitions) >= _MAX_TRANSITIONS:
+            self._transitions.clear()
+        self._transitions[prev, key] = seq
+        return seq
+
+    @abc.abstractmethod
+    def _fg(self, color: int) -> str:
+        """Returns the SGR parameters selecting a packed foreground color."""
+
+    @abc.abstractmethod
+    def _bg(self, color: int) -> str:
+        """Returns the SGR parameters selecting a packed background color."""
+
+
+class TrueColorEncoder(SGREncoder):
+    """An SGREncoder for 24-bit color terminals."""
+    depth = 2**24
+    _BG_BITS = 24
+
+    def keys(
+        self,
+        fg: np.ndarray[np.uint8],
+        bg: np.ndarray[np.uint8],
+        attrs: np.ndarray[np.uint8],
+        dither: bool = False,
+    ) -> np.ndarray[np.int64]:
+        """Packs attributes and both RGB colors into each key."""
+        fg = fg.astype(np.int64)
+        bg = bg.astype(np.int64)
+        return (
+            (self._attr_keys[attrs] << 48)
+            | (fg[..., 0] << 40) | (fg[..., 1] << 32) | (fg[..., 2] << 24)
+            | (bg[..., 0] << 16) | (bg[..., 1] << 8) | bg[..., 2]
+        )
+
+    def _fg(self, color: int) -> str:
+        """Returns the 24-bit foreground parameters for a packed RGB color."""
+        return f";38;2;{color >> 16};{color >> 8 & 255};{color & 255}"
+
+    def _bg(self, color: int) -> str:
+        """Returns the 24-bit background parameters for a packed RGB color."""
+        return f";48;2;{color >> 16};{color >> 8 & 255};{color & 255}"
+
+
+class Palette256Encoder(SGREncoder):
+    """An SGREncoder for xterm 256-color terminals."""
+    depth = 256
+    _BG_BITS = 8
+    _FG = [f";38;5;{i}" for i in range(256)]
+    _BG = [f";48;5;{i}" for i in range(256)]
+
+    def keys(
+        self,
+        fg: np.ndarray[np.uint8],
+        bg: np.ndarray[np.uint8],
+        attrs: np.ndarray[np.uint8],
+        dither: bool = False,
+    ) -> np.ndarray[np.int64]:
+        """Packs attributes and both palette indices into each key."""
+        return (
+            (self._attr_keys[attrs] << 48)
+            | (dg.palette.quantize(fg, self.depth, dither).astype(np.int64) << 8)
+            | dg.palette.quantize(bg, self.depth, dither)
+        )
+
+    def _fg(self, color: int) -> str:
+        """Returns the palette foreground parameters for an index."""
+        return self._FG[color]
+
+    def _bg(self, color: int) -> str:
+        """Returns the palette background parameters for an index."""
+        return self._BG[color]
+
+
+class Palette16Encoder(Palette256Encoder):
+    """An SGREncoder for terminals with only the 16 basic colors."""
+    depth = 16
+    _FG = [f";{30 + i}" for i in range(8)] + [f";{90 + i}" for i in range(8)]
+    _BG = [f";{40 + i}" for i in range(8)] + [f";{100 + i}" for i in range(8)]
+
+
+ENCODERS: dict[int, type[SGREncoder]] = {
+    2**24: TrueColorEncoder,
+    256: Palette256Encoder,
+    16: Palette16Encoder,
+}
+
+
+def make_encoder(profile: TermProfile) -> SGREncoder:
+    """Returns a new SGR encoder for the color depth and underlines of `profile`."""
+    return ENCODERS[profile.depth](profile.styled_underline)
+
+
+def move_cursor(i: int, j: int) -> bytes:
+    """Returns the sequence moving the cursor to row `i`, column `j` (from 0)."""
+    return b"%s%d;%dH" % (CSI, i + 1, j + 1)
+
+
+def _relative(n: int, forward: bytes, back: bytes) -> bytes:
+    """Returns the sequence moving the cursor `n` cells along one axis."""
+    if n == 0:
+        return b""
+    seq = forward if n > 0 else back
+    return CSI + seq if abs(n) == 1 else b"%s%d%s" % (CSI, abs(n), seq)
+
+
+@functools.lru_cache(maxsize=4096)
+def cursor_motion(
+    i: int,
+    j: int,
+    origin: typing.Optional[tuple[int, int]] = None,
+) -> bytes:
+    """Returns the shortest sequence moving the cursor to row `i`, column `j`.
+
+    Like curses, this weighs an absolute move (CUP) against relative moves
+    (CUU/CUD/CUF/CUB) and carriage return and line feeds from the cursor's
+    current position, and picks whichever takes the fewest bytes. Line feeds
+    are only used after a carriage return, so they land in the first column
+    whether or not the terminal translates them to CR LF.
+
+    Args:
+        i: The row to move to, from 0.
+        j: The column to move to, from 0.
+        origin: The (row, col) position of the cursor, or None if it is not
+            known, in which case an absolute move is used.
+
+    Returns:
+        The escape sequence, which is empty if the cursor is already there.
+    """
+    if j == 0:
+        best = CSI + b"H" if i == 0 else b"%s%dH" % (CSI, i + 1)
+    else:
+        best = move_cursor(i, j)
+    if origin is None:
+        return best
+
+    di, dj = i - origin[0], j - origin[1]
+    vertical = _relative(di, b"B", b"A")
+    candidates = [
+        vertical + _relative(dj, b"C", b"D"),
+        b"\r" + vertical + _relative(j, b"C", b"D"),
+    ]
+    if di > 0:
+        candidates.append(b"\r" + b"\n" * di + _relative(j, b"C", b"D"))
+    return min([best, *candidates], key=len)
+
+
+def set_scroll_region(top: int, bottom: int) -> bytes:
+    """Returns the sequence limiting scrolling to rows [top, bottom) (DECSTBM)."""
+    return b"%s%d;%dr" % (CSI, top + 1, bottom)
+
+
+def scroll(n: int) -> bytes:
+    """Returns the sequence scrolling the scroll region up by `n` rows.
+
+    Negative values of `n` scroll down (SU and SD respectively).
+    """
+    return b"%s%d%s" % (CSI, abs(n), b"S" if n > 0 else b"T")
+
+
+RESET = CSI + b"0m"
+RESET_SCROLL_REGION = CSI + b"r"
+ERASE_SCREEN = CSI + b"2J"
+HIDE_CURSOR = CSI + b"?25l"
+SHOW_CURSOR = CSI + b"?25h"
+BEGIN_SYNC = CSI + b"?2026h"
+END_SYNC = CSI + b"?2026l"
+
+
+class FrameBuffer:
+    """A reusable byte buffer that one frame of output is assembled into.
+
+    The underlying bytearray is allocated once and only grows, so building a
+    frame does not allocate once the buffer has reached its working size.
+
+    Attributes:
+        size (int): The number of bytes written since the last `clear`.
+    """
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        """Constructs a FrameBuffer.
+
+        Args:
+            capacity: The initial size of the buffer in bytes.
+        """
+        self._buf = bytearray(capacity)
+        self.size = 0
+
+    def clear(self) -> None:
+        """Discards the buffered frame, keeping the allocated memory."""
+        self.size = 0
+
+    def write(self, data: typing.Union[bytes, memoryview]) -> None:
+        """Appends bytes to the frame, growing the buffer if needed."""
+        end = self.size + len(data)
+        if end > len(self._buf):
+            self._buf.extend(bytes(max(end, 2 * len(self._buf)) - len(self._buf)))
+        self._buf[self.size:end] = data
+        self.size = end
+
+    def getvalue(self) -> bytes:
+        """Returns a copy of the buffered frame."""
+        return bytes(self._buf[:self.size])
+
+    def flush_to(self, fd: int) -> int:
+        """Writes the buffered frame to a file descriptor and clears it.
+
+        The frame is passed to `os.write` as a single buffer; further calls
+        are only made if the operating system accepts part of it.
+
+        Args:
+            fd: The file descriptor to write to.
+
+        Returns:
+            The number of bytes written.
+        """
+        with memoryview(self._buf) as view:
+            written = 0
+            while written < self.size:
+                written += os.write(fd, view[written:self.size])
+        self.size = 0
+        return written
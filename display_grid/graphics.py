@@ -2,13 +2,28 @@
 
 The graphics are stored as NumPy arrays of Unicode ordinals in a global
 dictionary for easy access throughout the application.
+
+Animated, colored graphics can instead be packed into a single sprite-sheet
+file, which is memory-mapped on load so that frames are zero-copy views into
+the file rather than separately allocated arrays.
 """
 import os
+import json
+import mmap
+import struct
+import time
+import typing
 
 import numpy as np
 
 GRAPHICS: dict[str, np.ndarray[np.int32]] = {}
 
+SHEET_MAGIC = b"DGSS"
+SHEET_VERSION = 1
+SHEET_ALIGN = 64
+
+_SHEET_HEADER = struct.Struct("<4sII") # magic, version, index length
+
 def load_graphics(path: str = "assets/") -> None:
     """Loads all `.txt` files from a directory into the `GRAPHICS` dictionary.
 
@@ -32,4 +47,221 @@ def load_graphics(path: str = "assets/") -> None:
                 GRAPHICS[file_path[:-4]] = np.array(
                     [[ord(c) for c in line] for line in padded_raw],
                     dtype=np.int32,
-                )
\ No newline at end of file
+                )
+
+class Frame(typing.NamedTuple):
+    """A single frame of a sprite, holding all of its planes.
+
+    The arrays have the same layout as the planes of a `dg.Grid`, so a frame
+    can be copied onto a grid with plain slice assignment.
+
+    Attributes:
+        chars: An int32 array of shape (rows, cols) of Unicode ordinals.
+        colors: A uint8 array of shape (rows, cols, 2, 3) of fg/bg colors.
+        attrs: A uint8 array of shape (rows, cols) of text attribute bitmasks.
+    """
+    chars: np.ndarray[np.int32]
+    colors: np.ndarray[np.uint8]
+    attrs: np.ndarray[np.uint8]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """The (rows, cols) shape of the frame."""
+        return self.chars.shape
+
+    @property
+    def fg(self) -> np.ndarray[np.uint8]:
+        """A view of the foreground colors of shape (rows, cols, 3)."""
+        return self.colors[:, :, 0]
+
+    @property
+    def bg(self) -> np.ndarray[np.uint8]:
+        """A view of the background colors of shape (rows, cols, 3)."""
+        return self.colors[:, :, 1]
+
+
+class Sprite:
+    """A sequence of equally-sized frames making up one animated graphic.
+
+    Attributes:
+        chars (np.ndarray): An int32 array of shape (frames, rows, cols).
+        colors (np.ndarray): A uint8 array of shape (frames, rows, cols, 2, 3).
+        attrs (np.ndarray): A uint8 array of shape (frames, rows, cols).
+        fps (float): The default playback rate of the sprite.
+        shape (tuple[int, int]): The (rows, cols) shape of a single frame.
+    """
+    def __init__(
+        self,
+        chars: np.ndarray[np.int32],
+        colors: typing.Optional[np.ndarray[np.uint8]] = None,
+        attrs: typing.Optional[np.ndarray[np.uint8]] = None,
+        fps: float = 12.0,
+    ) -> None:
+        """Constructs a Sprite from its planes.
+
+        Args:
+            chars: Character ordinals of shape (frames, rows, cols), or
+                (rows, cols) for a single-frame sprite.
+            colors: Colors of shape (frames, rows, cols, 2, 3). If None, every
+                cell is white on black.
+            attrs: Attributes of shape (frames, rows, cols). If None, every
+                cell has no attributes.
+            fps: The default playback rate of the sprite.
+        """
+        chars = np.asarray(chars, dtype=np.int32)
+        if chars.ndim == 2:
+            chars = chars[None]
+        if colors is None:
+            colors = np.zeros((*chars.shape, 2, 3), dtype=np.uint8)
+            colors[..., 0, :] = 255
+        if attrs is None:
+            attrs = np.zeros(chars.shape, dtype=np.uint8)
+        self.chars = chars
+        self.colors = np.asarray(colors, dtype=np.uint8).reshape(*chars.shape, 2, 3)
+        self.attrs = np.asarray(attrs, dtype=np.uint8).reshape(chars.shape)
+        self.fps = fps
+        self.shape = chars.shape[1:]
+
+    def __len__(self) -> int:
+        """Returns the number of frames in the sprite."""
+        return self.chars.shape[0]
+
+    def __getitem__(self, i: int) -> Frame:
+        """Returns frame `i` as a set of views into the sprite's planes."""
+        return Frame(self.chars[i], self.colors[i], self.attrs[i])
+
+
+SPRITES: dict[str, Sprite] = {}
+
+
+def _align(n: int) -> int:
+    """Rounds `n` up to the next multiple of `SHEET_ALIGN`."""
+    return -(-n // SHEET_ALIGN) * SHEET_ALIGN
+
+
+def save_sprite_sheet(path: str, sprites: dict[str, Sprite]) -> None:
+    """Packs sprites into a single memory-mappable sprite-sheet file.
+
+    The file starts with a small header and a JSON index giving the shape,
+    frame count, frame rate and byte offsets of every sprite's planes. The
+    plane data follows, with each block aligned to `SHEET_ALIGN` bytes.
+
+    Args:
+        path: The path of the file to write.
+        sprites: A dictionary mapping sprite names to `Sprite` objects.
+    """
+    index = {}
+    blocks = []
+    offset = 0
+    for name, sprite in sprites.items():
+        entry = {"frames": len(sprite), "shape": list(sprite.shape), "fps": sprite.fps}
+        for plane in ("chars", "colors", "attrs"):
+            data = np.ascontiguousarray(getattr(sprite, plane)).tobytes()
+            entry[plane] = offset
+            blocks.append((offset, data))
+            offset = _align(offset + len(data))
+        index[name] = entry
+
+    raw_index = json.dumps(index).encode()
+    data_start = _align(_SHEET_HEADER.size + len(raw_index))
+    with open(path, "wb") as file:
+        file.write(_SHEET_HEADER.pack(SHEET_MAGIC, SHEET_VERSION, len(raw_index)))
+        file.write(raw_index)
+        for block_offset, data in blocks:
+            file.seek(data_start + block_offset)
+            file.write(data)
+        file.truncate(data_start + offset)
+
+
+def load_sprite_sheet(path: str) -> None:
+    """Memory-maps a sprite-sheet file and adds its sprites to `SPRITES`.
+
+    Only the index is parsed; every plane of every sprite is a read-only
+    view into the mapped file, so frames are paged in by the OS on first use.
+
+    Args:
+        path: The path to a file written by `save_sprite_sheet`.
+
+    Raises:
+        ValueError: If the file is not a sprite sheet of a supported version.
+    """
+    error = ValueError(f"{path} is not a version {SHEET_VERSION} sprite sheet")
+    with open(path, "rb") as file:
+        # An empty file cannot be mapped, and is too short for a header anyway.
+        if os.fstat(file.fileno()).st_size < _SHEET_HEADER.size:
+            raise error
+        buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, index_len = _SHEET_HEADER.unpack_from(buf)
+    if magic != SHEET_MAGIC or version != SHEET_VERSION or len(buf) < _SHEET_HEADER.size + index_len:
+        raise error
+    index = json.loads(buf[_SHEET_HEADER.size:_SHEET_HEADER.size + index_len])
+    data_start = _align(_SHEET_HEADER.size + index_len)
+
+    for name, entry in index.items():
+        shape = entry["frames"], *entry["shape"]
+        n = int(np.prod(shape))
+        chars = np.frombuffer(buf, np.int32, n, data_start + entry["chars"]).reshape(shape)
+        colors = np.frombuffer(buf, np.uint8, n * 6, data_start + entry["colors"]).reshape(*shape, 2, 3)
+        attrs = np.frombuffer(buf, np.uint8, n, data_start + entry["attrs"]).reshape(shape)
+        SPRITES[name] = Sprite(chars, colors, attrs, entry["fps"])
+
+
+class Animation:
+    """Selects frames of a sprite based on elapsed time.
+
+    Attributes:
+        sprite (Sprite): The sprite being animated.
+        fps (float): The playback rate in frames per second.
+        loop (bool): If True, playback wraps around; otherwise it holds on
+            the last frame.
+        start_time (float): The time at which playback started.
+    """
+    def __init__(
+        self,
+        sprite: typing.Union[str, Sprite],
+        fps: typing.Optional[float] = None,
+        loop: bool = True,
+        start_time: typing.Optional[float] = None,
+    ) -> None:
+        """Constructs an Animation.
+
+        Args:
+            sprite: A `Sprite`, or the name of one in `SPRITES`.
+            fps: The playback rate. If None, the sprite's own rate is used.
+            loop: Whether playback wraps around at the end.
+            start_time: The start of playback. If None, the current time.
+        """
+        self.sprite = SPRITES[sprite] if isinstance(sprite, str) else sprite
+        self.fps = self.sprite.fps if fps is None else fps
+        self.loop = loop
+        self.start_time = time.time() if start_time is None else start_time
+
+    def restart(self, start_time: typing.Optional[float] = None) -> None:
+        """Restarts playback from the first frame."""
+        self.start_time = time.time() if start_time is None else start_time
+
+    def index(self, t: typing.Optional[float] = None) -> int:
+        """Returns the index of the frame to show at time `t`.
+
+        Args:
+            t: The time to sample. If None, the current time.
+        """
+        t = time.time() if t is None else t
+        i = max(0, int((t - self.start_time) * self.fps))
+        if self.loop:
+            return i % len(self.sprite)
+        return min(i, len(self.sprite) - 1)
+
+    def frame(self, t: typing.Optional[float] = None) -> Frame:
+        """Returns the frame to show at time `t`.
+
+        Args:
+            t: The time to sample. If None, the current time.
+        """
+        return self.sprite[self.index(t)]
+
+    def finished(self, t: typing.Optional[float] = None) -> bool:
+        """Returns True if a non-looping animation has reached its last frame."""
+        t = time.time() if t is None else t
+        return not self.loop and (t - self.start_time) * self.fps >= len(self.sprite)
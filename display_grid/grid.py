@@ -34,6 +34,7 @@ class Grid:
         colors: np.ndarray[np.uint8],
         chars: np.ndarray[np.int32],
         attrs: np.ndarray[np.uint8],
+        clear: bool = True,
     ) -> None:
         """Initializes a Grid object with the specified data arrays.
 
@@ -41,12 +42,15 @@ class Grid:
             colors: A NumPy array for color data with shape (rows, cols, 2, 3).
             chars: A NumPy array for character data with shape (rows, cols).
             attrs: A NumPy array for attribute data with shape (rows, cols).
+            clear: If True, the grid is cleared. Pass False to keep existing
+                contents, such as when attaching to shared memory.
         """
         self.shape = chars.shape
         self.colors, self.chars, self.attrs = colors, chars, attrs
         self.offset = 0, 0
         self.fg, self.bg = self.colors[:, :, 0], self.colors[:, :, 1]
-        self.clear()
+        if clear:
+            self.clear()
 
     def clear(self) -> None:
         """Resets the grid to a default state.
@@ -56,6 +60,26 @@ class Grid:
         """
         self.fill(" ", (255, 255, 255), (0, 0, 0), dg.TA_NONE)
 
+    def resize(self, shape: tuple[int, int]) -> None:
+        """Reallocates the grid's arrays for a new shape and clears it.
+
+        Only root grids can be resized. SubGrids of the grid still view the
+        old arrays afterwards, so they must be recreated, e.g. with
+        `dg.Module.reflow`.
+
+        Args:
+            shape: The new (rows, cols) shape.
+
+        Raises:
+            TypeError: If the grid is a SubGrid.
+        """
+        Grid.__init__(
+            self,
+            np.empty((*shape, 2, 3), dtype=np.uint8),
+            np.empty(shape, dtype=np.int32),
+            np.empty(shape, dtype=np.uint8),
+        )
+
     def print(
         self,
         *values: object,
@@ -87,6 +111,60 @@ class Grid:
             if attrs is not None:
                 self.attrs[pos] = attrs
 
+    def write_text(
+        self,
+        text: str,
+        pos: tuple[int, int] = (0, 0),
+        width: typing.Optional[int] = None,
+        align: str = "<",
+        wrap: bool = True,
+        max_lines: typing.Optional[int] = None,
+        fg: typing.Optional[tuple[int, int, int]] = None,
+        bg: typing.Optional[tuple[int, int, int]] = None,
+        attrs: typing.Optional[int] = None,
+    ) -> int:
+        """Writes word-wrapped, aligned text into a block of the grid.
+
+        Unlike `print`, text is laid out with `dg.text.layout`, which handles
+        word wrapping, alignment, truncation with an ellipsis and wide
+        characters. Layouts are cached, so writing the same text again only
+        costs an array copy.
+
+        Args:
+            text: The text to write.
+            pos: The (row, col) position of the block's top-left corner.
+            width: The width of the block, clipped at the right edge of the
+                grid. If None, it extends to the right edge.
+            align: "<", ">" or "^" to align lines left, right or center.
+            wrap: If True, long lines are word-wrapped. Otherwise they are
+                truncated.
+            max_lines: The most lines to write. If None, the text may extend
+                to the bottom edge of the grid. Text that is cut off ends in
+                an ellipsis.
+            fg: An optional (r, g, b) tuple for the foreground color.
+            bg: An optional (r, g, b) tuple for the background color.
+            attrs: An optional bitmask of text attributes.
+
+        Returns:
+            The number of rows written.
+        """
+        i, j = pos
+        width = self.shape[1] - j if width is None else min(width, self.shape[1] - j)
+        rows_left = self.shape[0] - i
+        max_lines = rows_left if max_lines is None else min(max_lines, rows_left)
+        if width <= 0 or max_lines <= 0:
+            return 0
+        block = dg.text.layout(text, width, align, wrap, max_lines)
+        rows = slice(i, i + len(block)), slice(j, j + width)
+        self.chars[rows] = block
+        if fg is not None:
+            self.fg[rows] = fg
+        if bg is not None:
+            self.bg[rows] = bg
+        if attrs is not None:
+            self.attrs[rows] = attrs
+        return len(block)
+
     def fill(
         self,
         char: typing.Optional[str] = None,
@@ -131,6 +209,107 @@ class Grid:
         else:
             self.chars[i: i + arr.shape[0], j: j + arr.shape[1]] = arr
     
+    def blit(
+        self,
+        src: "Grid",
+        pos: tuple[int, int] = (0, 0),
+        src_rect: typing.Optional[tuple[int, int, int, int]] = None,
+        mask: typing.Optional[np.ndarray[np.bool_]] = None,
+    ) -> None:
+        """Copies characters, colors and attributes from another grid.
+
+        The copy is clipped to both grids, so `pos` may be negative or place
+        the source partly off this grid. The source and destination may
+        overlap, for example two SubGrids of the same parent.
+
+        Args:
+            src: The Grid or SubGrid to copy from. Anything with `chars`,
+                `colors` and `attrs` arrays in the Grid layout, such as a
+                `dg.Frame`, is also accepted.
+            pos: The (row, col) position in this grid of the copied region's
+                top-left corner.
+            src_rect: An optional (i1, j1, i2, j2) box of `src` to copy, which
+                is clipped to `src` like `pos` is to this grid. If None, the
+                whole of `src` is copied.
+            mask: An optional boolean array with the shape of the copied
+                region. Only cells where it is True are copied.
+        """
+        si1, sj1, si2, sj2 = (0, 0, *src.chars.shape) if src_rect is None else src_rect
+        si2, sj2 = min(si2, src.chars.shape[0]), min(sj2, src.chars.shape[1])
+
+        # Clip the top left against both grids, shifting the other box and
+        # the mask by the same amount.
+        di1, dj1 = pos
+        top, left = max(-si1, -di1, 0), max(-sj1, -dj1, 0)
+        si1, sj1, di1, dj1 = si1 + top, sj1 + left, di1 + top, dj1 + left
+        rows = min(si2 - si1, self.shape[0] - di1)
+        cols = min(sj2 - sj1, self.shape[1] - dj1)
+        if rows <= 0 or cols <= 0:
+            return
+
+        src_box = slice(si1, si1 + rows), slice(sj1, sj1 + cols)
+        dst_box = slice(di1, di1 + rows), slice(dj1, dj1 + cols)
+        planes = [(self.chars, src.chars), (self.colors, src.colors), (self.attrs, src.attrs)]
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)[top:top + rows, left:left + cols]
+
+        for dst_plane, src_plane in planes:
+            dst_view, src_view = dst_plane[dst_box], src_plane[src_box]
+            if np.may_share_memory(dst_view, src_view):
+                src_view = src_view.copy()
+            if mask is None:
+                dst_view[...] = src_view
+            else:
+                np.copyto(dst_view, src_view, where=mask.reshape(mask.shape + (1,) * (dst_view.ndim - 2)))
+
+    def scroll(
+        self,
+        n: int = 1,
+        region: typing.Optional[tuple[int, int, int, int]] = None,
+    ) -> None:
+        """Scrolls the contents of the grid, or of a region of it, vertically.
+
+        Rows are shifted in place, and the rows uncovered at the other end
+        are cleared to spaces, white on black, with no attributes. The
+        display backend is told about the scroll, so a terminal can move the
+        rows itself instead of repainting them.
+
+        Args:
+            n: The number of rows to scroll by. Positive values move the
+                contents up, negative values move them down.
+            region: An optional (i1, j1, i2, j2) box to scroll. If None, the
+                whole grid is scrolled.
+        """
+        i1, j1, i2, j2 = (0, 0, *self.shape) if region is None else region
+        if n == 0 or i1 >= i2 or j1 >= j2:
+            return
+        n = max(-(i2 - i1), min(n, i2 - i1))
+        if n > 0:
+            src, dst, cleared = slice(i1 + n, i2), slice(i1, i2 - n), slice(i2 - n, i2)
+        else:
+            src, dst, cleared = slice(i1, i2 + n), slice(i1 - n, i2), slice(i1, i1 - n)
+        cols = slice(j1, j2)
+
+        for plane in (self.chars, self.colors, self.attrs):
+            plane[dst, cols] = plane[src, cols]
+        self.chars[cleared, cols] = ord(" ")
+        self.fg[cleared, cols] = (255, 255, 255)
+        self.bg[cleared, cols] = (0, 0, 0)
+        self.attrs[cleared, cols] = dg.TA_NONE
+        self._scrolled(n, (i1, j1, i2, j2))
+
+    def _scrolled(self, n: int, region: tuple[int, int, int, int]) -> None:
+        """Receives a hint that a region of this grid was scrolled by `n` rows.
+
+        Backends override this to scroll the physical display instead of
+        repainting the region.
+
+        Args:
+            n: The number of rows scrolled by, positive meaning up.
+            region: The (i1, j1, i2, j2) box that was scrolled.
+        """
+        pass
+
     def draw(self) -> None:
         """Updates the physical screen with the contents of this Grid.
         
@@ -189,6 +368,20 @@ class SubGrid(Grid):
         )
         self.offset = i1, j1
 
+    def resize(self, shape: tuple[int, int]) -> None:
+        """Raises a TypeError, as a view cannot be reallocated.
+
+        New arrays would no longer be part of the parent, so writes to them
+        would never be shown. Use `dg.Module.reflow` to update views after
+        resizing the root grid.
+        """
+        raise TypeError("A SubGrid cannot be resized; reflow it from its resized root grid instead.")
+
+    def _scrolled(self, n: int, region: tuple[int, int, int, int]) -> None:
+        """Passes a scroll hint on to the parent, in its coordinates."""
+        i, j = self.offset
+        self.parent._scrolled(n, (region[0] + i, region[1] + j, region[2] + i, region[3] + j))
+
     def draw(self) -> None:
         """Updates the screen by calling the parent's draw method."""
         self.parent.draw()
\ No newline at end of file
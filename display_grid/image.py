@@ -0,0 +1,129 @@
+"""This module converts RGB images into block and braille characters.
+
+Each character cell covers a small block of image pixels. For every cell, the
+pixels are split into two clusters by a vectorized two-means fit, the cluster
+means become the cell's foreground and background colors, and the glyph whose
+pattern matches the foreground cluster is chosen from a lookup table. All
+cells are processed at once with NumPy, with no per-cell Python code.
+"""
+import numpy as np
+
+def _sextant_table() -> np.ndarray[np.int32]:
+    """Builds the pattern to character table for sextant characters.
+
+    Sextant characters U+1FB00 to U+1FB3B cover every 2x3 pattern except
+    the empty, full, left-half and right-half patterns, which already exist
+    as " ", "█", "▌" and "▐".
+    """
+    table = np.zeros(64, dtype=np.int32)
+    for pattern in range(1, 63):
+        table[pattern] = 0x1FB00 + pattern - 1 - (pattern > 21) - (pattern > 42)
+    table[[0, 21, 42, 63]] = [ord(" "), ord("▌"), ord("▐"), ord("█")]
+    return table
+
+# Maps each mode to the bit weight of every pixel in a cell, of shape
+# (pixel rows, pixel cols), and a table from pattern bitmask to character.
+CELL_MODES: dict[str, tuple[np.ndarray[np.int64], np.ndarray[np.int32]]] = {
+    "half": (
+        np.array([[1], [2]]),
+        np.array([ord(c) for c in " ▀▄█"], dtype=np.int32),
+    ),
+    "quadrant": (
+        np.array([[1, 2], [4, 8]]),
+        np.array([ord(c) for c in " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"], dtype=np.int32),
+    ),
+    "sextant": (
+        np.array([[1, 2], [4, 8], [16, 32]]),
+        _sextant_table(),
+    ),
+    "braille": (
+        np.array([[1, 8], [2, 16], [4, 32], [64, 128]]),
+        0x2800 + np.arange(256, dtype=np.int32),
+    ),
+}
+
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def cell_shape(mode: str) -> tuple[int, int]:
+    """Returns the (rows, cols) of image pixels covered by one cell in `mode`.
+
+    Args:
+        mode: One of the keys of `CELL_MODES`.
+    """
+    return CELL_MODES[mode][0].shape
+
+
+def encode_cells(
+    pixels: np.ndarray[np.uint8],
+    mode: str = "quadrant",
+) -> tuple[np.ndarray[np.int32], np.ndarray[np.uint8], np.ndarray[np.uint8]]:
+    """Fits a character and two colors to every cell of an image.
+
+    Pixels in each cell are first split at the cell's mean luminance, then
+    reassigned once to the nearer of the two cluster means. The brighter
+    cluster is drawn with the foreground color. Images whose size is not a
+    multiple of the cell shape are padded with black.
+
+    Args:
+        pixels: A uint8 array of shape (height, width, 3) with RGB data.
+        mode: One of the keys of `CELL_MODES`.
+
+    Returns:
+        A (chars, fg, bg) tuple with shapes (rows, cols), (rows, cols, 3) and
+        (rows, cols, 3), ready to be written into a Grid.
+    """
+    weights, table = CELL_MODES[mode]
+    ch, cw = weights.shape
+    h, w = pixels.shape[:2]
+    rows, cols = -(-h // ch), -(-w // cw)
+    if (rows * ch, cols * cw) != (h, w):
+        pixels = np.pad(pixels, ((0, rows * ch - h), (0, cols * cw - w), (0, 0)))
+
+    # Lay pixels out as (pixel in cell, channel, cell) so that every step
+    # below is an elementwise operation over long contiguous rows of cells.
+    px = pixels.reshape(rows, ch, cols, cw, 3).transpose(1, 3, 4, 0, 2).reshape(ch * cw, 3, rows * cols).astype(np.float32)
+    total = px.sum(axis=0)
+
+    luma = _LUMA[0] * px[:, 0] + _LUMA[1] * px[:, 1] + _LUMA[2] * px[:, 2]
+    mask = luma * len(px) > luma.sum(axis=0)
+    fg, bg = _cluster_means(px, total, mask)
+
+    # A pixel is nearer fg than bg iff 2 * p.(bg - fg) < |bg|^2 - |fg|^2.
+    diff = 2 * (bg - fg)
+    dot = px[:, 0] * diff[0] + px[:, 1] * diff[1] + px[:, 2] * diff[2]
+    mask = dot < np.sum(bg * bg, axis=0) - np.sum(fg * fg, axis=0)
+    fg, bg = _cluster_means(px, total, mask)
+
+    pattern = weights.ravel().astype(np.float32) @ mask.astype(np.float32)
+    chars = table[pattern.astype(np.intp)].reshape(rows, cols)
+    fg = np.rint(fg.T).astype(np.uint8).reshape(rows, cols, 3)
+    bg = np.rint(bg.T).astype(np.uint8).reshape(rows, cols, 3)
+    return chars, fg, bg
+
+
+def _cluster_means(
+    px: np.ndarray[np.float32],
+    total: np.ndarray[np.float32],
+    mask: np.ndarray[np.bool_],
+) -> tuple[np.ndarray[np.float32], np.ndarray[np.float32]]:
+    """Returns the mean colors of the masked and unmasked pixels of each cell.
+
+    A cluster with no pixels takes the mean of the other cluster, so a cell
+    of a single color gets that color as both foreground and background.
+
+    Args:
+        px: Pixels of shape (pixels per cell, 3, cells).
+        total: The sum of `px` over its first axis.
+        mask: A boolean array of shape (pixels per cell, cells).
+
+    Returns:
+        The (fg, bg) mean colors, each of shape (3, cells).
+    """
+    m = mask.astype(np.float32)
+    n_fg = m.sum(axis=0)
+    n_bg = len(px) - n_fg
+    sum_fg = np.einsum("kcn,kn->cn", px, m)
+    fg = sum_fg / np.maximum(n_fg, 1)
+    bg = (total - sum_fg) / np.maximum(n_bg, 1)
+    return np.where(n_fg > 0, fg, bg), np.where(n_bg > 0, bg, fg)
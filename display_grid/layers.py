@@ -0,0 +1,218 @@
+"""This module provides off-screen Grid layers and a compositor for them.
+
+A Layer is a Grid with its own data arrays plus a per-cell alpha plane. Cells
+whose character is NUL (`chr(0)`) are fully transparent. A Compositor stacks
+layers by z-order and blends them into a target Grid with vectorized NumPy
+operations, only recompositing the regions where some layer changed.
+"""
+import typing
+
+import numpy as np
+
+import display_grid as dg
+
+class Layer(dg.Grid):
+    """An off-screen Grid that is composited over the layers beneath it.
+
+    Attributes:
+        alpha (np.ndarray): A NumPy array of shape (rows, cols) where each
+            uint8 value is the opacity of that cell's colors, from 0 (colors
+            fully taken from below) to 255 (colors fully opaque).
+        pos (tuple[int, int]): The (row, col) position of the layer's top-left
+            corner within the compositor's target grid.
+        z (int): The stacking order. Layers with a higher z are drawn on top.
+        visible (bool): If False, the layer is skipped when compositing.
+    """
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        pos: tuple[int, int] = (0, 0),
+        z: int = 0,
+    ) -> None:
+        """Constructs a fully transparent Layer.
+
+        Args:
+            shape: The (rows, cols) shape of the layer.
+            pos: The (row, col) position of the layer within the target grid.
+            z: The stacking order of the layer.
+        """
+        self.alpha = np.empty(shape, dtype=np.uint8)
+        super().__init__(
+            np.empty((*shape, 2, 3), dtype=np.uint8),
+            np.empty(shape, dtype=np.int32),
+            np.empty(shape, dtype=np.uint8),
+        )
+        self.pos = pos
+        self.z = z
+        self.visible = True
+
+        self._prev_colors = np.zeros_like(self.colors)
+        self._prev_chars = np.zeros_like(self.chars)
+        self._prev_attrs = np.zeros_like(self.attrs)
+        self._prev_alpha = np.zeros_like(self.alpha)
+        self._composited_rect = None
+
+    def clear(self) -> None:
+        """Makes every cell of the layer transparent and fully opaque in color.
+
+        Characters are set to NUL, so nothing from this layer shows until
+        something is written to it.
+        """
+        self.fill("\0", (255, 255, 255), (0, 0, 0), dg.TA_NONE)
+        self.alpha[...] = 255
+
+    @property
+    def rect(self) -> tuple[int, int, int, int]:
+        """The (i1, j1, i2, j2) box the layer covers in target coordinates."""
+        return self.pos[0], self.pos[1], self.pos[0] + self.shape[0], self.pos[1] + self.shape[1]
+
+    def _changed_rect(self) -> typing.Optional[tuple[int, int, int, int]]:
+        """Returns the box of cells changed since the last composite, if any.
+
+        The box is in target coordinates, and the snapshot used for the
+        comparison is refreshed within it.
+
+        Returns:
+            An (i1, j1, i2, j2) box, or None if nothing changed.
+        """
+        changed = (
+            (self.chars != self._prev_chars)
+            | (self.attrs != self._prev_attrs)
+            | (self.alpha != self._prev_alpha)
+            | np.any(self.colors != self._prev_colors, axis=(2, 3))
+        )
+        rows = np.flatnonzero(changed.any(axis=1))
+        if not len(rows):
+            return None
+        cols = np.flatnonzero(changed.any(axis=0))
+        i1, i2, j1, j2 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        self._snapshot(i1, j1, i2, j2)
+        return i1 + self.pos[0], j1 + self.pos[1], i2 + self.pos[0], j2 + self.pos[1]
+
+    def _snapshot(self, i1: int, j1: int, i2: int, j2: int) -> None:
+        """Copies a box of the layer into the comparison snapshot."""
+        self._prev_colors[i1:i2, j1:j2] = self.colors[i1:i2, j1:j2]
+        self._prev_chars[i1:i2, j1:j2] = self.chars[i1:i2, j1:j2]
+        self._prev_attrs[i1:i2, j1:j2] = self.attrs[i1:i2, j1:j2]
+        self._prev_alpha[i1:i2, j1:j2] = self.alpha[i1:i2, j1:j2]
+
+
+class Compositor:
+    """Blends a stack of Layers into a target Grid.
+
+    Cells not covered by any opaque layer cell are cleared to a space,
+    white on black, with no attributes.
+
+    Attributes:
+        target (dg.Grid): The Grid that layers are composited into.
+        layers (list[Layer]): The layers, in the order they were added.
+    """
+    def __init__(self, target: dg.Grid) -> None:
+        """Constructs a Compositor.
+
+        Args:
+            target: The Grid that layers are composited into.
+        """
+        self.target = target
+        self.layers: list[Layer] = []
+        self._full = True
+
+    def add_layer(
+        self,
+        shape: typing.Optional[tuple[int, int]] = None,
+        pos: tuple[int, int] = (0, 0),
+        z: int = 0,
+    ) -> Layer:
+        """Creates a new transparent layer and adds it to the stack.
+
+        Args:
+            shape: The (rows, cols) shape of the layer. If None, the layer
+                covers the target from `pos` to its bottom-right corner.
+            pos: The (row, col) position of the layer within the target.
+            z: The stacking order of the layer.
+
+        Returns:
+            The new Layer.
+        """
+        if shape is None:
+            shape = self.target.shape[0] - pos[0], self.target.shape[1] - pos[1]
+        layer = Layer(shape, pos, z)
+        self.layers.append(layer)
+        return layer
+
+    def remove_layer(self, layer: Layer) -> None:
+        """Removes a layer from the stack, uncovering whatever was beneath it."""
+        self.layers.remove(layer)
+        if layer._composited_rect is not None:
+            self._composite_rect(*layer._composited_rect[:4])
+
+    def invalidate(self) -> None:
+        """Forces the next composite to redraw the whole target."""
+        self._full = True
+
+    def composite(self) -> None:
+        """Recomposites every region of the target where some layer changed.
+
+        Changes are found by comparing each layer with a snapshot taken when
+        it was last composited, so writes through SubGrids and Modules are
+        picked up as well as direct writes. Moving, hiding or re-stacking a
+        layer recomposites both its old and new regions.
+        """
+        rects = []
+        for layer in self.layers:
+            old = layer._composited_rect
+            new = (*layer.rect, layer.z) if layer.visible else None
+            if new != old:
+                rects += [r[:4] for r in (old, new) if r is not None]
+                layer._composited_rect = new
+                layer._snapshot(0, 0, *layer.shape)
+            elif layer.visible:
+                rect = layer._changed_rect()
+                if rect is not None:
+                    rects.append(rect)
+
+        if self._full:
+            rects = [(0, 0, *self.target.shape)]
+            self._full = False
+        for rect in rects:
+            self._composite_rect(*rect)
+
+    def _composite_rect(self, i1: int, j1: int, i2: int, j2: int) -> None:
+        """Blends every visible layer into one box of the target."""
+        i1, j1 = max(i1, 0), max(j1, 0)
+        i2, j2 = min(i2, self.target.shape[0]), min(j2, self.target.shape[1])
+        if i1 >= i2 or j1 >= j2:
+            return
+
+        chars = np.full((i2 - i1, j2 - j1), ord(" "), dtype=np.int32)
+        attrs = np.zeros((i2 - i1, j2 - j1), dtype=np.uint8)
+        colors = np.zeros((i2 - i1, j2 - j1, 2, 3), dtype=np.uint16)
+        colors[:, :, 0] = 255
+
+        for layer in sorted(self.layers, key=lambda layer: layer.z):
+            if not layer.visible:
+                continue
+            li1, lj1, li2, lj2 = layer.rect
+            oi1, oj1 = max(li1, i1), max(lj1, j1)
+            oi2, oj2 = min(li2, i2), min(lj2, j2)
+            if oi1 >= oi2 or oj1 >= oj2:
+                continue
+
+            src = slice(oi1 - li1, oi2 - li1), slice(oj1 - lj1, oj2 - lj1)
+            dst = slice(oi1 - i1, oi2 - i1), slice(oj1 - j1, oj2 - j1)
+            opaque = layer.chars[src] != 0
+            chars[dst] = np.where(opaque, layer.chars[src], chars[dst])
+            attrs[dst] = np.where(opaque, layer.attrs[src], attrs[dst])
+
+            alpha = np.where(opaque, layer.alpha[src], 0).astype(np.uint16)[:, :, None, None]
+            below = colors[dst]
+            colors[dst] = (layer.colors[src] * alpha + below * (255 - alpha) + 127) // 255
+
+        self.target.chars[i1:i2, j1:j2] = chars
+        self.target.attrs[i1:i2, j1:j2] = attrs
+        self.target.colors[i1:i2, j1:j2] = colors
+
+    def draw(self) -> None:
+        """Composites any changes and draws the target grid."""
+        self.composite()
+        self.target.draw()
@@ -0,0 +1,261 @@
+"""This module lays out modules from size constraints instead of fixed boxes.
+
+A layout is a tree of `Row`s, which place their children left to right, and
+`Column`s, which stack their children top to bottom. Each leaf is a `Slot`
+holding one submodule of the module being laid out, or empty space. Every
+node has a `Size` along its parent's direction: a fixed number of cells or a
+fraction of the space left over, optionally bounded by a minimum and maximum.
+
+A `Layout` computes the boxes of all of its modules in one pass over the tree
+and caches them until the constraints or the parent's shape change. Applying
+a changed layout only rebuilds the SubGrids of modules whose box moved.
+"""
+import math
+import typing
+from dataclasses import dataclass
+
+import display_grid as dg
+
+@dataclass(frozen=True)
+class Size:
+    """The size of a layout node along its parent's direction.
+
+    Attributes:
+        cells: A fixed number of cells, or None for a flexible size.
+        fraction: For a flexible size, the node's share of the space left
+            after fixed sizes, relative to its flexible siblings.
+        min: The fewest cells the node is given, space permitting.
+        max: The most cells the node is given, or None for no limit.
+    """
+
+    cells: typing.Optional[int] = None
+    fraction: float = 1.0
+    min: int = 0
+    max: typing.Optional[int] = None
+
+
+SizeLike = typing.Union[int, float, Size]
+
+def _as_size(size: SizeLike) -> Size:
+    """Converts an int to a fixed size and a float to a fractional size."""
+    if isinstance(size, Size):
+        return size
+    if isinstance(size, int):
+        return Size(cells=size)
+    return Size(fraction=size)
+
+def split(total: int, sizes: typing.Sequence[Size], gap: int = 0) -> list[int]:
+    """Divides a number of cells between nodes.
+
+    Fixed sizes are given first, and the rest is shared between flexible
+    sizes by their fractions. Flexible sizes that would fall outside of
+    their bounds are clamped, and the space is shared again between the
+    others. Lengths are rounded to whole cells without changing their sum.
+
+    Args:
+        total: The number of cells to divide.
+        sizes: The size of each node.
+        gap: The number of empty cells between nodes.
+
+    Returns:
+        The length of each node. If fixed sizes and minimums do not fit, the
+        sum can be larger than `total`.
+    """
+    n = len(sizes)
+    space = max(total - gap * max(n - 1, 0), 0)
+    lo = [size.min for size in sizes]
+    hi = [math.inf if size.max is None else size.max for size in sizes]
+    lengths = [0.0] * n
+    flexible = []
+    for i, size in enumerate(sizes):
+        if size.cells is None:
+            flexible.append(i)
+        else:
+            lengths[i] = min(max(size.cells, lo[i]), hi[i])
+    left = space - sum(lengths)
+
+    while flexible:
+        weight = sum(sizes[i].fraction for i in flexible)
+        share = {i: max(left, 0) * sizes[i].fraction / weight if weight else 0.0 for i in flexible}
+        clamped = {i: min(max(share[i], lo[i]), hi[i]) for i in flexible}
+        violated = [i for i in flexible if clamped[i] != share[i]]
+        if not violated:
+            for i in flexible:
+                lengths[i] = share[i]
+            break
+        # Freeze the nodes pushed the same way as the total, as CSS flexbox does.
+        grow = sum(clamped[i] - share[i] for i in flexible) > 0
+        frozen = [i for i in violated if (clamped[i] > share[i]) == grow] or violated
+        for i in frozen:
+            lengths[i] = clamped[i]
+            left -= clamped[i]
+            flexible.remove(i)
+
+    cells = [int(length) for length in lengths]
+    extra = round(sum(lengths)) - sum(cells)
+    for i in sorted(range(n), key=lambda i: cells[i] - lengths[i])[:extra]:
+        cells[i] += 1
+    return cells
+
+
+class Node:
+    """A node of a layout tree.
+
+    Attributes:
+        size (Size): The node's size along its parent's direction.
+    """
+    def __init__(self, size: SizeLike = 1.0) -> None:
+        """Constructs a Node.
+
+        Args:
+            size: The node's size. An int is a fixed number of cells, and a
+                float is a fraction of the space left over.
+        """
+        self.size = _as_size(size)
+
+
+class Slot(Node):
+    """A leaf of a layout tree, holding one module or empty space.
+
+    Attributes:
+        module (dg.Module | None): The module placed in the slot, or None
+            for empty space.
+    """
+    def __init__(self, module: typing.Optional[dg.Module] = None, size: SizeLike = 1.0) -> None:
+        """Constructs a Slot.
+
+        Args:
+            module: The module to place, which must be a submodule of the
+                module being laid out. If None, the slot is left empty.
+            size: The slot's size, as for `Node`.
+        """
+        super().__init__(size)
+        self.module = module
+
+
+class _Container(Node):
+    """A node that divides its box between its children along one axis.
+
+    Attributes:
+        children (list[Node]): The child nodes.
+        gap (int): The number of empty cells between children.
+    """
+    axis = 0
+
+    def __init__(
+        self,
+        *children: typing.Union[Node, dg.Module],
+        size: SizeLike = 1.0,
+        gap: int = 0,
+    ) -> None:
+        """Constructs the node.
+
+        Args:
+            children: The child nodes. Modules are placed in a `Slot` with a
+                fractional size of 1.
+            size: The node's size, as for `Node`.
+            gap: The number of empty cells between children.
+        """
+        super().__init__(size)
+        self.children = [child if isinstance(child, Node) else Slot(child) for child in children]
+        self.gap = gap
+
+
+class Row(_Container):
+    """A node that places its children side by side, left to right."""
+    axis = 1
+
+
+class Column(_Container):
+    """A node that stacks its children, top to bottom."""
+    axis = 0
+
+
+class Layout:
+    """Places the submodules of a module by a tree of layout nodes.
+
+    The boxes of every module are computed together and cached for the
+    parent's shape. After changing a node's size directly, call
+    `invalidate` and `apply`, or use `set_size`. When the parent is
+    reflowed, for example after a window resize, its submodules are placed
+    by the layout.
+
+    Attributes:
+        parent (dg.Module): The module whose submodules are laid out.
+        root (Node): The root node, which spans the whole parent.
+    """
+    def __init__(self, parent: dg.Module, root: Node) -> None:
+        """Constructs a Layout and places the modules in it.
+
+        Args:
+            parent: The module whose submodules are laid out.
+            root: The root node of the layout.
+        """
+        self.parent = parent
+        self.root = root
+        self._shape: typing.Optional[tuple[int, int]] = None
+        self._boxes: dict[dg.Module, tuple[int, int, int, int]] = {}
+        parent.layout = self
+        self.apply()
+
+    def invalidate(self) -> None:
+        """Marks the cached boxes as out of date."""
+        self._shape = None
+
+    def set_size(self, node: Node, size: SizeLike) -> list[dg.Module]:
+        """Changes the size of a node and moves the modules affected.
+
+        Args:
+            node: A node of the layout.
+            size: The node's new size, as for `Node`.
+
+        Returns:
+            The modules that moved.
+        """
+        node.size = _as_size(size)
+        self.invalidate()
+        return self.apply()
+
+    def boxes(self) -> dict[dg.Module, tuple[int, int, int, int]]:
+        """Returns the (i0, j0, i1, j1) box of every module in the layout.
+
+        The boxes are only computed again if the parent's shape changed or
+        the layout was invalidated.
+        """
+        if self._shape != self.parent.shape:
+            self._boxes = {}
+            self._place(self.root, (0, 0, *self.parent.shape))
+            self._shape = self.parent.shape
+        return self._boxes
+
+    def _place(self, node: Node, box: tuple[int, int, int, int]) -> None:
+        """Computes the boxes of the modules in a subtree, given its box."""
+        if isinstance(node, Slot):
+            if node.module is not None:
+                self._boxes[node.module] = box
+            return
+        i0, j0, i1, j1 = box
+        start, end = (i0, i1) if node.axis == 0 else (j0, j1)
+        lengths = split(end - start, [child.size for child in node.children], node.gap)
+        pos = start
+        for child, length in zip(node.children, lengths):
+            lo, hi = min(pos, end), min(pos + length, end)
+            self._place(child, (lo, j0, hi, j1) if node.axis == 0 else (i0, lo, i1, hi))
+            pos += length + node.gap
+
+    def place(self) -> None:
+        """Sets the box of every module, without rebuilding their grids."""
+        for module, box in self.boxes().items():
+            module._box = box
+
+    def apply(self) -> list[dg.Module]:
+        """Reflows the modules whose box changed.
+
+        Returns:
+            The modules that moved.
+        """
+        moved = [module for module, box in self.boxes().items() if module._box != box]
+        for module in moved:
+            module._box = self._boxes[module]
+            module.reflow()
+        return moved
@@ -14,6 +14,7 @@ TA_UNDERLINE = 8
 TA_BLINK = 16
 TA_INVERT = 32
 TA_STRIKETHROUGH = 64
+TA_UNDERCURL = 128
 
 KM_NONE = 0
 KM_SHIFT = 1
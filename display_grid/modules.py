@@ -8,16 +8,37 @@ elements like buttons, text input, and FPS meters are also included.
 import time
 import typing
 import io
+import collections
 import contextlib
+import os
+import tempfile
+import queue
+import threading
 
 import numpy as np
-import pygame as pg
-import urwid
 
 import display_grid as dg
 
 M = typing.TypeVar("M", bound="Module")
 
+# Terminal key names, translated to the names pygame keys are given.
+_KEY_NAMES = {
+    "backspace": "KEY_BACKSPACE",
+    "delete": "KEY_DELETE",
+    "left": "KEY_LEFT",
+    "right": "KEY_RIGHT",
+    "up": "KEY_UP",
+    "down": "KEY_DOWN",
+    "page up": "KEY_PAGEUP",
+    "page down": "KEY_PAGEDOWN",
+    "home": "KEY_HOME",
+    "end": "KEY_END",
+}
+
+def _codes(text: str) -> np.ndarray[np.uint32]:
+    """Returns the Unicode ordinals of a string as an array."""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
 class Module:
     """A hierarchical component for managing a region of a grid.
     
@@ -58,21 +79,59 @@ class Module:
 
         self.parent = parent
         if parent:
-            
-            if box is None:
-                box = 0, 0, *parent.shape
-            self.grid = dg.SubGrid(parent.grid, *box)
             parent.submodules.append(self)
+        self._box = box
+        self.submodules: list[M] = []
+        self.layout: typing.Optional[dg.layout.Layout] = None
+        self.paused = False
+        self._place(grid)
+
+    def _place(self, grid: typing.Optional[dg.Grid] = None) -> None:
+        """Creates the module's SubGrid and box from its parent's grid.
+
+        Args:
+            grid: The Grid to draw to. Ignored if the module has a parent.
+        """
+        box = self._box
+        if self.parent:
+            if box is None:
+                box = 0, 0, *self.parent.shape
+            self.grid = dg.SubGrid(self.parent.grid, *box)
         else:
             if box is None:
                 box = 0, 0, *grid.shape
             self.grid = dg.SubGrid(grid, *box)
-        
-        self.submodules: list[M] = []
-        self.paused = False
         self.shape = self.grid.shape
-        bound = self.parent.shape if parent else self.shape
-        self.box = box[0] % bound[0], box[1] % bound[1], box[2] % bound[0], box[3] % bound[1]
+        bound = self.parent.shape if self.parent else grid.shape
+        (i0, i1, _), (j0, j1, _) = slice(box[0], box[2]).indices(bound[0]), slice(box[1], box[3]).indices(bound[1])
+        self.box = i0, j0, max(i0, i1), max(j0, j1)
+
+    def reflow(self, grid: typing.Optional[dg.Grid] = None) -> None:
+        """Re-derives the grids of this module and its submodules.
+
+        This is needed after the grid they are views of is reallocated, for
+        example when the window is resized. Boxes given with negative
+        coordinates stay relative to the parent's far edge, and modules
+        placed by a `dg.layout.Layout` get their boxes from it. Each module's
+        `_resized` method is called before its submodules are reflowed.
+
+        Args:
+            grid: The Grid to draw to. Ignored if the module has a parent.
+        """
+        self._place(grid)
+        self._resized()
+        self._reflow_submodules()
+
+    def _reflow_submodules(self) -> None:
+        """Reflows every submodule, placing them by the layout if there is one."""
+        if self.layout is not None:
+            self.layout.place()
+        for module in self.submodules:
+            module.reflow()
+
+    def _resized(self) -> None:
+        """Updates state that depends on the module's shape. Should be overridden."""
+        pass
 
     def start(self) -> None:
         """Activates the module, allowing it to be drawn and updated."""
@@ -151,13 +210,22 @@ class MainModule(Module):
     
     This module initializes the display backend (terminal or Pygame) and serves
     as the main entry point for the application's lifecycle (tick, draw, events).
-    It can also enforce a specific window size.
+    It can also enforce a specific window size, or follow the window's size.
+
+    The window size is not polled. Backends report changes as `dg.ResizeEvent`s,
+    driven by SIGWINCH in a terminal and VIDEORESIZE in pygame.
+
+    Attributes:
+        real_shape (tuple[int, int]): The window's shape in cells, as of the
+            last resize.
     """
     def __init__(
         self, 
         shape: tuple[int, int] = (24, 80), 
         enforce_shape: bool = True, 
         mode: str = typing.Literal["terminal", "pygame"],
+        render_process: bool = False,
+        resizable: bool = False,
     ) -> None:
         """Constructs the MainModule.
 
@@ -166,7 +234,21 @@ class MainModule(Module):
             enforce_shape: If True, displays a warning if the window size does
                 not match `shape` and pauses updates.
             mode: The backend to use, either "terminal" or "pygame".
+            render_process: If True, the backend runs in a separate process
+                that frames are handed to through shared memory (see
+                `dg.render.RemoteGrid`), so encoding output does not hold
+                up ticking. Scripts using this must guard their entry point
+                with `if __name__ == "__main__":`.
+            resizable: If True, the grid is reallocated to fill the window
+                whenever it is resized, and every submodule is reflowed.
+                `shape` is then only the initial pygame window size, and
+                `enforce_shape` is ignored.
+
+        Raises:
+            ValueError: If both `render_process` and `resizable` are True.
         """
+        if render_process and resizable:
+            raise ValueError("A MainModule with a render process cannot be resizable.")
         super().__init__(
             grid=dg.Grid(
                 np.zeros((*shape, 2, 3), dtype=np.uint8), 
@@ -175,12 +257,36 @@ class MainModule(Module):
             ),
         )
         self.mode = mode
-        self.enforce_shape = enforce_shape
+        self.render_process = render_process
+        self.enforce_shape = enforce_shape and not resizable
+        self.resizable = resizable
+        self.real_shape = self.shape
         self.printed = io.StringIO()
+
+    def resize(self, shape: tuple[int, int]) -> None:
+        """Handles a change of the window's shape.
+
+        A resizable MainModule reallocates its grid at the new shape and
+        reflows every submodule in one pass, and the next draw repaints the
+        whole window once. Otherwise only `real_shape` is updated.
+
+        Args:
+            shape: The window's new (rows, cols) shape.
+        """
+        self.real_shape = tuple(shape)
+        if self.resizable and self.real_shape != self.shape:
+            self.grid.resize(self.real_shape)
+            self._reflow()
+
+    def _reflow(self) -> None:
+        """Takes the shape of the grid and reflows every submodule."""
+        self.shape = self.grid.shape
+        self.box = 0, 0, *self.shape
+        self._reflow_submodules()
     
     def _draw(self) -> None:
         """Draws the grid, or a warning if the window shape is incorrect."""
-        real_shape = self.grid.get_real_shape()
+        real_shape = self.real_shape
         if self.enforce_shape and real_shape != self.shape:
             backup_colors = self.grid.colors.copy()
             backup_chars = self.grid.chars.copy()
@@ -201,28 +307,39 @@ class MainModule(Module):
             self.grid.draw()
             
     def _tick(self) -> None:
-        """Polls for events if the window shape is correct."""
-        if not self.enforce_shape or self.grid.get_real_shape() == self.shape:
-            for event in self.grid.events():
+        """Polls for events, only handling them if the window shape is correct."""
+        for event in self.grid.events():
+            if isinstance(event, dg.ResizeEvent):
+                self.resize(event.shape)
+            elif not self.enforce_shape or self.real_shape == self.shape:
                 self.handle_event(event)
-        else:
-            self.grid.events()
 
     def __enter__(self) -> 'MainModule':
         """Initializes the display backend when entering a `with` block."""
-        if self.mode == "terminal":
+        if self.render_process:
+            if self.mode == "terminal":
+                self.printed = contextlib.redirect_stdout(self.printed).__enter__()
+            self.grid = dg.render.RemoteGrid(self.shape, self.mode)
+
+        elif self.mode == "terminal":
+            import urwid
             self.printed = contextlib.redirect_stdout(self.printed).__enter__()
             scr = urwid.display.raw.Screen()
             scr.start()
             scr.set_input_timeouts(max_wait=0)
             scr.set_mouse_tracking()
-            self.grid = dg.TermGrid(scr, self.shape)
+            self.grid = dg.TermGrid(scr, None if self.resizable else self.shape)
 
             
         elif self.mode == "pygame":
+            import pygame as pg
             pg.init()
-            self.grid = dg.PygameGrid(pg.display.set_mode(dg.PygameGrid.get_surf_shape(self.shape)))
-                
+            flags = pg.RESIZABLE if self.resizable else 0
+            self.grid = dg.PygameGrid(pg.display.set_mode(dg.PygameGrid.get_surf_shape(self.shape), flags))
+
+        # Submodules made before entering are views of the placeholder grid.
+        self.real_shape = tuple(self.grid.get_real_shape())
+        self._reflow()
         return self
 
     def __exit__(
@@ -232,45 +349,314 @@ class MainModule(Module):
         traceback: typing.Optional[typing.Any],
     ) -> None:
         """Cleans up the display backend when exiting a `with` block."""
-        if self.mode == "terminal":
+        if self.render_process:
+            self.grid.close()
+        elif self.mode == "terminal":
             self.grid.scr.stop()
         elif self.mode == "pygame":
+            import pygame as pg
             pg.quit()
 
 class ArrayDrawModule(Module):
-    """A module for displaying a NumPy array of RGB data as colored blocks."""
+    """A module for displaying a NumPy array of RGB data as colored blocks.
+
+    In the default "half" mode, each character cell shows two vertically
+    stacked pixels using the "▀" character, with the top pixel as the
+    foreground color and the bottom pixel as the background color.
+
+    The "quadrant" (2x2), "sextant" (2x3) and "braille" (2x4) modes pack more
+    pixels into each cell. Since a cell only has two colors, each cell's
+    pixels are fitted to two colors and the closest matching glyph with
+    `dg.image.encode_cells`.
+    """
     def __init__(
         self, 
         parent: Module, 
         box: typing.Optional[tuple[int, int, int, int]] = None, 
         res: int = 1,
+        skip_unchanged: bool = False,
+        mode: typing.Literal["half", "quadrant", "sextant", "braille"] = "half",
     ) -> None:
         """Constructs an ArrayDrawModule.
 
         Args:
             parent: The parent module.
             box: The bounding box within the parent.
-            res: An integer scaling factor for the array.
+            res: An integer scaling factor for the array. Each array pixel
+                becomes a res x res block of screen pixels.
+            skip_unchanged: If True, each update is compared against the
+                previous one and only cell rows whose pixels changed are
+                rewritten. Only use this if nothing else draws to the module.
+            mode: How screen pixels are packed into character cells.
         """
         super().__init__(parent, box)
         self.res = res
-        
+        self.skip_unchanged = skip_unchanged
+        self.mode = mode
+        self._resized()
+
+    def _resized(self) -> None:
+        """Allocates the pixel buffers for the module's shape."""
+        res = self.res
+        ch, cw = dg.image.cell_shape(self.mode)
+        self.pixel_shape = ch * self.shape[0], cw * self.shape[1]
+
+        # Screen pixels are scaled up by writing each source pixel into a
+        # res x res block of this buffer through a broadcast assignment.
+        rows, cols = -(-self.pixel_shape[0] // res), -(-self.pixel_shape[1] // res)
+        self._pixels = np.zeros((rows * res, cols * res, 3), dtype=np.uint8)
+        self._blocks = self._pixels.reshape(rows, res, cols, res, 3)
+        self._last = np.zeros((*self.pixel_shape, 3), dtype=np.uint8) if self.skip_unchanged else None
+        self._has_last = False
+
     def update(self, arr: np.ndarray[np.uint8]) -> None:
         """Updates the module's display with a new array.
 
-        The top half of each character cell gets its color from one row of the
-        array, and the bottom half gets its color from the next row.
+        In "half" mode, the top half of each character cell gets its color
+        from one row of the scaled array, and the bottom half gets its color
+        from the next row. If the scaled array has an odd number of rows, the
+        bottom half of its last cell row is black. In the other modes, partial
+        cells are padded with black. Parts of the array that do not fit are
+        clipped.
 
         Args:
             arr: A NumPy array of shape (height, width, 3) with RGB data.
         """
-        arr = np.tile(arr, (self.res, self.res))
-        self.grid.chars[:] = ord(dg.BLOCKS[9]) # "▀" character
-        self.grid.fg[:] = arr[::2, :, :]
-        self.grid.bg[:] = arr[1::2, :, :]
+        if self.res == 1:
+            pixels = arr[:self.pixel_shape[0], :self.pixel_shape[1]]
+        else:
+            h, w = min(arr.shape[0], self._blocks.shape[0]), min(arr.shape[1], self._blocks.shape[2])
+            self._blocks[:h, :, :w, :] = arr[:h, None, :w, None]
+            pixels = self._pixels[:min(h * self.res, self.pixel_shape[0]), :min(w * self.res, self.pixel_shape[1])]
+        ph, pw = pixels.shape[:2]
+
+        changed = None
+        if self.skip_unchanged:
+            last = self._last[:ph, :pw]
+            changed = np.any(pixels != last, axis=(1, 2)) | (not self._has_last)
+            if not changed.any():
+                return
+            last[...] = pixels
+            self._has_last = True
+
+        if self.mode == "half":
+            self._update_half(pixels, changed)
+        else:
+            ch = self.pixel_shape[0] // self.shape[0]
+            lo, hi = 0, -(-ph // ch)
+            if changed is not None:
+                padded = np.zeros(hi * ch, dtype=bool)
+                padded[:ph] = changed
+                dirty = np.flatnonzero(padded.reshape(hi, ch).any(axis=1))
+                lo, hi = dirty[0], dirty[-1] + 1
+            chars, fg, bg = dg.image.encode_cells(pixels[lo * ch:hi * ch], self.mode)
+            cols = chars.shape[1]
+            self.grid.chars[lo:hi, :cols] = chars
+            self.grid.fg[lo:hi, :cols] = fg
+            self.grid.bg[lo:hi, :cols] = bg
+
+    def _update_half(
+        self,
+        pixels: np.ndarray[np.uint8],
+        changed: typing.Optional[np.ndarray[np.bool_]],
+    ) -> None:
+        """Writes pixels to the grid as "▀" characters, two pixels per cell.
+
+        Args:
+            pixels: The scaled and clipped pixels to draw.
+            changed: For each pixel row, whether it changed since the last
+                update, or None to redraw every row.
+        """
+        ph, pw = pixels.shape[:2]
+        rows = (ph + 1) // 2
+
+        if changed is not None:
+            dirty = changed[0::2].copy()
+            dirty[:ph // 2] |= changed[1::2]
+            cells = np.flatnonzero(dirty)
+            if len(cells) < rows:
+                self.grid.chars[cells, :pw] = ord(dg.BLOCKS[9]) # "▀" character
+                self.grid.fg[cells, :pw] = pixels[2 * cells]
+                bottom = cells[2 * cells + 1 < ph]
+                self.grid.bg[bottom, :pw] = pixels[2 * bottom + 1]
+                if ph % 2 and cells[-1] == rows - 1:
+                    self.grid.bg[rows - 1, :pw] = 0
+                return
+
+        self.grid.chars[:rows, :pw] = ord(dg.BLOCKS[9]) # "▀" character
+        self.grid.fg[:rows, :pw] = pixels[0::2]
+        self.grid.bg[:ph // 2, :pw] = pixels[1::2]
+        if ph % 2:
+            self.grid.bg[rows - 1, :pw] = 0
+
+class VideoModule(ArrayDrawModule):
+    """A module that plays a sequence of RGB frames in real time.
+
+    Frames are read by a background thread into a bounded prefetch queue, so
+    reading from disk or decoding happens off the main thread and memory use
+    stays constant. Playback is timed against a clock: when the module falls
+    behind, late frames are dropped rather than letting playback drift.
+
+    Attributes:
+        fps (float): The playback rate in frames per second.
+        loop (bool): If True, indexable sources restart at the end.
+        frame (np.ndarray | None): The frame currently being shown.
+        index (int): The index of the frame currently being shown.
+        dropped (int): The number of frames skipped because they were late.
+        finished (bool): True once the source is exhausted.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        res: int = 1,
+        source: typing.Union[str, np.ndarray, typing.Iterable[np.ndarray]] = (),
+        frame_shape: typing.Optional[tuple[int, int]] = None,
+        fps: float = 30.0,
+        loop: bool = False,
+        prefetch: int = 8,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Constructs a VideoModule. Playback starts when `play` is called.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box within the parent.
+            res: An integer scaling factor for the frames.
+            source: The frames to play. A path is memory-mapped as raw uint8
+                RGB frames of shape `frame_shape`. An array of shape
+                (frames, height, width, 3) is played directly. Any other
+                iterable, such as a generator, is consumed frame by frame.
+            frame_shape: The (height, width) of each frame of a raw file.
+                Required if `source` is a path.
+            fps: The playback rate in frames per second.
+            loop: Whether to restart at the end. Ignored for iterators.
+            prefetch: The maximum number of frames read ahead.
+            clock: A function returning the current time in seconds.
+        """
+        super().__init__(parent, box, res)
+        if isinstance(source, str):
+            source = np.memmap(source, dtype=np.uint8, mode="r").reshape(-1, *frame_shape, 3)
+        self.source = source
+        self.fps = fps
+        self.loop = loop and isinstance(source, np.ndarray)
+        self.clock = clock
+
+        self.frame = None
+        self.index = -1
+        self.dropped = 0
+        self.finished = False
+
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._pending = None
+        self._start_time = None
+        self._pause_time = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def play(self) -> None:
+        """Starts the reader thread and the playback clock."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._read_frames, daemon=True)
+            self._thread.start()
+        self._start_time = self.clock()
+
+    def close(self) -> None:
+        """Stops the reader thread and waits for it to exit."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stop(self) -> None:
+        """Pauses the module and its playback clock."""
+        super().stop()
+        self._pause_time = self.clock()
+
+    def start(self) -> None:
+        """Resumes the module and its playback clock."""
+        super().start()
+        if self._pause_time is not None and self._start_time is not None:
+            self._start_time += self.clock() - self._pause_time
+        self._pause_time = None
+
+    def _target_index(self) -> int:
+        """Returns the index of the frame that should be showing now."""
+        if self._start_time is None:
+            return 0
+        return int((self.clock() - self._start_time) * self.fps)
+
+    def _put(self, item: typing.Optional[tuple[int, np.ndarray]]) -> bool:
+        """Puts an item on the queue, giving up if the module is closed.
+
+        Returns:
+            False if the module was closed while waiting, True otherwise.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read_frames(self) -> None:
+        """Reads frames from the source into the prefetch queue.
+
+        Runs on the reader thread. Frames of indexable sources that are
+        already late are skipped without being read.
+        """
+        if isinstance(self.source, np.ndarray):
+            n = len(self.source)
+            i = 0
+            while n and (self.loop or i < n):
+                i = max(i, self._target_index())
+                if not self.loop and i >= n:
+                    break
+                if not self._put((i, np.array(self.source[i % n]))):
+                    return
+                i += 1
+        else:
+            for i, frame in enumerate(self.source):
+                if not self._put((i, np.asarray(frame, dtype=np.uint8))):
+                    return
+        self._put(None)
+
+    def _tick(self) -> None:
+        """Advances to the frame due at the current time, dropping late ones."""
+        if self._start_time is None or self.finished:
+            return
+        target = self._target_index()
+        shown = None
+        while True:
+            if self._pending is None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.finished = True
+                    break
+                self._pending = item
+            if self._pending[0] > target:
+                break
+            shown, self._pending = self._pending, None
+
+        if shown is not None:
+            i, self.frame = shown
+            self.dropped += i - self.index - 1
+            self.index = i
+
+    def _draw(self) -> None:
+        """Draws the current frame, if any."""
+        if self.frame is not None:
+            self.update(self.frame)
 
 class BarModule(Module):
-    """A module for drawing a single horizontal or vertical bar."""
+    """A module for drawing a single horizontal or vertical bar.
+
+    Only the cells changed by `update` or `reset` since the last draw are
+    redrawn, so small changes to long bars are cheap.
+    """
     def __init__(
         self,
         parent: Module,
@@ -286,14 +672,31 @@ class BarModule(Module):
         """
         super().__init__(parent, box)
         horz, inv = direction % 2, direction // 2
-
+        self.direction = direction
         self.blocks = [dg.BLOCKS, dg.HORZ_BLOCKS][horz][:-1][::2 * (inv != horz) - 1]
+        self._glyphs = np.array([ord(b) for b in self.blocks], dtype=np.int32)
+        self.length = 0
+        self.data = np.zeros((0, 3), dtype=np.uint8)
+        self.nonempty = np.zeros(0, dtype=bool)
+        self._resized()
+
+    def _resized(self) -> None:
+        """Takes views of the grid along the bar, keeping the bar's data."""
+        horz, inv = self.direction % 2, self.direction // 2
         fg, bg = (self.grid.fg, self.grid.bg)[::2 * (inv == horz) - 1]
         self.fg, self.bg, self.chars, self.attrs = [np.moveaxis(a, horz, 0)[::1 - 2 * inv] for a in [fg, bg, self.grid.chars, self.grid.attrs]]
 
-        self.length = self.box[2 + horz] - self.box[horz]
-        self.data = np.zeros((self.length * 8, 3), dtype=np.uint8)
-        self.nonempty = np.zeros(self.length, dtype=bool)
+        length = self.box[2 + horz] - self.box[horz]
+        data = np.zeros((length * 8, 3), dtype=np.uint8)
+        nonempty = np.zeros(length, dtype=bool)
+        n = min(length, self.length)
+        data[:n * 8], nonempty[:n] = self.data[:n * 8], self.nonempty[:n]
+        self.length, self.data, self.nonempty = length, data, nonempty
+        self._dirty = 0, self.length # Cells [lo, hi) changed since the last draw.
+
+    def _mark_dirty(self, lo: int, hi: int) -> None:
+        """Adds the cells [lo, hi) to the range redrawn by the next draw."""
+        self._dirty = min(self._dirty[0], lo), max(self._dirty[1], hi)
 
     def update(self, p0: float, p1: float, color: tuple[int, int, int]) -> None:
         """Sets a segment of the bar to a specific color.
@@ -306,19 +709,164 @@ class BarModule(Module):
         p0, p1 = np.clip([min(p0, p1), max(p0, p1)], 0, self.length)
         self.data[int(p0 * 8): int(p1 * 8)] = color
         self.nonempty[int(p0): int(np.ceil(p1))] = True
+        self._mark_dirty(int(p0), int(np.ceil(p1)))
     
     def reset(self) -> None:
         """Clears all data from the bar."""
         self.data[:] = 0
         self.nonempty[:] = False
+        self._mark_dirty(0, self.length)
+
+    def invalidate(self) -> None:
+        """Forces the next draw to redraw the whole bar.
+
+        Only cells touched by `update` or `reset` are redrawn each frame, so
+        call this if something else has drawn over the bar.
+        """
+        self._mark_dirty(0, self.length)
 
     def _draw(self) -> None:
-        """Draws the bar to the grid using sub-character blocks."""
-        self.fg[self.nonempty] = self.data[7::8, None][self.nonempty]
-        self.bg[self.nonempty] = self.data[::8, None][self.nonempty]
-        self.chars[self.nonempty] = np.array([ord(b) for b in self.blocks])[np.argmax(np.all(self.data.reshape(-1, 8, 3) == self.data[7::8, None], axis=2), axis=1)][self.nonempty, None]
-        self.attrs[self.nonempty] = dg.TA_NONE
+        """Draws the changed part of the bar using sub-character blocks."""
+        lo, hi = self._dirty
+        if lo >= hi:
+            return
+        self._dirty = self.length, 0
+
+        nonempty = self.nonempty[lo:hi]
+        data = self.data[lo * 8:hi * 8]
+        last = data[7::8, None]
+        fg, bg, chars, attrs = self.fg[lo:hi], self.bg[lo:hi], self.chars[lo:hi], self.attrs[lo:hi]
+
+        fg[nonempty] = last[nonempty]
+        bg[nonempty] = data[::8, None][nonempty]
+        chars[nonempty] = self._glyphs[np.argmax(np.all(data.reshape(-1, 8, 3) == last, axis=2), axis=1)][nonempty, None]
+        attrs[nonempty] = dg.TA_NONE
         
+class BarChartModule(Module):
+    """A module for drawing many parallel bars, such as an audio spectrum.
+
+    All bar values are held in one array, and every bar's characters and
+    colors are computed together in a single vectorized pass per frame.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        n_bars: typing.Optional[int] = None,
+        direction: int = 2, # 0=+i, 1=+j, 2=-i, 3=-j
+        bar_width: int = 1,
+        gap: int = 0,
+        colors: typing.Optional[np.ndarray[np.uint8]] = None,
+        bg_color: tuple[int, int, int] = (0, 0, 0),
+        peak_hold: int = 0,
+        peak_fall: float = 0.02,
+        peak_color: typing.Optional[tuple[int, int, int]] = None,
+    ) -> None:
+        """Constructs a BarChartModule.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box within the parent.
+            n_bars: The number of bars. If None, as many as fit in the box.
+            direction: The direction bars grow in (0: down, 1: right, 2: up,
+                3: left).
+            bar_width: The thickness of each bar in characters.
+            gap: The number of empty characters between bars.
+            colors: An (r, g, b) color for all bars, or an array of shape
+                (n_bars, 3) with one color per bar. Defaults to white.
+            bg_color: The color behind the bars.
+            peak_hold: The number of updates a peak marker stays in place
+                before falling. If 0, no peak markers are drawn.
+            peak_fall: How far a peak marker falls per update once released,
+                as a fraction of the full bar length.
+            peak_color: The color of the peak markers. If None, each bar's
+                own color is used.
+        """
+        super().__init__(parent, box)
+        horz = direction % 2
+        self.direction = direction
+        self.bar_width = bar_width
+        self.gap = gap
+        if n_bars is None:
+            n_bars = (self.shape[1 - horz] + gap) // (bar_width + gap)
+        self.n_bars = n_bars
+        self.values = np.zeros(n_bars, dtype=np.float32)
+        self.colors = np.empty((n_bars, 3), dtype=np.uint8)
+        self.colors[:] = (255, 255, 255) if colors is None else colors
+        self.bg_color = np.array(bg_color, dtype=np.uint8)
+
+        self.peak_hold = peak_hold
+        self.peak_fall = peak_fall
+        self.peak_color = peak_color
+        self.peaks = np.zeros(n_bars, dtype=np.float32)
+        self._peak_age = np.zeros(n_bars, dtype=np.int32)
+
+        # Glyphs for a cell filled 0 to 8 eighths from the base of the bar.
+        # Bars growing down or left have no matching glyphs, so the opposite
+        # glyphs are used with the foreground and background swapped.
+        eighths = [dg.BLOCKS, dg.HORZ_BLOCKS][horz][:9]
+        self._swap = direction in (0, 3)
+        if self._swap:
+            eighths = eighths[::-1]
+        self._glyphs = np.array([ord(c) for c in eighths], dtype=np.int32)
+        self._marker = ord("▁▕▔▏"[direction]) # A line at the far edge of a cell.
+        self._resized()
+
+    def _resized(self) -> None:
+        """Takes views of the grid along the bars and lays the bars out across it."""
+        horz, inv = self.direction % 2, self.direction // 2
+        self.chars, self.fg, self.bg, self.attrs = [np.moveaxis(a, horz, 0)[::1 - 2 * inv] for a in [self.grid.chars, self.grid.fg, self.grid.bg, self.grid.attrs]]
+        self.length, cross = self.chars.shape
+        self._cells = 8 * np.arange(self.length)[:, None]
+
+        # Which bar, if any, covers each line across the chart.
+        pos = np.arange(cross)
+        self._bar_of = pos // (self.bar_width + self.gap)
+        self._in_bar = (pos % (self.bar_width + self.gap) < self.bar_width) & (self._bar_of < self.n_bars)
+        self._bar_of = np.minimum(self._bar_of, self.n_bars - 1)
+
+    def update(self, values: np.ndarray[np.float32]) -> None:
+        """Sets the height of every bar.
+
+        Args:
+            values: An array of shape (n_bars,) of bar heights, from 0 (empty)
+                to 1 (the full length of the chart).
+        """
+        self.values[:] = np.clip(values, 0, 1)
+        if self.peak_hold:
+            self._peak_age += 1
+            falling = self._peak_age > self.peak_hold
+            self.peaks[falling] -= self.peak_fall
+            raised = self.values >= self.peaks
+            self.peaks[raised] = self.values[raised]
+            self._peak_age[raised] = 0
+
+    def reset(self) -> None:
+        """Empties every bar and clears the peak markers."""
+        self.values[:] = 0
+        self.peaks[:] = 0
+        self._peak_age[:] = 0
+
+    def _draw(self) -> None:
+        """Draws every bar with eighth-block characters in one pass."""
+        level = np.where(self._in_bar, np.rint(self.values * self.length * 8).astype(np.int32)[self._bar_of], 0)
+        fill = np.clip(level - self._cells, 0, 8)
+        bar_colors = self.colors[self._bar_of]
+        on, off = (self.bg, self.fg) if self._swap else (self.fg, self.bg)
+
+        self.chars[:] = self._glyphs[fill]
+        on[:] = bar_colors
+        off[:] = self.bg_color
+        self.attrs[:] = dg.TA_NONE
+
+        if self.peak_hold:
+            peak_top = -(-np.rint(self.peaks * self.length * 8).astype(np.int32)[self._bar_of] // 8)
+            lines = np.flatnonzero(self._in_bar & (peak_top > -(-level // 8)))
+            cells = peak_top[lines] - 1
+            self.chars[cells, lines] = self._marker
+            self.fg[cells, lines] = bar_colors[lines] if self.peak_color is None else self.peak_color
+            self.bg[cells, lines] = self.bg_color
+
 class ButtonTrigger(Module):
     """A clickable, invisible module that triggers functions on mouse events."""
     def __init__(
@@ -414,7 +962,7 @@ class TextInputModule(Module):
             empty_color: The color of the placeholder text.
         """
         super().__init__(parent, box)
-        self.text = list(start_text)
+        self.text = dg.text.GapBuffer(start_text)
         self.scroll_pos = max(0, len(start_text) - self.shape[1])
         self.cursor_pos = len(start_text)
         self.empty_text = empty_text
@@ -425,47 +973,51 @@ class TextInputModule(Module):
     def _draw(self) -> None:
         """Draws the text field, cursor, and placeholder text."""
         self.grid.fill(" ", self.bg_color, self.bg_color)
-        if self.text:
+        if len(self.text):
             text = "".join(self.text[self.scroll_pos:self.scroll_pos + self.shape[1]])
             if self.scroll_pos > 0:
                 text = "<" + text[1:]
             if len(self.text) > self.shape[1] + self.scroll_pos:
                 text = text[:-1] + ">"
             
-            self.grid.print(text, (0, 0), self.fg_color, self.bg_color)
+            self.grid.chars[0, :len(text)] = _codes(text)
+            self.grid.fg[0, :len(text)] = self.fg_color
             self.grid.fg[0, self.cursor_pos - self.scroll_pos] = self.bg_color
             self.grid.bg[0, self.cursor_pos - self.scroll_pos] = self.fg_color
 
         else:
-            self.grid.print(self.empty_text, (0, 0), self.empty_color, self.bg_color)
+            text = self.empty_text[:self.shape[1]]
+            self.grid.chars[0, :len(text)] = _codes(text)
+            self.grid.fg[0, :len(text)] = self.empty_color
         
     def _handle_event(self, event: dg.Event) -> bool:
         """Handles key and mouse events for text input and cursor control."""
         if isinstance(event, dg.MouseEvent):
-            self.cursor_pos = event.pos[1] + self.scroll_pos
+            self.cursor_pos = min(event.pos[1] + self.scroll_pos, len(self.text))
             return True
         elif isinstance(event, dg.KeyEvent):
-            if event.key == "KEY_BACKSPACE":
+            key = _KEY_NAMES.get(event.key, event.key)
+            if key == "KEY_BACKSPACE":
                 if self.cursor_pos > 0:
-                    self.text.pop(self.cursor_pos - 1)
+                    self.text.delete(self.cursor_pos - 1)
                     self.cursor_pos -= 1
                     if self.cursor_pos < self.scroll_pos:
                         self.scroll_pos = max(0, self.scroll_pos - 1)
                 return True
-            elif event.key == "KEY_LEFT":
+            elif key == "KEY_LEFT":
                 if self.cursor_pos > 0:
                     self.cursor_pos -= 1
                     if self.cursor_pos < self.scroll_pos:
                         self.scroll_pos = max(0, self.scroll_pos - 1)
                 return True
-            elif event.key == "KEY_RIGHT":
+            elif key == "KEY_RIGHT":
                 if self.cursor_pos < len(self.text):
                     self.cursor_pos += 1
                     if self.cursor_pos >= self.shape[1] + self.scroll_pos:
                         self.scroll_pos += 1
                 return True
-            elif len(event.key) == 1 and event.key.isprintable():
-                self.text.insert(self.cursor_pos, event.key)
+            elif len(key) == 1 and key.isprintable():
+                self.text.insert(self.cursor_pos, key)
                 self.cursor_pos += 1
                 if self.cursor_pos >= self.shape[1] + self.scroll_pos:
                     self.scroll_pos += 1
@@ -474,7 +1026,736 @@ class TextInputModule(Module):
 
     def __str__(self) -> str:
         """Returns the current text content of the module."""
-        return "".join(self.text)
+        return str(self.text)
+
+class TextAreaModule(Module):
+    """A multi-line text editor.
+
+    Text is stored as a `dg.text.GapBuffer` of lines, so typing, splitting
+    and joining lines near the cursor is cheap however long the document is.
+    Only the lines in the visible viewport are drawn.
+
+    Attributes:
+        lines (dg.text.GapBuffer): The lines of text, without newlines.
+        cursor (tuple[int, int]): The (line, column) position of the cursor.
+        top (int): The index of the first visible line.
+        left (int): The index of the first visible column.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        text: str = "",
+        fg_color: tuple[int, int, int] = (255, 255, 255),
+        bg_color: tuple[int, int, int] = (0, 0, 0),
+        scroll_step: int = 3,
+    ) -> None:
+        """Constructs a TextAreaModule.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box for the text area.
+            text: The initial text. Lines are separated by "\\n".
+            fg_color: The color of the text.
+            bg_color: The background color of the text area.
+            scroll_step: The number of lines scrolled per mouse wheel step.
+        """
+        super().__init__(parent, box)
+        self.lines = dg.text.GapBuffer(text.split("\n"))
+        self.cursor = 0, 0
+        self.top = 0
+        self.left = 0
+        self.fg_color = fg_color
+        self.bg_color = bg_color
+        self.scroll_step = scroll_step
+
+    @property
+    def text(self) -> str:
+        """The whole text, with lines joined by newlines."""
+        return "\n".join(self.lines)
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self.lines = dg.text.GapBuffer(text.split("\n"))
+        self.cursor = 0, 0
+        self.top = self.left = 0
+
+    def __str__(self) -> str:
+        """Returns the current text content of the module."""
+        return self.text
+
+    def _draw(self) -> None:
+        """Draws the visible lines and the cursor."""
+        rows, cols = self.shape
+        self.grid.fill(" ", self.fg_color, self.bg_color)
+        for i, line in enumerate(self.lines[self.top:self.top + rows]):
+            line = line[self.left:self.left + cols]
+            self.grid.chars[i, :len(line)] = _codes(line)
+
+        i, j = self.cursor[0] - self.top, self.cursor[1] - self.left
+        if 0 <= i < rows and 0 <= j < cols:
+            self.grid.fg[i, j] = self.bg_color
+            self.grid.bg[i, j] = self.fg_color
+
+    def move_cursor(self, line: int, col: int) -> None:
+        """Moves the cursor, clamped to the text, and scrolls to show it."""
+        line = min(max(line, 0), len(self.lines) - 1)
+        col = min(max(col, 0), len(self.lines[line]))
+        self.cursor = line, col
+        rows, cols = self.shape
+        self.top = min(max(self.top, line - rows + 1), line)
+        self.left = min(max(self.left, col - cols + 1), col)
+
+    def scroll(self, n: int) -> None:
+        """Scrolls the view by `n` lines without moving the cursor."""
+        self.top = min(max(self.top + n, 0), max(len(self.lines) - self.shape[0], 0))
+
+    def insert(self, text: str) -> None:
+        """Inserts text, which may contain newlines, at the cursor."""
+        line, col = self.cursor
+        current = self.lines[line]
+        new = (current[:col] + text + current[col:]).split("\n")
+        self.lines[line] = new[0]
+        self.lines.insert_many(line + 1, new[1:])
+        self.move_cursor(line + len(new) - 1, len(new[-1]) - len(current) + col)
+
+    def _backspace(self) -> None:
+        """Deletes the character before the cursor, joining lines at the start."""
+        line, col = self.cursor
+        if col > 0:
+            current = self.lines[line]
+            self.lines[line] = current[:col - 1] + current[col:]
+            self.move_cursor(line, col - 1)
+        elif line > 0:
+            prev = self.lines[line - 1]
+            self.lines[line - 1] = prev + self.lines.pop(line)
+            self.move_cursor(line - 1, len(prev))
+
+    def _delete(self) -> None:
+        """Deletes the character after the cursor, joining lines at the end."""
+        line, col = self.cursor
+        current = self.lines[line]
+        if col < len(current):
+            self.lines[line] = current[:col] + current[col + 1:]
+        elif line + 1 < len(self.lines):
+            self.lines[line] = current + self.lines.pop(line + 1)
+
+    def _handle_event(self, event: dg.Event) -> bool:
+        """Handles typing, editing, cursor movement and scrolling."""
+        if isinstance(event, dg.MouseEvent):
+            if not event.state:
+                return False
+            if event.button == 4:
+                self.scroll(-self.scroll_step)
+            elif event.button == 5:
+                self.scroll(self.scroll_step)
+            else:
+                self.move_cursor(event.pos[0] + self.top, event.pos[1] + self.left)
+            return True
+        elif isinstance(event, dg.KeyEvent):
+            key = _KEY_NAMES.get(event.key, event.key)
+            line, col = self.cursor
+            if key == "KEY_BACKSPACE":
+                self._backspace()
+            elif key == "KEY_DELETE":
+                self._delete()
+            elif key == "KEY_LEFT":
+                if col == 0 and line > 0:
+                    self.move_cursor(line - 1, len(self.lines[line - 1]))
+                else:
+                    self.move_cursor(line, col - 1)
+            elif key == "KEY_RIGHT":
+                if col == len(self.lines[line]) and line + 1 < len(self.lines):
+                    self.move_cursor(line + 1, 0)
+                else:
+                    self.move_cursor(line, col + 1)
+            elif key == "KEY_UP":
+                self.move_cursor(line - 1, col)
+            elif key == "KEY_DOWN":
+                self.move_cursor(line + 1, col)
+            elif key == "KEY_PAGEUP":
+                self.move_cursor(line - self.shape[0], col)
+            elif key == "KEY_PAGEDOWN":
+                self.move_cursor(line + self.shape[0], col)
+            elif key == "KEY_HOME":
+                self.move_cursor(line, 0)
+            elif key == "KEY_END":
+                self.move_cursor(line, len(self.lines[line]))
+            elif key == "\n" or (len(key) == 1 and key.isprintable()):
+                self.insert(key)
+            else:
+                return False
+            return True
+        return False
+
+class ScrollView(Module):
+    """A window onto a content grid larger than the module.
+
+    Draw into `content`, and the visible part of it is copied to the screen.
+    Scrolling is animated like in `ListView`.
+
+    Attributes:
+        content (dg.Grid): The full-size grid that is scrolled over.
+        top (float): The first visible content row while scrolling.
+        left (int): The first visible content column.
+        target_top (int): The first visible row when scrolling finishes.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        content_shape: tuple[int, int] = (100, 80),
+        scroll_step: int = 3,
+        smoothing: float = 0.5,
+    ) -> None:
+        """Constructs a ScrollView.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box for the visible window.
+            content_shape: The (rows, cols) shape of the content grid.
+            scroll_step: The number of rows scrolled per mouse wheel step.
+            smoothing: The fraction of the remaining distance scrolled on
+                each tick. 1 scrolls instantly.
+        """
+        super().__init__(parent, box)
+        self.content = dg.Grid(
+            np.zeros((*content_shape, 2, 3), dtype=np.uint8),
+            np.zeros(content_shape, dtype=np.int32),
+            np.zeros(content_shape, dtype=np.uint8),
+        )
+        self.scroll_step = scroll_step
+        self.smoothing = smoothing
+        self.top = 0.0
+        self.left = 0
+        self.target_top = 0
+
+    def scroll(self, rows: int, cols: int = 0) -> None:
+        """Starts scrolling the view by `rows` rows and `cols` columns."""
+        self.target_top = min(max(self.target_top + rows, 0), max(self.content.shape[0] - self.shape[0], 0))
+        self.left = min(max(self.left + cols, 0), max(self.content.shape[1] - self.shape[1], 0))
+
+    def _tick(self) -> None:
+        """Moves the view towards its target row."""
+        self.top += (self.target_top - self.top) * self.smoothing
+        if abs(self.target_top - self.top) < 0.5:
+            self.top = float(self.target_top)
+
+    def _draw(self) -> None:
+        """Copies the visible part of the content to the screen."""
+        self.grid.clear()
+        top = int(round(self.top))
+        self.grid.blit(self.content, src_rect=(top, self.left, top + self.shape[0], self.left + self.shape[1]))
+
+    def _handle_event(self, event: dg.Event) -> bool:
+        """Handles scrolling keys and the mouse wheel."""
+        if isinstance(event, dg.MouseEvent):
+            if event.state and event.button in (4, 5):
+                self.scroll(self.scroll_step if event.button == 5 else -self.scroll_step)
+                return True
+            return False
+        elif isinstance(event, dg.KeyEvent):
+            moves = {
+                "KEY_UP": (-1, 0),
+                "KEY_DOWN": (1, 0),
+                "KEY_LEFT": (0, -1),
+                "KEY_RIGHT": (0, 1),
+                "KEY_PAGEUP": (-self.shape[0], 0),
+                "KEY_PAGEDOWN": (self.shape[0], 0),
+                "KEY_HOME": (-self.content.shape[0], 0),
+                "KEY_END": (self.content.shape[0], 0),
+            }
+            move = moves.get(_KEY_NAMES.get(event.key, event.key))
+            if move is None:
+                return False
+            self.scroll(*move)
+            return True
+        return False
+
+class ListView(Module):
+    """A scrollable list over a data source of any length.
+
+    Only the visible rows are rendered, and rendered rows are kept in an LRU
+    cache keyed by (index, version), so scrolling through a long list only
+    renders rows that come into view. Call `invalidate` when the source's
+    items change to bump the version.
+
+    Scrolling is animated: the view moves part of the way towards its target
+    row on every tick.
+
+    Attributes:
+        source: A sequence, or a function from index to item.
+        selected (int): The index of the selected item.
+        top (float): The index of the first visible row while scrolling.
+        target_top (int): The index of the first visible row when scrolling
+            finishes.
+        version (int): Incremented by `invalidate` to discard cached rows.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        source: typing.Union[typing.Sequence[typing.Any], typing.Callable[[int], typing.Any]] = (),
+        length: typing.Optional[int] = None,
+        render: typing.Callable[[typing.Any], str] = str,
+        select_fn: typing.Callable[[int], None] = lambda index: None,
+        fg_color: tuple[int, int, int] = (255, 255, 255),
+        bg_color: tuple[int, int, int] = (0, 0, 0),
+        select_fg: tuple[int, int, int] = (0, 0, 0),
+        select_bg: tuple[int, int, int] = (255, 255, 255),
+        cache_size: int = 1024,
+        scroll_step: int = 3,
+        smoothing: float = 0.5,
+    ) -> None:
+        """Constructs a ListView.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box for the list.
+            source: A sequence of items, or a function returning the item at
+                an index.
+            length: The number of items if `source` is a function.
+            render: A function turning an item into the text of its row.
+            select_fn: The function called with the selected index when the
+                selection is activated with enter or a click.
+            fg_color: The color of the text.
+            bg_color: The background color of the list.
+            select_fg: The text color of the selected row.
+            select_bg: The background color of the selected row.
+            cache_size: The maximum number of rendered rows to keep.
+            scroll_step: The number of rows scrolled per mouse wheel step.
+            smoothing: The fraction of the remaining distance scrolled on
+                each tick. 1 scrolls instantly.
+
+        Raises:
+            ValueError: If `source` is a function and `length` is None.
+        """
+        super().__init__(parent, box)
+        self.render = render
+        self.select_fn = select_fn
+        self.fg_color = fg_color
+        self.bg_color = bg_color
+        self.select_fg = select_fg
+        self.select_bg = select_bg
+        self.cache_size = cache_size
+        self.scroll_step = scroll_step
+        self.smoothing = smoothing
+        self.version = 0
+        self._rows: collections.OrderedDict[tuple[int, int], np.ndarray[np.uint32]] = collections.OrderedDict()
+        self.set_source(source, length)
+
+    def set_source(
+        self,
+        source: typing.Union[typing.Sequence[typing.Any], typing.Callable[[int], typing.Any]],
+        length: typing.Optional[int] = None,
+    ) -> None:
+        """Replaces the data source and scrolls back to the start.
+
+        Args:
+            source: A sequence of items, or a function returning the item at
+                an index.
+            length: The number of items if `source` is a function.
+
+        Raises:
+            ValueError: If `source` is a function and `length` is None.
+        """
+        if callable(source) and length is None:
+            raise ValueError("A ListView with a function as its source needs a length.")
+        self.source = source
+        self._length = length
+        self.selected = 0
+        self.top = 0.0
+        self.target_top = 0
+        self.invalidate()
+
+    def __len__(self) -> int:
+        """Returns the number of items in the source."""
+        return self._length if callable(self.source) else len(self.source)
+
+    def invalidate(self) -> None:
+        """Discards every rendered row, so changed items are rendered again."""
+        self.version += 1
+        self._rows.clear()
+
+    def _resized(self) -> None:
+        """Discards rows rendered for the old width and keeps the view in range."""
+        self.invalidate()
+        self.scroll(0)
+
+    def _row(self, index: int) -> np.ndarray[np.uint32]:
+        """Returns the rendered characters of one row, using the cache."""
+        key = index, self.version
+        try:
+            self._rows.move_to_end(key)
+            return self._rows[key]
+        except KeyError:
+            pass
+        item = self.source(index) if callable(self.source) else self.source[index]
+        row = self._rows[key] = _codes(self.render(item)[:self.shape[1]].ljust(self.shape[1]))
+        if len(self._rows) > self.cache_size:
+            self._rows.popitem(last=False)
+        return row
+
+    def scroll(self, n: int) -> None:
+        """Starts scrolling the view by `n` rows."""
+        self.target_top = min(max(self.target_top + n, 0), max(len(self) - self.shape[0], 0))
+
+    def select(self, index: int) -> None:
+        """Selects an item, clamped to the list, and scrolls to show it."""
+        self.selected = min(max(index, 0), max(len(self) - 1, 0))
+        if self.selected < self.target_top:
+            self.scroll(self.selected - self.target_top)
+        elif self.selected >= self.target_top + self.shape[0]:
+            self.scroll(self.selected - self.target_top - self.shape[0] + 1)
+
+    def _tick(self) -> None:
+        """Moves the view towards its target row."""
+        self.top += (self.target_top - self.top) * self.smoothing
+        if abs(self.target_top - self.top) < 0.5:
+            self.top = float(self.target_top)
+
+    def _draw(self) -> None:
+        """Draws the visible rows and highlights the selection."""
+        self.grid.fill(" ", self.fg_color, self.bg_color)
+        first = int(round(self.top))
+        indices = range(first, min(first + self.shape[0], len(self)))
+        if indices:
+            self.grid.chars[:len(indices)] = np.stack([self._row(index) for index in indices])
+        if self.selected in indices:
+            self.grid.fg[self.selected - first] = self.select_fg
+            self.grid.bg[self.selected - first] = self.select_bg
+
+    def _handle_event(self, event: dg.Event) -> bool:
+        """Handles selection keys, mouse wheel scrolling and clicks."""
+        if isinstance(event, dg.MouseEvent):
+            if not event.state:
+                return False
+            if event.button == 4:
+                self.scroll(-self.scroll_step)
+            elif event.button == 5:
+                self.scroll(self.scroll_step)
+            elif int(round(self.top)) + event.pos[0] < len(self):
+                self.selected = int(round(self.top)) + event.pos[0]
+                self.select_fn(self.selected)
+            return True
+        elif isinstance(event, dg.KeyEvent):
+            key = _KEY_NAMES.get(event.key, event.key)
+            moves = {
+                "KEY_UP": -1,
+                "KEY_DOWN": 1,
+                "KEY_PAGEUP": -self.shape[0],
+                "KEY_PAGEDOWN": self.shape[0],
+                "KEY_HOME": -len(self),
+                "KEY_END": len(self),
+            }
+            if key in moves:
+                self.select(self.selected + moves[key])
+            elif key == "\n" and len(self):
+                self.select_fn(self.selected)
+            else:
+                return False
+            return True
+        return False
+
+class LogViewModule(Module):
+    """A viewer that follows a growing log file or a stream of lines.
+
+    Lines are found through a `dg.text.LineIndex`, so any part of a log of
+    any size can be shown without reading the rest. Lines from an iterable
+    are spooled to a temporary file by a background thread and indexed the
+    same way, so memory use stays flat.
+
+    While following, new lines scroll the existing rows with
+    `dg.Grid.scroll` and only the new rows are rendered.
+
+    Attributes:
+        index (dg.text.LineIndex): The index of the log's lines.
+        top (int): The index of the first visible line.
+        follow (bool): Whether the view stays at the end of the log as it
+            grows. Scrolling up stops following, and scrolling to the end
+            starts it again.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        source: typing.Union[str, os.PathLike, typing.Iterable[str]] = (),
+        follow: bool = True,
+        fg_color: tuple[int, int, int] = (255, 255, 255),
+        bg_color: tuple[int, int, int] = (0, 0, 0),
+        scroll_step: int = 3,
+    ) -> None:
+        """Constructs a LogViewModule.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box for the viewer.
+            source: The path of a log file, or an iterable of lines, such as
+                a generator. Iterables are consumed in a background thread.
+            follow: If True, the view starts at the end of the log and
+                follows it as it grows.
+            fg_color: The color of the text.
+            bg_color: The background color of the viewer.
+            scroll_step: The number of lines scrolled per mouse wheel step.
+        """
+        super().__init__(parent, box)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._spool_file: typing.Optional[typing.BinaryIO] = None
+        if isinstance(source, (str, os.PathLike)):
+            self.index = dg.text.LineIndex(source)
+        else:
+            spool = self._spool_file = tempfile.TemporaryFile(buffering=0)
+            self.index = dg.text.LineIndex(spool)
+            self._reader = threading.Thread(target=self._spool, args=(source, spool), daemon=True)
+            self._reader.start()
+        self.follow = follow
+        self.fg_color = fg_color
+        self.bg_color = bg_color
+        self.scroll_step = scroll_step
+        self.top = self._end() if follow else 0
+        self._drawn: typing.Optional[tuple[int, int, int]] = None
+
+    def _spool(self, source: typing.Iterable[str], spool: typing.BinaryIO) -> None:
+        """Appends every line from an iterable to the spool file until closed."""
+        for line in source:
+            with self._lock:
+                if self._closed:
+                    return
+                spool.write((line.rstrip("\n") + "\n").encode())
+
+    def close(self) -> None:
+        """Stops the module and releases its index and files.
+
+        Lines from an iterable are no longer spooled, although the background
+        thread only exits once the iterable yields again.
+        """
+        self.stop()
+        with self._lock:
+            self._closed = True
+            self.index.close()
+            if self._spool_file is not None:
+                self._spool_file.close()
+
+    def _end(self) -> int:
+        """Returns the top line that shows the end of the log."""
+        return max(len(self.index) - self.shape[0], 0)
+
+    def invalidate(self) -> None:
+        """Forces the next draw to render every row."""
+        self._drawn = None
+
+    def start(self) -> None:
+        """Activates the module, redrawing it fully as it may be covered."""
+        super().start()
+        self.invalidate()
+
+    def _resized(self) -> None:
+        """Redraws every row, keeping the end in view while following."""
+        self.invalidate()
+        self.top = self._end() if self.follow else min(self.top, self._end())
+
+    def scroll(self, n: int) -> None:
+        """Scrolls the view by `n` lines, following again at the end."""
+        self.top = min(max(self.top + n, 0), self._end())
+        self.follow = self.top == self._end()
+
+    def _tick(self) -> None:
+        """Indexes new lines and keeps up with them while following."""
+        self.index.update()
+        if self.follow:
+            self.top = self._end()
+
+    def _draw(self) -> None:
+        """Renders the rows that are new or changed since the last draw."""
+        rows, complete, size = self.shape[0], self.index.complete_lines, self.index.size
+        first = 0
+        if self._drawn is not None and size >= self._drawn[2]:
+            drawn_top, drawn_complete, drawn_size = self._drawn
+            delta = self.top - drawn_top
+            if 0 <= delta < rows:
+                if delta:
+                    self.grid.scroll(delta)
+                first = rows - delta
+                if size != drawn_size:
+                    # An unterminated last line may have grown, and lines may follow it.
+                    first = min(first, max(drawn_complete - self.top, 0))
+        self._drawn = self.top, complete, size
+        if first < rows:
+            self._write_rows(first, self.index.lines(self.top + first, rows - first))
+
+    def _write_rows(self, first: int, lines: list[str]) -> None:
+        """Writes lines into consecutive rows, clearing the rows below them."""
+        rows, cols = self.shape
+        block = np.full((rows - first, cols), ord(" "), dtype=np.uint32)
+        for i, line in enumerate(lines):
+            codes = _codes(line[:cols])
+            block[i, :len(codes)] = codes
+        self.grid.chars[first:] = block
+        self.grid.fg[first:] = self.fg_color
+        self.grid.bg[first:] = self.bg_color
+        self.grid.attrs[first:] = dg.TA_NONE
+
+    def _handle_event(self, event: dg.Event) -> bool:
+        """Handles scrolling keys and the mouse wheel."""
+        if isinstance(event, dg.MouseEvent):
+            if event.state and event.button in (4, 5):
+                self.scroll(self.scroll_step if event.button == 5 else -self.scroll_step)
+                return True
+            return False
+        elif isinstance(event, dg.KeyEvent):
+            moves = {
+                "KEY_UP": -1,
+                "KEY_DOWN": 1,
+                "KEY_PAGEUP": -self.shape[0],
+                "KEY_PAGEDOWN": self.shape[0],
+                "KEY_HOME": -len(self.index),
+                "KEY_END": len(self.index),
+            }
+            move = moves.get(_KEY_NAMES.get(event.key, event.key))
+            if move is None:
+                return False
+            self.scroll(move)
+            return True
+        return False
+
+class TableColumn(typing.NamedTuple):
+    """Describes one column of a TableModule.
+
+    Attributes:
+        name: The header text, and the key of the column's data.
+        width: The width of the column in characters.
+        align: "<", ">" or "^" to align left, right or center.
+        decimals: The number of decimals floats are shown with.
+        fg: The text color of the column, or None for the table's color.
+    """
+    name: str
+    width: int
+    align: str = ">"
+    decimals: int = 2
+    fg: typing.Optional[tuple[int, int, int]] = None
+
+class TableModule(Module):
+    """A scrollable table of columns of NumPy arrays.
+
+    Each visible column is formatted as a whole with `dg.text.format_column`,
+    and the resulting block of characters is written into the grid in one
+    assignment. Columns that do not fit the module are clipped.
+
+    Attributes:
+        columns (list[TableColumn]): The columns, from left to right.
+        data (dict[str, np.ndarray]): The values of each column, by name.
+        top (int): The index of the first visible row.
+    """
+    def __init__(
+        self,
+        parent: Module,
+        box: typing.Optional[tuple[int, int, int, int]] = None,
+        columns: typing.Sequence[TableColumn] = (),
+        gap: int = 1,
+        fg_color: tuple[int, int, int] = (255, 255, 255),
+        bg_color: tuple[int, int, int] = (0, 0, 0),
+        header_fg: tuple[int, int, int] = (0, 0, 0),
+        header_bg: tuple[int, int, int] = (255, 255, 255),
+        header_attrs: int = dg.TA_BOLD,
+        stripe_bg: typing.Optional[tuple[int, int, int]] = None,
+    ) -> None:
+        """Constructs a TableModule.
+
+        Args:
+            parent: The parent module.
+            box: The bounding box for the table.
+            columns: The columns, from left to right.
+            gap: The number of blank characters between columns.
+            fg_color: The color of the values.
+            bg_color: The background color of the table.
+            header_fg: The text color of the header row.
+            header_bg: The background color of the header row.
+            header_attrs: The text attributes of the header row.
+            stripe_bg: If not None, the background color of every other row.
+        """
+        super().__init__(parent, box)
+        self.columns = list(columns)
+        self.gap = gap
+        self.fg_color = fg_color
+        self.bg_color = bg_color
+        self.header_fg = header_fg
+        self.header_bg = header_bg
+        self.header_attrs = header_attrs
+        self.stripe_bg = stripe_bg
+        self.data: dict[str, np.ndarray] = {column.name: np.zeros(0) for column in self.columns}
+        self.top = 0
+
+    def __len__(self) -> int:
+        """Returns the number of rows, that of the shortest column."""
+        return min((len(values) for values in self.data.values()), default=0)
+
+    def update(self, data: typing.Mapping[str, np.typing.ArrayLike]) -> None:
+        """Replaces the values of some or all columns.
+
+        Args:
+            data: Arrays of values, keyed by column name.
+        """
+        for name, values in data.items():
+            self.data[name] = np.asarray(values)
+        self.scroll(0)
+
+    def scroll(self, n: int) -> None:
+        """Scrolls the rows by `n`, keeping the view within the table."""
+        self.top = min(max(self.top + n, 0), max(len(self) - (self.shape[0] - 1), 0))
+
+    def _draw(self) -> None:
+        """Formats the visible rows and writes them below the header."""
+        rows, cols = self.shape
+        self.grid.fill(" ", self.fg_color, self.bg_color, dg.TA_NONE)
+        self.grid.fg[0] = self.header_fg
+        self.grid.bg[0] = self.header_bg
+        self.grid.attrs[0] = self.header_attrs
+        if self.stripe_bg is not None:
+            self.grid.bg[1 + (self.top % 2 == 0)::2] = self.stripe_bg
+
+        visible = slice(self.top, min(self.top + rows - 1, len(self)))
+        n = visible.stop - visible.start
+        headers, blocks = [], []
+        j = 0
+        for column in self.columns:
+            if j >= cols:
+                break
+            headers.append(dg.text.format_column([column.name], column.width, column.align))
+            blocks.append(dg.text.format_column(self.data[column.name][visible], column.width, column.align, column.decimals))
+            if column.fg is not None:
+                self.grid.fg[1:1 + n, j:j + column.width] = column.fg
+            j += column.width + self.gap
+            if self.gap:
+                headers.append(np.full((1, self.gap), ord(" "), dtype=np.uint32))
+                blocks.append(np.full((n, self.gap), ord(" "), dtype=np.uint32))
+
+        if blocks:
+            block = np.concatenate([np.concatenate(headers, axis=1), np.concatenate(blocks, axis=1)])
+            self.grid.chars[:1 + n, :min(block.shape[1], cols)] = block[:, :cols]
+
+    def _handle_event(self, event: dg.Event) -> bool:
+        """Handles scrolling keys and the mouse wheel."""
+        if isinstance(event, dg.MouseEvent):
+            if event.state and event.button in (4, 5):
+                self.scroll(3 if event.button == 5 else -3)
+                return True
+            return False
+        elif isinstance(event, dg.KeyEvent):
+            moves = {
+                "KEY_UP": -1,
+                "KEY_DOWN": 1,
+                "KEY_PAGEUP": 1 - self.shape[0],
+                "KEY_PAGEDOWN": self.shape[0] - 1,
+                "KEY_HOME": -len(self),
+                "KEY_END": len(self),
+            }
+            move = moves.get(_KEY_NAMES.get(event.key, event.key))
+            if move is None:
+                return False
+            self.scroll(move)
+            return True
+        return False
 
 class FPSMeter(Module):
     """A module that displays the current frames per second."""
@@ -525,6 +1806,11 @@ class BorderModule(Module):
         """
         super().__init__(parent, box)
         self.depth = depth
+        self._resized()
+
+    def _resized(self) -> None:
+        """Updates the box inside the border."""
+        depth = self.depth
         self.inner_box = int(np.ceil(depth / 2)), depth, self.shape[0] - int(np.ceil(depth / 2)), self.shape[1] - depth
 
     def _draw(self) -> None:
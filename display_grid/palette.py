@@ -0,0 +1,101 @@
+"""This module maps RGB colors to indexed terminal palettes.
+
+Terminals without truecolor support only accept xterm's 256-color or the basic
+16-color palette. Rather than matching colors one at a time, a 32x32x32 lookup
+table from quantized RGB to palette index is built once per palette, after
+which whole color planes are mapped with a single vectorized gather.
+"""
+import functools
+
+import numpy as np
+
+LUT_BITS = 5
+
+def _xterm_palette() -> np.ndarray[np.uint8]:
+    """Builds the default xterm 256-color palette as an array of shape (256, 3)."""
+    basic = [
+        (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+        (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+        (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+        (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+    ]
+    levels = np.array([0, 95, 135, 175, 215, 255])
+    cube = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).reshape(-1, 3)
+    grays = np.repeat(8 + 10 * np.arange(24), 3).reshape(-1, 3)
+    return np.concatenate([basic, cube, grays]).astype(np.uint8)
+
+XTERM_PALETTE = _xterm_palette()
+
+# The basic 16 colors are often redefined by terminal themes, so 256-color
+# output only uses the color cube and gray ramp, whose values are fixed.
+_PALETTE_RANGES = {
+    16: (0, 16),
+    256: (16, 256),
+}
+
+# A 4x4 Bayer matrix of thresholds in [-0.5, 0.5).
+_BAYER = (np.array([
+    [0, 8, 2, 10],
+    [12, 4, 14, 6],
+    [3, 11, 1, 9],
+    [15, 7, 13, 5],
+]) + 0.5) / 16 - 0.5
+
+# Roughly the distance between neighboring palette colors on each axis.
+_DITHER_STRENGTH = {
+    16: 96,
+    256: 40,
+}
+
+
+@functools.cache
+def palette_lut(depth: int) -> np.ndarray[np.uint8]:
+    """Returns the lookup table from quantized RGB to palette index.
+
+    The table is built on first use and cached for the rest of the process.
+
+    Args:
+        depth: The number of palette colors, either 16 or 256.
+
+    Returns:
+        A uint8 array of shape (32, 32, 32), indexed by each RGB channel
+        shifted right by 3 bits, holding the nearest palette index.
+    """
+    lo, hi = _PALETTE_RANGES[depth]
+    palette = XTERM_PALETTE[lo:hi].astype(np.int32)
+    step = 1 << (8 - LUT_BITS)
+    centers = np.arange(step // 2, 256, step)
+    bins = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 1, 3)
+
+    lut = np.empty(len(bins), dtype=np.uint8)
+    for i in range(0, len(bins), 4096):
+        dist = np.sum((bins[i:i + 4096] - palette) ** 2, axis=-1)
+        lut[i:i + 4096] = lo + np.argmin(dist, axis=1)
+    return lut.reshape((1 << LUT_BITS,) * 3)
+
+
+def quantize(
+    colors: np.ndarray[np.uint8],
+    depth: int = 256,
+    dither: bool = False,
+) -> np.ndarray[np.uint8]:
+    """Maps an array of RGB colors to palette indices.
+
+    Args:
+        colors: A uint8 array of shape (..., 3). If `dither` is True, the first
+            two axes are taken to be the (row, col) position on the screen.
+        depth: The number of palette colors, either 16 or 256.
+        dither: If True, a 4x4 ordered dither is applied before the lookup, so
+            smooth gradients become patterns of neighboring palette colors
+            rather than flat bands.
+
+    Returns:
+        A uint8 array with the shape of `colors` minus its last axis.
+    """
+    if dither:
+        rows, cols = colors.shape[:2]
+        threshold = np.tile(_BAYER, (-(-rows // 4), -(-cols // 4)))[:rows, :cols]
+        threshold = threshold.reshape(rows, cols, *(1,) * (colors.ndim - 2))
+        colors = np.clip(colors + threshold * _DITHER_STRENGTH[depth], 0, 255).astype(np.uint8)
+    q = colors >> (8 - LUT_BITS)
+    return palette_lut(depth)[q[..., 0], q[..., 1], q[..., 2]]
@@ -2,9 +2,17 @@
 
 It uses a `pygame.Surface` as a canvas, rendering characters and colors
 using a specified system font.
+
+Finding a system font by name makes pygame scan every installed font, which
+can take seconds. Resolved font paths and cell metrics are therefore cached
+per process, and also in a JSON file if `FONT_CACHE_PATH` is set (by default
+from the `DISPLAY_GRID_FONT_CACHE` environment variable), so later runs skip
+the scan entirely.
 """
 import time
 import itertools
+import json
+import os
 import typing
 
 import numpy as np
@@ -16,6 +24,14 @@ BLINK_RATE = 1
 
 DEFAULT_FONT = "hacknerdfontmono"
 
+FONT_CACHE_PATH: typing.Optional[str] = os.environ.get("DISPLAY_GRID_FONT_CACHE")
+
+# Font paths by name, and cell metrics by "path:size". A path of None means
+# the font was not found and pygame's default font is used.
+_font_paths: dict[str, typing.Optional[str]] = {}
+_font_metrics: dict[str, tuple[int, int, int, int]] = {}
+_loaded_cache_path: typing.Optional[str] = None
+
 KEY_ATTRS = {
     getattr(pg, key): "KEY_" + key[2:] for key in dir(pg) if key.startswith("K_")
 }
@@ -26,6 +42,88 @@ KEY_MAP = {
     "KEY_TAB": "\t",
 }
 
+def _load_font_cache() -> None:
+    """Merges the font cache file into the in-memory cache, once per path."""
+    global _loaded_cache_path
+    if FONT_CACHE_PATH is None or FONT_CACHE_PATH == _loaded_cache_path:
+        return
+    _loaded_cache_path = FONT_CACHE_PATH
+    try:
+        with open(FONT_CACHE_PATH) as f:
+            data = json.load(f)
+        _font_paths.update(data["paths"])
+        _font_metrics.update({key: tuple(value) for key, value in data["metrics"].items()})
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+def _save_font_cache() -> None:
+    """Writes the in-memory cache to the font cache file, if one is set."""
+    if FONT_CACHE_PATH is None:
+        return
+    tmp = f"{FONT_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump({"paths": _font_paths, "metrics": _font_metrics}, f)
+        os.replace(tmp, FONT_CACHE_PATH)
+    except OSError:
+        pass
+
+def find_font(name: str) -> typing.Optional[str]:
+    """Finds the file of a system font, scanning system fonts only once.
+
+    Args:
+        name: The name of the system font, as given to `pg.font.SysFont`.
+
+    Returns:
+        The path of the font file, or None if no font of that name is
+        installed.
+    """
+    _load_font_cache()
+    path = _font_paths.get(name, "")
+    if path == "" or (path is not None and not os.path.exists(path)):
+        path = pg.font.match_font(name)
+        _font_paths[name] = path
+        _save_font_cache()
+    return path
+
+def load_font(name: str, size: int) -> pg.font.Font:
+    """Loads a system font without scanning system fonts again.
+
+    This is equivalent to `pg.font.SysFont(name, size)`.
+
+    Args:
+        name: The name of the system font.
+        size: The point size of the font.
+
+    Returns:
+        The loaded font, or pygame's default font if it is not installed.
+    """
+    return pg.font.Font(find_font(name), size)
+
+def font_metrics(name: str, size: int) -> tuple[int, int, int, int]:
+    """Returns the cell bounding box of a system font, loading it only once.
+
+    Args:
+        name: The name of the system font.
+        size: The point size of the font.
+
+    Returns:
+        A (min_x, min_y, max_x, max_y) tuple, as from
+        `PygameGrid.get_char_shape`.
+    """
+    key = f"{find_font(name)}:{size}"
+    if key not in _font_metrics:
+        _font_metrics[key] = _char_shape(load_font(name, size))
+        _save_font_cache()
+    return _font_metrics[key]
+
+def _char_shape(font: pg.font.Font) -> tuple[int, int, int, int]:
+    """Measures the pixel bounding box of a character cell in a font."""
+    min_x, _, min_y, _, advance = font.metrics("█")[0]
+    min_y -= font.get_descent() - 1
+    return min_x, min_y, min_x + advance, min_y + font.get_linesize()
+
+
 class PygameGrid(dg.Grid):
     """A Grid that displays its contents in a `pygame.Surface`.
     
@@ -58,7 +156,7 @@ class PygameGrid(dg.Grid):
         """
         self.surf = surf
 
-        self.font = pg.font.SysFont(font, font_size)
+        self.font = load_font(font, font_size)
 
         if shape is None:
             shape = self.get_real_shape()
@@ -79,7 +177,8 @@ class PygameGrid(dg.Grid):
         """Determines the pixel bounding box of a character in a given font.
         
         Args:
-            font: A `pygame.Font` object. If None, a new font is created.
+            font: A `pygame.Font` object. If None, the cached metrics of the
+                named font are used, and the font is only loaded on a miss.
             font_name: The font name to use if `font` is None.
             font_size: The font size to use if `font` is None.
 
@@ -87,13 +186,9 @@ class PygameGrid(dg.Grid):
             A (min_x, min_y, max_x, max_y) tuple for the character's
             pixel bounding box.
         """
-
         if font is None:
-            font = pg.font.SysFont(name=font_name, size=font_size)
-
-        min_x, _, min_y, _, advance = font.metrics("█")[0]
-        min_y -= font.get_descent() - 1
-        return min_x, min_y, min_x + advance, min_y + font.get_linesize()
+            return font_metrics(font_name, font_size)
+        return _char_shape(font)
 
     @classmethod
     def get_surf_shape(
@@ -127,6 +222,15 @@ class PygameGrid(dg.Grid):
         font_w, font_h = max_x - min_x, max_y - min_y
         return surf_h // font_h, surf_w // font_w
 
+    def resize(self, shape: tuple[int, int]) -> None:
+        """Reallocates the grid for a new shape and blanks the surface.
+
+        Args:
+            shape: The new (rows, cols) shape.
+        """
+        self.surf.fill((0, 0, 0))
+        super().resize(shape)
+
     def draw(self) -> None:
         """Renders changed portions of the grid to the Pygame surface."""
         
@@ -146,7 +250,7 @@ class PygameGrid(dg.Grid):
                 text = "".join(chr(item[0]) for item in group)
                 self.font.set_bold(dg.TA_BOLD & attr)
                 self.font.set_italic(dg.TA_ITALIC & attr)
-                self.font.set_underline(dg.TA_UNDERLINE & attr)
+                self.font.set_underline((dg.TA_UNDERLINE | dg.TA_UNDERCURL) & attr)
                 self.font.set_strikethrough(dg.TA_STRIKETHROUGH & attr)
 
                 if do_blink and (dg.TA_BLINK & attr):
@@ -187,6 +291,8 @@ class PygameGrid(dg.Grid):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 quit()
+            elif event.type == pg.VIDEORESIZE:
+                out.append(dg.ResizeEvent(self.get_real_shape()))
             elif event.type == pg.KEYDOWN:
                 if event.unicode and event.unicode.isprintable():
                     key = event.unicode
@@ -0,0 +1,150 @@
+"""This module moves frame output into a separate render process.
+
+Encoding a large grid for the terminal or drawing it with pygame can take
+longer than a frame. A `RemoteGrid` is drawn to by modules in the main process
+as usual, but its `draw` only copies the finished frame into a `SharedGrid`.
+A render process owning the real display picks up each new frame, encodes and
+writes it, and forwards input events back through a queue, so application
+logic and output run on separate cores.
+"""
+import multiprocessing
+import queue
+import sys
+import typing
+
+import numpy as np
+
+import display_grid as dg
+
+def _render_loop(
+    name: str,
+    mode: str,
+    frame_ready: "multiprocessing.synchronize.Event",
+    stopping: "multiprocessing.synchronize.Event",
+    events: "multiprocessing.Queue",
+    real_shape: typing.Any,
+    poll_interval: float,
+) -> None:
+    """Runs the display backend in the render process until told to stop.
+
+    Args:
+        name: The name of the SharedGrid that frames are read from.
+        mode: The backend to use, either "terminal" or "pygame".
+        frame_ready: Set by the main process whenever a frame is presented.
+        stopping: Set by the main process to shut the render process down.
+        events: The queue input events are sent back through.
+        real_shape: A shared array of two ints for the display's real shape.
+        poll_interval: The longest time to wait for a frame before polling
+            for input again, in seconds.
+    """
+    shared = dg.shared.SharedGrid.attach(name)
+    if mode == "terminal":
+        import urwid
+        # multiprocessing points stdin at /dev/null, so read the terminal.
+        # stdout may be redirected by MainModule, so write to the real one.
+        tty = open("/dev/tty")
+        scr = urwid.display.raw.Screen(input=tty, output=sys.__stdout__)
+        scr.start()
+        scr.set_input_timeouts(max_wait=0)
+        grid = dg.TermGrid(scr, shared.shape)
+    else:
+        import pygame as pg
+        pg.init()
+        grid = dg.PygameGrid(pg.display.set_mode(dg.PygameGrid.get_surf_shape(shared.shape)))
+
+    try:
+        while not stopping.is_set():
+            if frame_ready.wait(poll_interval):
+                frame_ready.clear()
+                if shared.read_into(grid):
+                    grid.draw()
+            for event in grid.events():
+                events.put(event)
+            real_shape[:] = grid.get_real_shape()
+    finally:
+        if mode == "terminal":
+            scr.stop()
+            tty.close()
+        else:
+            pg.quit()
+        shared.close()
+
+
+class RemoteGrid(dg.Grid):
+    """A Grid whose frames are displayed by a separate render process.
+
+    Attributes:
+        shared (dg.shared.SharedGrid): The shared grid frames are presented to.
+        process (multiprocessing.Process): The render process.
+    """
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        mode: typing.Literal["terminal", "pygame"] = "terminal",
+        poll_interval: float = 1 / 120,
+    ) -> None:
+        """Constructs a RemoteGrid and starts its render process.
+
+        Args:
+            shape: The (rows, cols) shape of the grid.
+            mode: The backend the render process uses, either "terminal" or
+                "pygame".
+            poll_interval: The longest time the render process waits for a
+                frame before polling for input again, in seconds.
+        """
+        super().__init__(
+            np.empty((*shape, 2, 3), dtype=np.uint8),
+            np.empty(shape, dtype=np.int32),
+            np.empty(shape, dtype=np.uint8),
+        )
+        self.shared = dg.shared.SharedGrid.create(shape)
+        self._frame_ready = multiprocessing.Event()
+        self._stopping = multiprocessing.Event()
+        self._events = multiprocessing.Queue()
+        self._real_shape = multiprocessing.Array("i", shape)
+        self.process = multiprocessing.Process(
+            target=_render_loop,
+            args=(self.shared.name, mode, self._frame_ready, self._stopping, self._events, self._real_shape, poll_interval),
+            daemon=True,
+        )
+        self.process.start()
+
+    def draw(self) -> None:
+        """Presents the grid's contents to the render process.
+
+        The contents are copied into shared memory, which is much cheaper
+        than encoding them, and the render process is woken up.
+        """
+        with self.shared.writing():
+            self.shared.chars[...] = self.chars
+            self.shared.colors[...] = self.colors
+            self.shared.attrs[...] = self.attrs
+        self._frame_ready.set()
+
+    def get_real_shape(self) -> tuple[int, int]:
+        """Returns the display's shape, as last reported by the render process."""
+        return tuple(self._real_shape[:])
+
+    def events(self) -> list[dg.Event]:
+        """Returns the input events forwarded by the render process.
+
+        If the render process has exited, for example because its pygame
+        window was closed, the application quits as well.
+        """
+        if not self.process.is_alive():
+            quit()
+        out = []
+        while True:
+            try:
+                out.append(self._events.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self) -> None:
+        """Stops the render process and releases the shared memory."""
+        self._stopping.set()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.shared.close()
+        self.shared.unlink()
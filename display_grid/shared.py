@@ -0,0 +1,189 @@
+"""This module provides Grids backed by memory shared between processes.
+
+A SharedGrid keeps its header and data arrays in one flat buffer, either a
+`multiprocessing.shared_memory` block or an `mmap`, so producer processes can
+write characters and colors straight into the grid the renderer draws. SubGrid
+views of a SharedGrid work as usual within each process.
+
+Writes are made consistent with a seqlock: a writer makes its slot's sequence
+number odd before writing and even again afterwards, and a reader copies the
+grid and retries if any sequence number was odd or changed while it copied.
+Each concurrent writer must use its own slot.
+
+The buffer layout is:
+
+    rows, cols, slots (uint32), padding (uint32)
+    one sequence number per slot (uint64), padded to a multiple of 64 bytes
+    chars (int32, rows x cols)
+    colors (uint8, rows x cols x 2 x 3)
+    attrs (uint8, rows x cols)
+"""
+import contextlib
+import typing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import display_grid as dg
+
+_ALIGN = 64
+
+def _layout(shape: tuple[int, int], slots: int) -> tuple[int, int, int, int]:
+    """Returns the offsets of chars, colors and attrs, and the total size."""
+    cells = shape[0] * shape[1]
+    chars = -(-(16 + 8 * slots) // _ALIGN) * _ALIGN
+    colors = chars + 4 * cells
+    attrs = colors + 6 * cells
+    return chars, colors, attrs, attrs + cells
+
+
+class SharedGrid(dg.Grid):
+    """A Grid whose data lives in a buffer that other processes can map.
+
+    Attributes:
+        seqs (np.ndarray): The uint64 sequence number of every writer slot.
+            A slot's number is odd while a write through it is in progress.
+    """
+    def __init__(
+        self,
+        buffer: typing.Any,
+        shape: typing.Optional[tuple[int, int]] = None,
+        slots: int = 1,
+    ) -> None:
+        """Constructs a SharedGrid over a writable buffer.
+
+        Args:
+            buffer: A writable buffer, such as an `mmap` or the `buf` of a
+                `SharedMemory`, of at least `SharedGrid.nbytes(shape, slots)`
+                bytes.
+            shape: The (rows, cols) shape of a new grid, which is written to
+                the buffer's header, and the grid is cleared. If None, the
+                shape is read from the header of an existing grid and its
+                contents are kept.
+            slots: The number of writers that may write at the same time.
+                Ignored when attaching to an existing grid.
+        """
+        header = np.ndarray(4, np.uint32, buffer)
+        attaching = shape is None
+        if attaching:
+            shape, slots = (int(header[0]), int(header[1])), int(header[2])
+        else:
+            header[:3] = *shape, slots
+
+        chars, colors, attrs, _ = _layout(shape, slots)
+        self.seqs = np.ndarray(slots, np.uint64, buffer, 16)
+        if not attaching:
+            self.seqs[:] = 0
+        self._shm: typing.Optional[shared_memory.SharedMemory] = None
+        super().__init__(
+            np.ndarray((*shape, 2, 3), np.uint8, buffer, colors),
+            np.ndarray(shape, np.int32, buffer, chars),
+            np.ndarray(shape, np.uint8, buffer, attrs),
+            clear=not attaching,
+        )
+
+    @staticmethod
+    def nbytes(shape: tuple[int, int], slots: int = 1) -> int:
+        """Returns the buffer size needed for a grid, e.g. to size an mmap."""
+        return _layout(shape, slots)[3]
+
+    @classmethod
+    def create(
+        cls,
+        shape: tuple[int, int],
+        slots: int = 1,
+        name: typing.Optional[str] = None,
+    ) -> "SharedGrid":
+        """Creates a new SharedGrid in a new shared memory block.
+
+        Args:
+            shape: The (rows, cols) shape of the grid.
+            slots: The number of writers that may write at the same time.
+            name: The name of the block. If None, a unique name is chosen.
+
+        Returns:
+            The new SharedGrid. Call `unlink` once no process needs it.
+        """
+        shm = shared_memory.SharedMemory(name, create=True, size=cls.nbytes(shape, slots))
+        grid = cls(shm.buf, shape, slots)
+        grid._shm = shm
+        return grid
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedGrid":
+        """Attaches to a SharedGrid created by another process.
+
+        Args:
+            name: The name of the grid's shared memory block.
+
+        Returns:
+            A SharedGrid over the same memory.
+        """
+        shm = shared_memory.SharedMemory(name)
+        grid = cls(shm.buf)
+        grid._shm = shm
+        return grid
+
+    @property
+    def name(self) -> typing.Optional[str]:
+        """The name of the shared memory block, or None if not using one."""
+        return self._shm.name if self._shm is not None else None
+
+    @property
+    def version(self) -> int:
+        """A number that changes whenever a write finishes."""
+        return int(self.seqs.sum())
+
+    @contextlib.contextmanager
+    def writing(self, slot: int = 0) -> typing.Iterator["SharedGrid"]:
+        """Marks a write to the grid, so readers never copy it half done.
+
+        Args:
+            slot: The writer slot to use. Writers that may overlap in time
+                must use different slots.
+
+        Yields:
+            The grid itself.
+        """
+        self.seqs[slot] += 1
+        try:
+            yield self
+        finally:
+            self.seqs[slot] += 1
+
+    def read_into(self, grid: dg.Grid, retries: int = 1000) -> bool:
+        """Copies a consistent snapshot of the grid into another grid.
+
+        Args:
+            grid: A grid of the same shape to copy into.
+            retries: The number of times to retry while writes are in
+                progress before giving up.
+
+        Returns:
+            True if a consistent snapshot was copied. If False, `grid` may
+            hold a partial write and should not be presented.
+        """
+        for _ in range(retries + 1):
+            before = self.seqs.copy()
+            if np.any(before & 1):
+                continue
+            grid.chars[...] = self.chars
+            grid.colors[...] = self.colors
+            grid.attrs[...] = self.attrs
+            if np.array_equal(before, self.seqs):
+                return True
+        return False
+
+    def close(self) -> None:
+        """Releases this process's mapping of the shared memory block.
+
+        The grid, and any SubGrids of it, must not be used afterwards.
+        """
+        self.colors = self.chars = self.attrs = self.fg = self.bg = self.seqs = None
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroys the shared memory block once every process has closed it."""
+        if self._shm is not None:
+            self._shm.unlink()
@@ -0,0 +1,303 @@
+"""This module streams Grid frames to another process as compact deltas.
+
+Each frame is encoded as a message holding only the runs of cells that changed
+since the previous frame. Cell styles are sent once as entries in a style
+table and then referred to by id, and messages can be zlib compressed. Every
+so often a keyframe holding the whole grid is sent instead, which resets the
+style table, so a viewer can join a stream or recover from a dropped message.
+
+A message is a header followed by a payload:
+
+    header:  magic b"DG", flags (uint8), rows, cols (uint16), payload length (uint32)
+    payload: new style count, run count (uint32)
+             new styles, 7 bytes each: fg RGB, bg RGB, attrs
+             runs, 3 uint16 each: row, col, length
+             the characters of every run (uint32)
+             the style ids of every run (uint16, or uint32 if FLAG_WIDE_IDS)
+
+All values are little-endian, and the payload is compressed as a whole if
+FLAG_ZLIB is set.
+"""
+import struct
+import typing
+import zlib
+
+import numpy as np
+
+import display_grid as dg
+
+MAGIC = b"DG"
+FLAG_KEYFRAME = 1
+FLAG_ZLIB = 2
+FLAG_WIDE_IDS = 4
+
+_HEADER = struct.Struct("<2sBHHI")
+_COUNTS = struct.Struct("<II")
+
+
+def _style_keys(grid: dg.Grid) -> np.ndarray[np.int64]:
+    """Packs the colors and attributes of every cell into an integer key."""
+    fg = grid.fg.astype(np.int64)
+    bg = grid.bg.astype(np.int64)
+    return (
+        (fg[..., 0] << 48) | (fg[..., 1] << 40) | (fg[..., 2] << 32)
+        | (bg[..., 0] << 24) | (bg[..., 1] << 16) | (bg[..., 2] << 8)
+        | grid.attrs.astype(np.int64)
+    )
+
+
+class FrameEncoder:
+    """Encodes the frames of a Grid into delta messages.
+
+    Attributes:
+        keyframe_interval (int): The number of frames between keyframes.
+        compress (bool): Whether payloads are zlib compressed.
+        level (int): The zlib compression level.
+    """
+    def __init__(
+        self,
+        keyframe_interval: int = 60,
+        compress: bool = False,
+        level: int = 1,
+    ) -> None:
+        """Constructs a FrameEncoder.
+
+        Args:
+            keyframe_interval: The number of frames between keyframes.
+            compress: If True, payloads are zlib compressed.
+            level: The zlib compression level, from 1 (fastest) to 9.
+        """
+        self.keyframe_interval = keyframe_interval
+        self.compress = compress
+        self.level = level
+        self._ids: dict[int, int] = {}
+        self._prev_chars: typing.Optional[np.ndarray[np.uint32]] = None
+        self._prev_keys: typing.Optional[np.ndarray[np.int64]] = None
+        self._since_keyframe = 0
+
+    def request_keyframe(self) -> None:
+        """Makes the next encoded frame a keyframe."""
+        self._prev_chars = None
+
+    def encode(self, grid: dg.Grid) -> bytes:
+        """Encodes the cells of a grid that changed since the last frame.
+
+        Args:
+            grid: The grid to encode. It must have the same shape as the
+                previous one, or a keyframe is sent.
+
+        Returns:
+            The encoded message.
+        """
+        chars = grid.chars.astype(np.uint32)
+        keys = _style_keys(grid)
+        keyframe = (
+            self._prev_chars is None
+            or self._prev_chars.shape != chars.shape
+            or self._since_keyframe >= self.keyframe_interval
+            or len(self._ids) > 0xFFFF
+        )
+        if keyframe:
+            self._ids.clear()
+            self._since_keyframe = 0
+            changed = np.ones(chars.shape, dtype=bool)
+        else:
+            changed = (chars != self._prev_chars) | (keys != self._prev_keys)
+        self._since_keyframe += 1
+        self._prev_chars, self._prev_keys = chars, keys
+
+        # Map each changed cell's style to an id, adding new styles to the
+        # table. Only distinct styles are looked up one by one.
+        unique, inverse = np.unique(keys[changed], return_inverse=True)
+        new = [key for key in unique.tolist() if key not in self._ids]
+        for key in new:
+            self._ids[key] = len(self._ids)
+        ids = np.array([self._ids[key] for key in unique.tolist()], dtype=np.uint32)[inverse]
+        new = np.array(new, dtype=np.int64)
+        styles = (new[:, None] >> np.arange(48, -8, -8)) & 255
+
+        # Runs never cross rows, as each row is padded with an unchanged cell.
+        rows, cols = chars.shape
+        padded = np.zeros((rows, cols + 1), dtype=np.int8)
+        padded[:, :cols] = changed
+        edges = np.diff(padded.ravel(), prepend=0)
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        runs = np.stack([starts // (cols + 1), starts % (cols + 1), ends - starts], axis=1)
+
+        wide = len(self._ids) > 0x10000
+        payload = b"".join([
+            _COUNTS.pack(len(styles), len(runs)),
+            styles.astype(np.uint8).tobytes(),
+            runs.astype("<u2").tobytes(),
+            chars[changed].astype("<u4").tobytes(),
+            ids.astype("<u4" if wide else "<u2").tobytes(),
+        ])
+        flags = (FLAG_KEYFRAME if keyframe else 0) | (FLAG_WIDE_IDS if wide else 0)
+        if self.compress:
+            payload = zlib.compress(payload, self.level)
+            flags |= FLAG_ZLIB
+        return _HEADER.pack(MAGIC, flags, rows, cols, len(payload)) + payload
+
+
+class FrameDecoder:
+    """Applies delta messages from a FrameEncoder to a Grid.
+
+    Deltas can only be applied after the keyframe they follow, so messages
+    before the first keyframe are ignored.
+    """
+    def __init__(self) -> None:
+        """Constructs a FrameDecoder waiting for a keyframe."""
+        self._styles: typing.Optional[np.ndarray[np.uint8]] = None
+
+    def decode(self, message: bytes, grid: dg.Grid) -> bool:
+        """Applies one message to a grid.
+
+        Cells outside of the grid are skipped, so the grid does not need to
+        have the sender's shape.
+
+        Args:
+            message: The message, including its header.
+            grid: The grid to write the changed cells into.
+
+        Returns:
+            False if the message was ignored because no keyframe has been
+            received yet, otherwise True.
+
+        Raises:
+            ValueError: If the message is not a frame message.
+        """
+        magic, flags, _, _, length = _HEADER.unpack_from(message)
+        if magic != MAGIC:
+            raise ValueError("Not a display_grid frame message.")
+        payload = memoryview(message)[_HEADER.size:_HEADER.size + length]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+
+        if flags & FLAG_KEYFRAME:
+            self._styles = np.empty((0, 7), dtype=np.uint8)
+        elif self._styles is None:
+            return False
+
+        n_styles, n_runs = _COUNTS.unpack_from(payload)
+        offset = _COUNTS.size
+        styles = np.frombuffer(payload, np.uint8, n_styles * 7, offset).reshape(-1, 7)
+        self._styles = np.concatenate([self._styles, styles])
+        offset += styles.nbytes
+        runs = np.frombuffer(payload, "<u2", n_runs * 3, offset).reshape(-1, 3).astype(np.intp)
+        offset += runs.size * 2
+        lengths = runs[:, 2]
+        total = int(lengths.sum())
+        chars = np.frombuffer(payload, "<u4", total, offset)
+        offset += chars.nbytes
+        ids = np.frombuffer(payload, "<u4" if flags & FLAG_WIDE_IDS else "<u2", total, offset)
+
+        # Expand the runs into the position of every cell.
+        run_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        i = np.repeat(runs[:, 0], lengths)
+        j = np.repeat(runs[:, 1], lengths) + np.arange(total) - run_starts
+        inside = (i < grid.shape[0]) & (j < grid.shape[1])
+        i, j = i[inside], j[inside]
+        style = self._styles[ids[inside]]
+
+        grid.chars[i, j] = chars[inside]
+        grid.fg[i, j] = style[:, 0:3]
+        grid.bg[i, j] = style[:, 3:6]
+        grid.attrs[i, j] = style[:, 6]
+        return True
+
+    def receive(self, file: typing.BinaryIO, grid: dg.Grid) -> bool:
+        """Reads one message from a file, applies it to a grid and draws it.
+
+        Args:
+            file: A binary file, such as a pipe or `socket.makefile("rb")`.
+            grid: The grid to update and draw.
+
+        Returns:
+            False if the stream has ended, otherwise True.
+        """
+        message = read_message(file)
+        if message is None:
+            return False
+        if self.decode(message, grid):
+            grid.draw()
+        return True
+
+
+def read_message(file: typing.BinaryIO) -> typing.Optional[bytes]:
+    """Reads one message from a binary file.
+
+    Args:
+        file: A binary file, such as a pipe or `socket.makefile("rb")`.
+
+    Returns:
+        The message including its header, or None if the stream has ended.
+    """
+    header = _read_exact(file, _HEADER.size)
+    if header is None:
+        return None
+    payload = _read_exact(file, _HEADER.unpack(header)[4])
+    if payload is None:
+        return None
+    return header + payload
+
+
+def _read_exact(file: typing.BinaryIO, size: int) -> typing.Optional[bytes]:
+    """Reads exactly `size` bytes, or returns None at the end of the stream."""
+    data = b""
+    while len(data) < size:
+        chunk = file.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+class FrameStreamer:
+    """Sends every frame drawn by a Grid to a binary file.
+
+    Once attached, the grid's `draw` method first encodes and sends the frame,
+    then draws it as usual. This mirrors a running application to a viewer
+    without changes to its modules.
+
+    Attributes:
+        grid (dg.Grid): The grid whose frames are sent.
+        file (typing.BinaryIO): The file messages are written to.
+        encoder (FrameEncoder): The encoder used for each frame.
+    """
+    def __init__(
+        self,
+        grid: dg.Grid,
+        file: typing.BinaryIO,
+        encoder: typing.Optional[FrameEncoder] = None,
+    ) -> None:
+        """Constructs a FrameStreamer and attaches it to the grid.
+
+        Args:
+            grid: The grid whose frames are sent.
+            file: A binary file, such as a pipe or `socket.makefile("wb")`.
+            encoder: The encoder to use. If None, a FrameEncoder with default
+                settings is used.
+        """
+        self.grid = grid
+        self.file = file
+        self.encoder = encoder or FrameEncoder()
+        self.attach()
+
+    def attach(self) -> None:
+        """Starts sending the grid's frames whenever it is drawn."""
+        draw = type(self.grid).draw.__get__(self.grid)
+
+        def streaming_draw() -> None:
+            self.send()
+            draw()
+
+        self.grid.draw = streaming_draw
+
+    def detach(self) -> None:
+        """Stops sending the grid's frames."""
+        self.grid.__dict__.pop("draw", None)
+
+    def send(self) -> None:
+        """Encodes the grid's current contents and writes the message."""
+        self.file.write(self.encoder.encode(self.grid))
+        self.file.flush()
@@ -1,8 +1,11 @@
 """This module provides a Grid implementation for terminal-based applications.
 
-It uses the `urwid` library as a backend to handle terminal control codes,
-mouse tracking, and color rendering.
+It uses the `urwid` library as a backend to set up the terminal and handle
+mouse tracking and input. Frames are written as ANSI escape sequences built
+by the SGR encoder chosen for the terminal's `dg.ansi.TermProfile`.
 """
+import functools
+import sys
 import typing
 import unicodedata
 
@@ -25,54 +28,58 @@ KEY_MAP = {
     "tab": "\t",
 }
 
-def _color_to_hex(r: int, g: int, b: int) -> str:
-    """Formats RGB values as a hexadecimal code of the form #RRGGBB.
-    
-    Args:
-        r: Red color value from 0 to 255.
-        g: Green color value from 0 to 255.
-        b: Blue color value from 0 to 255.
+@functools.cache
+def _is_zero_width(code: int) -> bool:
+    """Returns True if the character `code` does not move the cursor."""
+    return unicodedata.combining(chr(code)) != 0 or unicodedata.category(chr(code)) in ("Mn", "Me", "Cf")
 
-    Returns:
-        A string of the form #RRGGBB.
+def _printable(chars: np.ndarray[np.int32]) -> np.ndarray[np.int32]:
+    """Replaces characters that cannot be written to a terminal.
+
+    Control characters, including C1 controls, and zero-width characters such
+    as combining marks become spaces, so that every written cell moves the
+    cursor by its width. Values that are not valid Unicode scalar values
+    become U+FFFD.
     """
-    return f"#{r:02x}{g:02x}{b:02x}"
+    invalid = (chars < 0) | (chars > 0x10FFFF) | ((chars >= 0xD800) & (chars < 0xE000))
+    blank = (chars < 32) | ((chars >= 0x7F) & (chars <= 0x9F))
+    candidates = (chars >= 0xA0) & ~invalid
+    if candidates.any():
+        zero_width = [code for code in np.unique(chars[candidates]).tolist() if _is_zero_width(code)]
+        if zero_width:
+            blank |= np.isin(chars, zero_width)
+    return np.where(blank, 32, np.where(invalid, 0xFFFD, chars))
+
+def _utf8_length(chars: np.ndarray[np.int32]) -> np.ndarray[np.int64]:
+    """Returns the number of bytes each character takes in UTF-8."""
+    return 1 + (chars >= 0x80).astype(np.int64) + (chars >= 0x800) + (chars >= 0x10000)
+
+def _visible_cells(chars: np.ndarray[np.int32]) -> np.ndarray[np.bool_]:
+    """Finds the cells of a grid that are actually written to the terminal.
+
+    The cell to the right of a wide character is covered by it, so it is
+    skipped. Only characters that can be wide are looked up one by one.
 
-_TEXT_ATTR_LOOKUP = {}
-def _get_text_attr(fg: tuple[int, int, int], bg: tuple[int, int, int], attrs: int) -> urwid.AttrSpec:
-    """Converts color and attribute data into a cached `urwid.AttrSpec` object.
-    
     Args:
-        fg: An (r, g, b) tuple for the foreground color.
-        bg: An (r, g, b) tuple for the background color.
-        attrs: A bitmask of text attributes (e.g., dg.TA_BOLD).
+        chars: The character ordinals of the grid, of shape (rows, cols).
 
     Returns:
-        An `urwid.AttrSpec` object for rendering.
+        A boolean array of shape (rows, cols).
     """
-    key = *fg, *bg, attrs
-    if key not in _TEXT_ATTR_LOOKUP:
-        fg_str = _color_to_hex(*fg)
-        if attrs & dg.TA_BOLD:
-            fg_str += ",bold"
-        # if attrs & dg.TA_FAINT:
-        #     fg_str += ",faint"
-        if attrs & dg.TA_ITALIC:
-            fg_str += ",italics"
-        if attrs & dg.TA_UNDERLINE:
-            fg_str += ",underline"
-        if attrs & dg.TA_BLINK:
-            fg_str += ",blink"
-        if attrs & dg.TA_INVERT:
-            fg_str += ",standout"
-        if attrs & dg.TA_STRIKETHROUGH:
-            fg_str += ",strikethrough"
-        _TEXT_ATTR_LOOKUP[key] = urwid.AttrSpec(
-            fg_str,
-            _color_to_hex(*bg),
-            2**24 if dg.SUPPORTS_TRUECOLOR else 256
-        )
-    return _TEXT_ATTR_LOOKUP[key]
+    visible = np.ones(chars.shape, dtype=bool)
+    candidates = chars >= 0x1100
+    if not candidates.any():
+        return visible
+    wide_codes = [code for code in np.unique(chars[candidates]).tolist() if dg.text.is_wide(code)]
+    wide = np.isin(chars, wide_codes)
+    for i in np.flatnonzero(wide[:, :-1].any(axis=1)):
+        j = 0
+        while j < chars.shape[1] - 1:
+            if wide[i, j]:
+                visible[i, j + 1] = False
+                j += 1
+            j += 1
+    return visible
 
 def _split_mod_event(event: str) -> tuple[int, str]:
     """Splits modifier prefixes from an urwid key event string.
@@ -103,11 +110,18 @@ class TermGrid(dg.Grid):
     
     Attributes:
         scr (urwid.display.raw.Screen): The urwid screen object for output.
+        profile (dg.ansi.TermProfile): The capabilities of the terminal.
+        dither (bool): Whether colors are dithered when mapped to a palette.
+        frame_bytes (int): The number of bytes written by the last draw.
+        total_bytes (int): The number of bytes written by all draws.
     """
     def __init__(
         self,
         scr: urwid.display.raw.Screen,
         shape: typing.Optional[tuple[int, int]] = None,
+        profile: typing.Optional[dg.ansi.TermProfile] = None,
+        dither: bool = False,
+        fd: typing.Optional[int] = None,
     ) -> None:
         """Constructs a TermGrid.
         
@@ -115,11 +129,29 @@ class TermGrid(dg.Grid):
             scr: An `urwid.display.raw.Screen` to draw on.
             shape: A (rows, cols) tuple for the grid's shape. If None, it
                 defaults to the screen size.
+            profile: The capabilities of the terminal. If None, they are
+                detected from the environment with `dg.ansi.detect_profile`.
+            dither: If True, colors are ordered-dithered when mapped to a
+                256 or 16 color palette.
+            fd: The file descriptor frames are written to, which should be
+                the screen's output. If None, the standard output of the
+                process is used.
         """
         
         self.scr = scr
+        self.profile = profile or dg.ansi.detect_profile()
+        self.dither = dither
+        self.frame_bytes = 0
+        self.total_bytes = 0
+        self._encoder = dg.ansi.make_encoder(self.profile)
+        self._fd = sys.__stdout__.fileno() if fd is None else fd
+        self._frame = dg.ansi.FrameBuffer()
+        sync = self.profile.sync_update
+        self._frame_start = (dg.ansi.BEGIN_SYNC if sync else b"") + dg.ansi.HIDE_CURSOR
+        self._frame_end = dg.ansi.RESET + (dg.ansi.END_SYNC if sync else b"")
         scr.set_mouse_tracking(True)
         scr.clear()
+        self._real_shape = tuple(scr.get_cols_rows()[::-1])
         
         if shape is None:
             shape = self.get_real_shape()
@@ -128,26 +160,188 @@ class TermGrid(dg.Grid):
         chars = np.empty(shape, dtype=np.int32)
         attrs = np.empty(shape, dtype=np.uint8)
 
+        # What the terminal is currently showing, used to only send changes.
+        self._prev_chars = np.empty(shape, dtype=np.int32)
+        self._prev_keys = np.empty(shape, dtype=np.int64)
+        self._prev_wide = False
+        self._scrolls: list[tuple[int, int, int]] = []
+        self._erase = False
+        self.invalidate()
+
         super().__init__(colors, chars, attrs)    
 
+    @property
+    def depth(self) -> int:
+        """The number of colors used for output: 2**24, 256 or 16."""
+        return self.profile.depth
+
+    def invalidate(self) -> None:
+        """Forces the next draw to repaint every cell."""
+        self._prev_chars[...] = -1
+        self._scrolls.clear()
+
+    def resize(self, shape: tuple[int, int]) -> None:
+        """Reallocates the grid for a new shape and repaints it on the next draw.
+
+        Args:
+            shape: The new (rows, cols) shape.
+        """
+        self._prev_chars = np.empty(shape, dtype=np.int32)
+        self._prev_keys = np.empty(shape, dtype=np.int64)
+        self.invalidate()
+        self._erase = True
+        super().resize(shape)
+
+    def _scrolled(self, n: int, region: tuple[int, int, int, int]) -> None:
+        """Queues a terminal scroll for regions spanning the full width.
+
+        The record of what the terminal shows is shifted to match, so after
+        the terminal scrolls only the uncovered rows differ and are sent.
+        """
+        i1, j1, i2, j2 = region
+        if j1 != 0 or j2 != self.shape[1]:
+            return
+        self._scrolls.append((n, i1, i2))
+        for prev in (self._prev_chars, self._prev_keys):
+            if n > 0:
+                prev[i1:i2 - n] = prev[i1 + n:i2]
+                prev[i2 - n:i2] = -1
+            else:
+                prev[i1 - n:i2] = prev[i1:i2 + n]
+                prev[i1:i1 - n] = -1
+
     def draw(self) -> None:
-        """Renders the grid's contents to the terminal screen."""
-        markup = []
-        for chars, fg, bg, attrs in zip(self.chars, self.fg, self.bg, self.attrs):
-            i = 0
-            while i < len(chars):
-                markup.append((_get_text_attr(fg[i], bg[i], attrs[i]), chr(chars[i])))
-                i += 2 if unicodedata.east_asian_width(chr(chars[i])) in "WF" else 1
-            markup.append("\n")
-        self.scr.draw_screen(self.shape[::-1], urwid.Text(markup[:-1], wrap="clip").render(self.shape[1:]) )
+        """Renders the cells that changed since the last draw to the terminal.
+
+        Cell styles are packed into integer keys for the whole grid at once,
+        and compared with what the terminal is showing to find the changed
+        cells. Queued scrolls are sent as scroll-region sequences first. The
+        frame is assembled in a reused buffer and sent with a single write,
+        wrapped in a synchronized update if the terminal supports it.
+        """
+        keys = self._encoder.keys(self.fg, self.bg, self.attrs, self.dither)
+        chars = _printable(self.chars)
+        visible = _visible_cells(chars) if self.profile.wide_chars else None
+
+        dirty = (chars != self._prev_chars) | (keys != self._prev_keys)
+        has_wide = visible is not None and not visible.all()
+        if has_wide or self._prev_wide:
+            # Writing over either half of a wide character erases all of it.
+            dirty[:, 1:] |= dirty[:, :-1]
+        self._prev_wide = has_wide
+        self._prev_chars[...] = chars
+        self._prev_keys[...] = keys
+
+        rows = np.flatnonzero(dirty.any(axis=1))
+        if not len(rows) and not self._scrolls and not self._erase:
+            self.frame_bytes = 0
+            return
+
+        frame = self._frame
+        frame.write(self._frame_start)
+        if self._erase:
+            # Cells outside of the grid may hold leftovers from before a resize.
+            frame.write(dg.ansi.ERASE_SCREEN)
+            self._erase = False
+        if self._scrolls:
+            frame.write(dg.ansi.RESET)
+            for n, top, bottom in self._scrolls:
+                frame.write(dg.ansi.set_scroll_region(top, bottom))
+                frame.write(dg.ansi.scroll(n))
+            frame.write(dg.ansi.RESET_SCROLL_REGION)
+            self._scrolls.clear()
+
+        # The cursor position and style are tracked between runs, so each
+        # run can be reached and styled with the fewest bytes. Neither is
+        # known after a scroll, or after writing the last column.
+        cursor, key = None, None
+        cols = self.shape[1]
+        motion, encode = dg.ansi.cursor_motion, self._encode_cells
+        for i in rows.tolist():
+            edges = np.flatnonzero(np.diff(dirty[i], prepend=False, append=False)).tolist()
+            for lo, hi in zip(edges[::2], edges[1::2]):
+                if visible is not None:
+                    if lo > 0 and not visible[i, lo]:
+                        lo -= 1
+                    while hi < cols and not visible[i, hi]:
+                        hi += 1
+                if cursor is not None and cursor[0] == i:
+                    lo = max(lo, cursor[1])
+                    if lo >= hi:
+                        continue
+
+                move = motion(i, lo, cursor)
+                # Rewriting unchanged cells moves the cursor too, and can be
+                # shorter than an escape sequence for small gaps.
+                if cursor is not None and cursor[0] == i and 0 < lo - cursor[1] <= len(move):
+                    gap, gap_key = encode(i, cursor[1], lo, keys, chars, visible, key)
+                    if len(gap) <= len(move):
+                        move, key = gap, gap_key
+                frame.write(move)
+                run, key = encode(i, lo, hi, keys, chars, visible, key)
+                frame.write(run)
+                cursor = (i, hi) if hi < cols else None
+        frame.write(self._frame_end)
+
+        self.scr.flush()
+        self.frame_bytes = frame.flush_to(self._fd)
+        self.total_bytes += self.frame_bytes
+
+    def _encode_cells(
+        self,
+        i: int,
+        lo: int,
+        hi: int,
+        keys: np.ndarray[np.int64],
+        chars: np.ndarray[np.int32],
+        visible: typing.Optional[np.ndarray[np.bool_]],
+        key: typing.Optional[int],
+    ) -> tuple[bytes, int]:
+        """Encodes the cells [lo, hi) of row `i`.
+
+        A style change is only written where the style differs from the one
+        before it, starting from the currently active style.
+
+        Args:
+            i: The row to encode.
+            lo: The first column to encode.
+            hi: The column after the last one to encode.
+            keys: The style keys of the whole grid.
+            chars: The printable characters of the whole grid.
+            visible: Which cells are not covered by a wide character, or
+                None if every cell is written.
+            key: The currently active style, or None if it is not known.
+
+        Returns:
+            A (data, key) tuple of the encoded cells and the style active
+            after them.
+        """
+        row_keys, row_chars = keys[i, lo:hi], chars[i, lo:hi]
+        if visible is not None:
+            row_keys, row_chars = row_keys[visible[i, lo:hi]], row_chars[visible[i, lo:hi]]
+        text = row_chars.astype("<u4").tobytes().decode("utf-32-le").encode()
+        byte_ends = np.cumsum(_utf8_length(row_chars))
+        changes = np.flatnonzero(row_keys[1:] != row_keys[:-1])
+        starts = [0, *byte_ends[changes].tolist()]
+        ends = starts[1:] + [len(text)]
+
+        parts, transition = [], self._encoder.transition
+        for start, end, run_key in zip(starts, ends, row_keys[[0, *(changes + 1)]].tolist()):
+            parts.append(transition(key, run_key))
+            parts.append(text[start:end])
+            key = run_key
+        return b"".join(parts), key
 
     def get_real_shape(self) -> tuple[int, int]:
         """Gets the current size of the terminal window.
+
+        The size is only queried again when the terminal reports a resize,
+        which urwid picks up through SIGWINCH.
         
         Returns:
             A (rows, cols) tuple of the terminal size.
         """
-        return self.scr.get_cols_rows()[::-1]
+        return self._real_shape
     
     def events(self) -> list[dg.Event]:
         """Polls and processes input events from the terminal.
@@ -157,7 +351,13 @@ class TermGrid(dg.Grid):
         """
         out = []
         for event in self.scr.get_input():
-            if isinstance(event, str):
+            if event == "window resize":
+                # The terminal may have reflowed or cleared what it showed.
+                self._real_shape = tuple(self.scr.get_cols_rows()[::-1])
+                self.invalidate()
+                self._erase = True
+                out.append(dg.ResizeEvent(self._real_shape))
+            elif isinstance(event, str):
                 mod, key = _split_mod_event(event)
                 out.append(dg.KeyEvent(KEY_MAP.get(key, key), mod))
             else:
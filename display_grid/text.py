@@ -0,0 +1,492 @@
+"""This module provides data structures for editable and very long text.
+
+A gap buffer keeps its items in one list with a run of unused slots, the gap,
+at the position of the last edit. Inserting or deleting at that position only
+fills or widens the gap, so the typing pattern of a text editor, where edits
+cluster around the cursor, costs O(1) amortized per edit instead of the O(n)
+of `list.insert` and `list.pop`.
+
+Text input uses a GapBuffer of characters. Multi-line text uses a GapBuffer of
+lines, so edits within a line only copy that line, and inserting or removing
+lines near the cursor stays cheap in documents of any length.
+
+`layout` wraps, aligns and truncates text into a block of cells, aware of
+wide characters, and memoizes the result, so static text costs one array
+write per frame.
+
+`format_column` formats a whole column of numbers or strings into a block of
+fixed-width character codes at once, for tables.
+
+A LineIndex finds lines in a growing file, such as a log, through an `mmap`.
+Only the offset of every `stride`-th line is kept, so memory use stays small
+for files of any size while any line can be found by scanning at most
+`stride` lines.
+"""
+import functools
+import mmap
+import os
+import re
+import typing
+import unicodedata
+
+import numpy as np
+
+_MIN_GAP = 16
+
+# New data is scanned for newlines in chunks of this many bytes.
+_SCAN_CHUNK = 1 << 24
+
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+_TOKENS = re.compile(r"\S+|\s+")
+
+LAYOUT_CACHE_SIZE = 1024
+
+
+class GapBuffer:
+    """A mutable sequence optimized for edits near the previous edit.
+
+    Supports `len`, iteration, and indexing and slicing (with a step of 1)
+    like a list. Slices are returned as lists.
+    """
+    def __init__(self, items: typing.Iterable[typing.Any] = ()) -> None:
+        """Constructs a GapBuffer.
+
+        Args:
+            items: The initial items. The gap starts at the end.
+        """
+        self._buf = list(items)
+        self._start = len(self._buf)
+        self._buf += [None] * _MIN_GAP
+        self._end = len(self._buf)
+
+    def __len__(self) -> int:
+        """Returns the number of items, not counting the gap."""
+        return len(self._buf) - (self._end - self._start)
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        """Iterates over the items in order."""
+        yield from self._buf[:self._start]
+        yield from self._buf[self._end:]
+
+    def __str__(self) -> str:
+        """Joins the items, which must be strings, into one string."""
+        return "".join(self._buf[:self._start]) + "".join(self._buf[self._end:])
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        """Returns an item, or a list of the items in a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            stop = max(start, stop)
+            gap = self._end - self._start
+            if stop <= self._start:
+                return self._buf[start:stop]
+            if start >= self._start:
+                return self._buf[start + gap:stop + gap]
+            return self._buf[start:self._start] + self._buf[self._end:stop + gap]
+        return self._buf[self._physical(index)]
+
+    def __setitem__(self, index: int, item: typing.Any) -> None:
+        """Replaces an item."""
+        self._buf[self._physical(index)] = item
+
+    def _physical(self, index: int) -> int:
+        """Returns the position of an item in the underlying list."""
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("GapBuffer index out of range")
+        return index if index < self._start else index + self._end - self._start
+
+    def _move_gap(self, index: int) -> None:
+        """Moves the gap so that it starts at `index`."""
+        buf = self._buf
+        if index < self._start:
+            n = self._start - index
+            buf[self._end - n:self._end] = buf[index:self._start]
+            self._start, self._end = index, self._end - n
+        elif index > self._start:
+            n = index - self._start
+            buf[self._start:index] = buf[self._end:self._end + n]
+            self._start, self._end = index, self._end + n
+
+    def _reserve(self, n: int) -> None:
+        """Widens the gap to at least `n` slots, at least doubling its size."""
+        if self._end - self._start < n:
+            extra = max(n, len(self), _MIN_GAP)
+            self._buf[self._end:self._end] = [None] * extra
+            self._end += extra
+
+    def insert(self, index: int, item: typing.Any) -> None:
+        """Inserts an item before `index`, like `list.insert`."""
+        self.insert_many(index, (item,))
+
+    def insert_many(self, index: int, items: typing.Iterable[typing.Any]) -> None:
+        """Inserts several items before `index`."""
+        items = list(items)
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self._move_gap(index)
+        self._reserve(len(items))
+        self._buf[self._start:self._start + len(items)] = items
+        self._start += len(items)
+
+    def append(self, item: typing.Any) -> None:
+        """Adds an item to the end."""
+        self.insert(len(self), item)
+
+    def delete(self, index: int, count: int = 1) -> list[typing.Any]:
+        """Removes items from `index` onwards.
+
+        Args:
+            index: The position of the first item to remove.
+            count: The number of items to remove. Fewer are removed if the
+                buffer ends first.
+
+        Returns:
+            The removed items.
+        """
+        if index < 0:
+            index += len(self)
+        self._physical(index)
+        count = min(count, len(self) - index)
+        self._move_gap(index)
+        removed = self._buf[self._end:self._end + count]
+        self._buf[self._end:self._end + count] = [None] * count
+        self._end += count
+        return removed
+
+    def pop(self, index: int = -1) -> typing.Any:
+        """Removes and returns one item, like `list.pop`."""
+        return self.delete(index)[0]
+
+
+class LineIndex:
+    """An incremental index of the lines in a growing file.
+
+    Call `update` to index data appended since the last call. A file that
+    shrinks is assumed to have been truncated and is indexed from the start.
+
+    Attributes:
+        stride (int): The number of lines between indexed offsets.
+    """
+    def __init__(
+        self,
+        file: typing.Union[str, os.PathLike, typing.BinaryIO],
+        stride: int = 64,
+    ) -> None:
+        """Constructs a LineIndex and indexes the file's current contents.
+
+        Args:
+            file: The path of the file, or a binary file object open for
+                reading.
+            stride: The number of lines between indexed offsets.
+        """
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self._file = open(file, "rb") if self._owns_file else file
+        self.stride = stride
+        self._map: typing.Optional[mmap.mmap] = None
+        self._reset()
+        self.update()
+
+    def _reset(self) -> None:
+        """Forgets everything indexed so far."""
+        self._offsets = np.zeros(1024, dtype=np.int64)
+        self._n_offsets = 1
+        self._count = 0
+        self._tail = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Returns the number of lines, counting an unterminated last line."""
+        return self._count + (self._size > self._tail)
+
+    @property
+    def complete_lines(self) -> int:
+        """The number of lines that end in a newline, and so cannot change."""
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of the file that have been indexed."""
+        return self._size
+
+    def update(self) -> int:
+        """Indexes any data appended to the file since the last update.
+
+        Returns:
+            The number of lines added, counting a last line that was not
+            terminated before.
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self._size:
+            self._reset()
+        if size == self._size:
+            return 0
+        before = len(self)
+        if self._map is None or len(self._map) < size:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+        pos = self._size
+        while pos < size:
+            end = min(pos + _SCAN_CHUNK, size)
+            starts = np.flatnonzero(np.frombuffer(self._map, np.uint8, end - pos, pos) == 10) + pos + 1
+            # starts[m] is the start of line self._count + m + 1.
+            first = -(self._count + 1) % self.stride
+            self._append_offsets(starts[first::self.stride])
+            if len(starts):
+                self._count += len(starts)
+                self._tail = int(starts[-1])
+            pos = end
+        self._size = size
+        return len(self) - before
+
+    def _append_offsets(self, offsets: np.ndarray[np.int64]) -> None:
+        """Adds line offsets to the index, growing it by doubling."""
+        n = self._n_offsets + len(offsets)
+        if n > len(self._offsets):
+            self._offsets = np.resize(self._offsets, max(n, 2 * len(self._offsets)))
+        self._offsets[self._n_offsets:n] = offsets
+        self._n_offsets = n
+
+    def lines(self, start: int, count: int) -> list[str]:
+        """Returns up to `count` lines, starting from line `start`.
+
+        Lines are decoded as UTF-8, with invalid bytes replaced and tabs
+        expanded, and without their line endings.
+        """
+        count = min(count, len(self) - start)
+        if count <= 0 or self._map is None:
+            return []
+        mm, size = self._map, self._size
+        pos = int(self._offsets[start // self.stride])
+        for _ in range(start % self.stride):
+            pos = mm.find(b"\n", pos, size) + 1
+
+        out = []
+        for _ in range(count):
+            end = mm.find(b"\n", pos, size)
+            if end == -1:
+                end = size
+            out.append(mm[pos:end].decode("utf-8", "replace").rstrip("\r").expandtabs())
+            pos = end + 1
+        return out
+
+    def close(self) -> None:
+        """Releases the mapping, and the file if it was opened from a path."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._owns_file:
+            self._file.close()
+
+
+def format_column(
+    values: np.typing.ArrayLike,
+    width: int,
+    align: str = ">",
+    decimals: int = 2,
+) -> np.ndarray[np.uint32]:
+    """Formats a column of values into fixed-width rows of character codes.
+
+    Integers and booleans are written in full, floats with a fixed number of
+    decimals, and anything else as its string. Every value is formatted with
+    vectorized NumPy operations, without a Python loop over the values.
+    Numbers that do not fit are shown as "#" signs, and strings that do not
+    fit end in "…".
+
+    Args:
+        values: A 1D array-like of values.
+        width: The width of the column in characters.
+        align: "<", ">" or "^" to align left, right or center.
+        decimals: The number of decimals floats are shown with.
+
+    Returns:
+        A uint32 array of shape (len(values), width) of character codes.
+    """
+    values = np.asarray(values)
+    if width <= 0:
+        return np.zeros((len(values), 0), dtype=np.uint32)
+    if values.dtype.kind in "biu":
+        # Magnitudes are computed in int64, which holds neither 2**63 nor
+        # the absolute value of the int64 minimum.
+        big = np.iinfo(np.int64).max
+        fits = values <= big if values.dtype.kind == "u" else values >= -big
+        out = _format_numbers(np.abs(np.where(fits, values, 0).astype(np.int64)), values < 0, 0, width, align)
+        out[~fits] = ord("#")
+        return out
+    if values.dtype.kind == "f":
+        finite = np.isfinite(values)
+        scaled = np.rint(np.abs(np.where(finite, values, 0)) * 10.0 ** decimals)
+        fits = scaled < 1e18
+        out = _format_numbers(np.where(fits, scaled, 0).astype(np.int64), values < 0, decimals, width, align)
+        out[~fits] = ord("#")
+        if not finite.all():
+            out[~finite] = format_column(values[~finite].astype(str), width, align)
+        return out
+
+    text = values.astype(str)
+    lengths = np.char.str_len(text) if len(text) else np.zeros(0, dtype=np.int64)
+    codes = np.ascontiguousarray(text.astype(f"<U{width}")).view(np.uint32).reshape(len(text), width)
+    codes[lengths > width, -1] = ord("…")
+    return _align(codes, np.zeros(len(codes), dtype=np.int64), np.minimum(lengths, width), width, align)
+
+
+def _format_numbers(
+    magnitudes: np.ndarray[np.int64],
+    negative: np.ndarray[np.bool_],
+    decimals: int,
+    width: int,
+    align: str,
+) -> np.ndarray[np.uint32]:
+    """Formats integers, scaled by 10**decimals, as fixed-point numbers."""
+    n_digits = np.maximum(np.searchsorted(_POW10, magnitudes, side="right"), decimals + 1)
+    lengths = n_digits + (decimals > 0) + negative
+    span = int(lengths.max(initial=1))
+
+    # Lay each number out right-aligned in a field of `span` characters,
+    # where p counts characters from the right.
+    p = np.arange(span - 1, -1, -1)
+    digit = p - (decimals > 0) * (p > decimals)
+    field = (magnitudes[:, None] // _POW10[np.minimum(digit, 18)]) % 10 + ord("0")
+    if decimals > 0:
+        field[:, p == decimals] = ord(".")
+    field[negative[:, None] & (p == lengths[:, None] - 1)] = ord("-")
+
+    out = _align(field.astype(np.uint32), span - lengths, lengths, width, align)
+    out[lengths > width] = ord("#")
+    return out
+
+
+def _align(
+    field: np.ndarray[np.uint32],
+    starts: np.ndarray[np.int64],
+    lengths: np.ndarray[np.int64],
+    width: int,
+    align: str,
+) -> np.ndarray[np.uint32]:
+    """Moves each row's text, found at starts[i] in field[i], into an aligned column."""
+    if align == ">":
+        offsets = width - lengths
+    elif align == "^":
+        offsets = (width - lengths) // 2
+    else:
+        offsets = np.zeros_like(lengths)
+    offsets = np.maximum(offsets, 0)[:, None]
+    j = np.arange(width)
+    src = np.clip(starts[:, None] + j - offsets, 0, field.shape[1] - 1)
+    inside = (j >= offsets) & (j - offsets < lengths[:, None])
+    return np.where(inside, np.take_along_axis(field, src, axis=1), ord(" ")).astype(np.uint32)
+
+
+@functools.cache
+def is_wide(code: int) -> bool:
+    """Returns True if the character `code` is drawn two columns wide."""
+    return unicodedata.east_asian_width(chr(code)) in "WF"
+
+
+def text_width(text: str) -> int:
+    """Returns the number of columns a string takes up."""
+    return len(text) + sum(is_wide(ord(c)) for c in text if c >= "\u1100")
+
+
+def _truncate(text: str, width: int, ellipsis: str) -> str:
+    """Shortens text to at most `width` columns, ending it in `ellipsis`."""
+    if text_width(text) <= width:
+        return text
+    budget = width - text_width(ellipsis)
+    used = 0
+    for i, c in enumerate(text):
+        used += 1 + is_wide(ord(c))
+        if used > budget:
+            return text[:i] + ellipsis if budget >= 0 else ellipsis[:width]
+    return text
+
+
+def _wrap(paragraph: str, width: int) -> list[str]:
+    """Wraps a paragraph at spaces, breaking words longer than `width`."""
+    lines, line, used = [], "", 0
+    for token in _TOKENS.findall(paragraph):
+        token_width = text_width(token)
+        if token.isspace():
+            if line:
+                line, used = line + token, used + token_width
+            continue
+        if used + token_width > width and line.strip():
+            lines.append(line.rstrip())
+            line, used = "", 0
+        while token_width > width:
+            # Break a word too long for any line, taking at least one
+            # character so that a wide character in a narrow line is placed.
+            head = _truncate(token, width, "") or token[0]
+            if line:
+                lines.append(line.rstrip())
+            lines.append(head)
+            token = token[len(head):]
+            token_width = text_width(token)
+            line, used = "", 0
+        line, used = line + token, used + token_width
+    if line or not lines:
+        lines.append(line.rstrip())
+    return lines
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def layout(
+    text: str,
+    width: int,
+    align: str = "<",
+    wrap: bool = True,
+    max_lines: typing.Optional[int] = None,
+    ellipsis: str = "…",
+) -> np.ndarray[np.int32]:
+    """Lays text out into rows of cells.
+
+    Lines are split at newlines, and wrapped at spaces if `wrap` is True.
+    A wide character takes up two cells, the second of which is a space
+    that terminals draw over. Results are cached by all arguments, so the
+    returned array is read-only.
+
+    Args:
+        text: The text to lay out.
+        width: The number of columns to fit the text into.
+        align: "<", ">" or "^" to align lines left, right or center.
+        wrap: If True, long lines are word-wrapped. Otherwise they are
+            truncated.
+        max_lines: If not None, the text is cut to this many lines, and the
+            last line ends in `ellipsis` if anything was cut.
+        ellipsis: The string marking where text was cut.
+
+    Returns:
+        An int32 array of shape (lines, width) of character codes, with
+        spaces where there is no text.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.expandtabs()
+        lines += _wrap(paragraph, width) if wrap else [_truncate(paragraph, width, ellipsis)]
+    if max_lines is not None and len(lines) > max_lines:
+        lines = lines[:max_lines]
+        if lines:
+            lines[-1] = _truncate(lines[-1], max(width - text_width(ellipsis), 0), "") + ellipsis
+
+    out = np.full((len(lines), width), ord(" "), dtype=np.int32)
+    for i, line in enumerate(lines):
+        cells = []
+        for c in line:
+            if not is_wide(ord(c)):
+                cells.append(ord(c))
+            elif len(cells) + 2 <= width:
+                cells += ord(c), ord(" ")
+            else:
+                # Half of a wide character cannot be shown.
+                cells.append(ord(" "))
+        cells = cells[:width]
+        start = {"<": 0, ">": width - len(cells), "^": (width - len(cells)) // 2}[align]
+        out[i, start:start + len(cells)] = cells
+    out.flags.writeable = False
+    return out
@@ -66,4 +66,15 @@ class MouseEvent(Event):
     button: int = 0
     state: bool = True  # True is down
     pos: tuple[int, int] = (0, 0)
-    mod: int = 0
\ No newline at end of file
+    mod: int = 0
+
+
+@dataclass(frozen=True)
+class ResizeEvent(Event):
+    """Represents a change in the size of the window or terminal.
+
+    Attributes:
+        shape: The new (rows, cols) shape of the window in cells.
+    """
+
+    shape: tuple[int, int] = (0, 0)
@@ -0,0 +1,17 @@
+"""Fixtures shared by the test modules."""
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+
+@pytest.fixture
+def make_grid():
+    """Provides a function that builds a plain Grid of a given shape."""
+    def make(shape=(6, 10)):
+        return dg.Grid(
+            np.zeros((*shape, 2, 3), dtype=np.uint8),
+            np.zeros(shape, dtype=np.int32),
+            np.zeros(shape, dtype=np.uint8),
+        )
+    return make
@@ -0,0 +1,135 @@
+"""Tests for the ansi.py module."""
+
+import os
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+from display_grid import ansi
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Clears terminal-related environment variables and the profile cache."""
+    for name in ["TERM", "TERM_PROGRAM", "COLORTERM", "KITTY_WINDOW_ID", "WT_SESSION", "VTE_VERSION"]:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(dg, "SUPPORTS_TRUECOLOR", False)
+    ansi.detect_profile.cache_clear()
+    yield monkeypatch
+    ansi.detect_profile.cache_clear()
+
+def test_detect_profile_basic(clean_env):
+    clean_env.setenv("TERM", "xterm")
+    assert ansi.detect_profile() == ansi.TermProfile(depth=16)
+
+def test_detect_profile_256(clean_env):
+    clean_env.setenv("TERM", "xterm-256color")
+    profile = ansi.detect_profile()
+    assert profile.depth == 256
+    assert not profile.sync_update
+
+def test_detect_profile_modern(clean_env):
+    clean_env.setenv("TERM", "xterm-kitty")
+    profile = ansi.detect_profile()
+    assert profile.depth == 2**24
+    assert profile.sync_update
+    assert profile.styled_underline
+
+def test_detect_profile_vte(clean_env):
+    clean_env.setenv("TERM", "xterm-256color")
+    clean_env.setenv("VTE_VERSION", "6003")
+    assert ansi.detect_profile().styled_underline
+
+def test_detect_profile_cached(clean_env):
+    clean_env.setenv("TERM", "xterm")
+    first = ansi.detect_profile()
+    clean_env.setenv("TERM", "xterm-256color")
+    assert ansi.detect_profile() is first
+
+@pytest.mark.parametrize("depth, expected", [
+    (2**24, b"\x1b[0;1;4;38;2;255;0;0;48;2;0;0;255m"),
+    (256, b"\x1b[0;1;4;38;5;196;48;5;21m"),
+    (16, b"\x1b[0;1;4;91;44m"),
+])
+def test_encoders(depth, expected):
+    encoder = ansi.make_encoder(ansi.TermProfile(depth=depth))
+    fg = np.array([[[255, 0, 0]]], dtype=np.uint8)
+    bg = np.array([[[0, 0, 255]]], dtype=np.uint8)
+    attrs = np.array([[dg.TA_BOLD | dg.TA_UNDERLINE]], dtype=np.uint8)
+    key = encoder.keys(fg, bg, attrs)[0, 0].item()
+    assert encoder.sgr(key) == expected
+
+def test_encoder_keys_distinguish_styles():
+    encoder = ansi.TrueColorEncoder()
+    fg = np.zeros((1, 3, 3), dtype=np.uint8)
+    bg = np.zeros((1, 3, 3), dtype=np.uint8)
+    attrs = np.zeros((1, 3), dtype=np.uint8)
+    fg[0, 1, 2] = 1
+    attrs[0, 2] = dg.TA_ITALIC
+    assert len(set(encoder.keys(fg, bg, attrs)[0].tolist())) == 3
+
+def test_frame_buffer_grows_and_flushes():
+    r, w = os.pipe()
+    frame = ansi.FrameBuffer(capacity=4)
+    frame.write(b"abc")
+    frame.write(memoryview(b"defgh"))
+    assert frame.getvalue() == b"abcdefgh"
+    assert frame.flush_to(w) == 8
+    assert os.read(r, 100) == b"abcdefgh"
+    assert frame.size == 0
+    os.close(r)
+    os.close(w)
+
+def test_sgr_transition():
+    """Tests that transitions only change what differs between styles."""
+    encoder = dg.ansi.Palette256Encoder()
+    red = 196 << 8 | 16
+    bold_red = dg.TA_BOLD << 48 | red
+    assert encoder.transition(None, red) == encoder.sgr(red)
+    assert encoder.transition(red, red) == b""
+    assert encoder.transition(red, bold_red) == b"\x1b[1m"
+    assert encoder.transition(bold_red, red) == b"\x1b[22m"
+    assert encoder.transition(red, 196 << 8 | 21) == b"\x1b[48;5;21m"
+
+    truecolor = dg.ansi.TrueColorEncoder()
+    assert truecolor.transition(0, 0xFF0000 << 24) == b"\x1b[38;2;255;0;0m"
+
+def test_sgr_unmapped_attrs():
+    """Tests that attribute bits without an SGR code never reset the style."""
+    encoder = dg.ansi.TrueColorEncoder()
+    color = np.full((1, 2, 3), 200, dtype=np.uint8)
+    keys = encoder.keys(color, color, np.array([[2, 0]], dtype=np.uint8))
+    assert keys[0, 0] == keys[0, 1]
+    red = 0xFF0000 << 24
+    assert encoder.transition(2 << 48 | red, red) == b""
+
+def test_sgr_encoder_is_abstract():
+    """Tests that an encoder without key packing or colors cannot be made."""
+    with pytest.raises(TypeError):
+        ansi.SGREncoder()
+
+def test_sgr_undercurl():
+    """Tests that curly underlines are only sent to terminals that support them."""
+    color = np.zeros((1, 2, 3), dtype=np.uint8)
+    attrs = np.array([[dg.TA_UNDERCURL, dg.TA_UNDERCURL | dg.TA_UNDERLINE]], dtype=np.uint8)
+    styled = ansi.make_encoder(ansi.TermProfile(depth=2**24, styled_underline=True))
+    keys = styled.keys(color, color, attrs)
+    assert keys[0, 0] == keys[0, 1]
+    assert styled.sgr(int(keys[0, 0])).startswith(b"\x1b[0;4:3;")
+    underline = int(styled.keys(color[:, :1], color[:, :1], np.array([[dg.TA_UNDERLINE]], dtype=np.uint8))[0, 0])
+    assert styled.transition(underline, int(keys[0, 0])) == b"\x1b[24;4:3m"
+
+    plain = ansi.make_encoder(ansi.TermProfile(depth=2**24))
+    keys = plain.keys(color, color, attrs)
+    assert plain.sgr(int(keys[0, 0])).startswith(b"\x1b[0;4;")
+
+def test_cursor_motion():
+    """Tests that the shortest cursor movement is chosen."""
+    assert dg.ansi.cursor_motion(0, 0) == b"\x1b[H"
+    assert dg.ansi.cursor_motion(4, 0) == b"\x1b[5H"
+    assert dg.ansi.cursor_motion(4, 7) == b"\x1b[5;8H"
+    assert dg.ansi.cursor_motion(4, 7, (4, 7)) == b""
+    assert dg.ansi.cursor_motion(4, 9, (4, 7)) == b"\x1b[2C"
+    assert dg.ansi.cursor_motion(4, 6, (4, 7)) == b"\x1b[D"
+    assert dg.ansi.cursor_motion(5, 0, (4, 30)) == b"\r\n"
+    assert dg.ansi.cursor_motion(40, 50, (2, 70)) == b"\x1b[41;51H"
@@ -49,3 +49,79 @@ def test_load_graphics_no_txt_files():
             f.write("data")
         dg.load_graphics(tmpdir + "/")
         assert len(dg.GRAPHICS) == 0
+
+@pytest.fixture
+def sprite_sheet():
+    """Writes a sprite sheet with two sprites to a temporary file."""
+    walk_chars = np.arange(3 * 2 * 4, dtype=np.int32).reshape(3, 2, 4) + ord("a")
+    walk_colors = np.random.default_rng(0).integers(0, 256, (3, 2, 4, 2, 3), dtype=np.uint8)
+    sprites = {
+        "walk": dg.Sprite(walk_chars, walk_colors, fps=10),
+        "icon": dg.Sprite(np.full((1, 3), ord("#"), dtype=np.int32)),
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "sheet.dgs")
+        dg.save_sprite_sheet(path, sprites)
+        yield path, sprites
+
+def test_load_sprite_sheet(sprite_sheet):
+    """Tests that a saved sprite sheet round-trips through load_sprite_sheet."""
+    path, sprites = sprite_sheet
+    dg.SPRITES.clear()
+    dg.load_sprite_sheet(path)
+
+    assert set(dg.SPRITES) == {"walk", "icon"}
+    walk = dg.SPRITES["walk"]
+    assert len(walk) == 3
+    assert walk.shape == (2, 4)
+    assert walk.fps == 10
+    assert np.array_equal(walk.chars, sprites["walk"].chars)
+    assert np.array_equal(walk.colors, sprites["walk"].colors)
+    assert np.all(dg.SPRITES["icon"][0].fg == 255)
+    dg.SPRITES.clear()
+
+def test_sprite_sheet_frames_are_views(sprite_sheet):
+    """Tests that loaded frames share memory with the mapped file."""
+    path, _ = sprite_sheet
+    dg.SPRITES.clear()
+    dg.load_sprite_sheet(path)
+    walk = dg.SPRITES["walk"]
+    frame = walk[1]
+    assert np.shares_memory(frame.chars, walk.chars)
+    assert not frame.chars.flags.writeable
+    dg.SPRITES.clear()
+
+def test_load_sprite_sheet_bad_magic():
+    """Tests that load_sprite_sheet rejects files that are not sprite sheets."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bad.dgs")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 64)
+        with pytest.raises(ValueError):
+            dg.load_sprite_sheet(path)
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"DGSS",
+    dg.graphics._SHEET_HEADER.pack(dg.graphics.SHEET_MAGIC, dg.graphics.SHEET_VERSION, 100),
+])
+def test_load_sprite_sheet_truncated(tmp_path, data):
+    """Tests that files too short for their header or index are rejected."""
+    path = tmp_path / "short.dgs"
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="sprite sheet"):
+        dg.load_sprite_sheet(str(path))
+
+def test_animation_frame_selection():
+    """Tests that Animation picks frames by elapsed time."""
+    sprite = dg.Sprite(np.arange(4, dtype=np.int32).reshape(4, 1, 1), fps=4)
+    anim = dg.Animation(sprite, start_time=100.0)
+    assert anim.index(100.0) == 0
+    assert anim.index(100.26) == 1
+    assert anim.index(101.0) == 0
+    assert anim.frame(100.5).chars[0, 0] == 2
+
+    once = dg.Animation(sprite, loop=False, start_time=100.0)
+    assert once.index(105.0) == 3
+    assert once.finished(105.0)
+    assert not once.finished(100.5)
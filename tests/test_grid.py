@@ -127,4 +127,117 @@ def test_base_grid_methods(sample_grid):
     assert sample_grid.get_real_shape() == sample_grid.shape
     assert sample_grid.events() == []
     # draw() returns None, nothing to assert
-    sample_grid.draw()
\ No newline at end of file
+    sample_grid.draw()
+
+def test_grid_blit(sample_grid, make_grid):
+    """Tests that blit() copies every plane from another grid."""
+    src = make_grid((2, 3))
+    src.fill("Q", (1, 2, 3), (4, 5, 6), dg.TA_BOLD)
+    sample_grid.blit(src, (4, 5))
+
+    assert np.all(sample_grid.chars[4:6, 5:8] == ord("Q"))
+    assert np.all(sample_grid.fg[4:6, 5:8] == (1, 2, 3))
+    assert np.all(sample_grid.bg[4:6, 5:8] == (4, 5, 6))
+    assert np.all(sample_grid.attrs[4:6, 5:8] == dg.TA_BOLD)
+    assert sample_grid.chars[4, 8] == ord(" ")
+
+def test_grid_blit_clipping(sample_grid, make_grid):
+    """Tests that blit() clips the source against the destination edges."""
+    src = make_grid((3, 3))
+    src.chars[:] = np.arange(9).reshape(3, 3) + ord("a")
+    sample_grid.blit(src, (-1, 18))
+    assert np.array_equal(sample_grid.chars[0:2, 18:20], src.chars[1:3, 0:2])
+
+    sample_grid.blit(src, (0, 0), src_rect=(1, 1, 3, 3))
+    assert np.array_equal(sample_grid.chars[0:2, 0:2], src.chars[1:3, 1:3])
+
+    sample_grid.blit(src, (20, 20))  # Entirely off-grid, no error.
+
+def test_grid_blit_negative_src_rect(sample_grid, make_grid):
+    """Tests that a source box starting before the source shifts the copy."""
+    src = make_grid((3, 3))
+    src.chars[:] = np.arange(9).reshape(3, 3) + ord("a")
+    mask = np.ones((4, 4), dtype=bool)
+    mask[1, 1] = False
+    sample_grid.blit(src, (2, 2), src_rect=(-1, -1, 3, 3), mask=mask)
+    assert "".join(map(chr, sample_grid.chars[2, 2:7])) == "     "
+    assert "".join(map(chr, sample_grid.chars[3, 2:7])) == "  bc "
+    assert "".join(map(chr, sample_grid.chars[4, 2:7])) == " def "
+
+def test_grid_blit_mask(sample_grid, make_grid):
+    """Tests that blit() only copies cells where the mask is set."""
+    src = make_grid((1, 3))
+    src.fill("M", bg=(9, 9, 9))
+    sample_grid.blit(src, (0, 0), mask=np.array([[True, False, True]]))
+    assert sample_grid.chars[0, 0] == ord("M")
+    assert sample_grid.chars[0, 1] == ord(" ")
+    assert np.array_equal(sample_grid.bg[0, 1], (0, 0, 0))
+    assert np.array_equal(sample_grid.bg[0, 2], (9, 9, 9))
+
+def test_grid_blit_overlapping_subgrids(sample_grid):
+    """Tests that blit() between overlapping SubGrids of one parent is correct."""
+    src = dg.SubGrid(sample_grid, 0, 0, 1, 10)
+    dst = dg.SubGrid(sample_grid, 0, 3, 1, 13)
+    sample_grid.chars[0, :] = np.arange(20) + ord("A")
+    expected = sample_grid.chars[0, 0:10].copy()
+    dst.blit(src)
+    assert np.array_equal(sample_grid.chars[0, 3:13], expected)
+
+def test_grid_scroll(sample_grid):
+    """Tests scrolling the whole grid up and down."""
+    sample_grid.chars[:, 0] = np.arange(10) + ord("0")
+    sample_grid.scroll(3)
+    assert np.array_equal(sample_grid.chars[:7, 0], np.arange(3, 10) + ord("0"))
+    assert np.all(sample_grid.chars[7:] == ord(" "))
+
+    sample_grid.scroll(-2)
+    assert np.all(sample_grid.chars[:2] == ord(" "))
+    assert np.array_equal(sample_grid.chars[2:9, 0], np.arange(3, 10) + ord("0"))
+
+def test_grid_scroll_region(sample_grid):
+    """Tests that scrolling a region leaves the rest of the grid alone."""
+    sample_grid.fill("X", bg=(5, 5, 5))
+    sample_grid.chars[2:5, 3] = [ord("a"), ord("b"), ord("c")]
+    sample_grid.scroll(1, region=(2, 3, 5, 6))
+    assert list(sample_grid.chars[2:5, 3]) == [ord("b"), ord("c"), ord(" ")]
+    assert np.array_equal(sample_grid.bg[4, 3], (0, 0, 0))
+    assert sample_grid.chars[1, 3] == ord("X")
+    assert sample_grid.chars[4, 6] == ord("X")
+
+def test_subgrid_scroll_hint(sample_grid, mocker):
+    """Tests that a SubGrid passes scroll hints to its parent."""
+    subgrid = dg.SubGrid(sample_grid, 1, 2, 5, 10)
+    mocker.patch.object(sample_grid, "_scrolled")
+    subgrid.scroll(2)
+    sample_grid._scrolled.assert_called_once_with(2, (1, 2, 5, 10))
+
+def test_grid_write_text(sample_grid):
+    """Tests writing wrapped, aligned text into a block of the grid."""
+    n = sample_grid.write_text("hello big world", pos=(2, 10), align=">", fg=(1, 2, 3))
+    assert n == 2
+    assert "".join(map(chr, sample_grid.chars[2, 10:])) == " hello big"
+    assert "".join(map(chr, sample_grid.chars[3, 10:])) == "     world"
+    assert np.array_equal(sample_grid.fg[3, 10], (1, 2, 3))
+    assert not np.array_equal(sample_grid.fg[4, 10], (1, 2, 3))
+
+    assert sample_grid.write_text("a b c d e f", pos=(8, 0), width=3) == 2
+    assert "".join(map(chr, sample_grid.chars[9, :3])) == "c …"
+
+def test_grid_resize(sample_grid):
+    """Tests reallocating a grid at a new shape."""
+    sample_grid.print("old")
+    sample_grid.resize((3, 4))
+    assert sample_grid.shape == (3, 4)
+    assert sample_grid.colors.shape == (3, 4, 2, 3)
+    assert sample_grid.fg.shape == (3, 4, 3)
+    assert np.all(sample_grid.chars == ord(" "))
+
+    sub = dg.SubGrid(sample_grid, 0, 0, 2, 2)
+    with pytest.raises(TypeError):
+        sub.resize((1, 1))
+    assert np.shares_memory(sub.chars, sample_grid.chars)
+
+def test_grid_write_text_clips_width(sample_grid):
+    """Tests that an explicit width past the right edge is clipped."""
+    assert sample_grid.write_text("hi", pos=(0, 18), width=5) == 1
+    assert "".join(map(chr, sample_grid.chars[0, 18:])) == "hi"
@@ -0,0 +1,62 @@
+"""Tests for the image.py module."""
+
+import numpy as np
+import pytest
+
+from display_grid import image
+
+@pytest.mark.parametrize("mode, shape", [
+    ("half", (2, 1)),
+    ("quadrant", (2, 2)),
+    ("sextant", (3, 2)),
+    ("braille", (4, 2)),
+])
+def test_cell_shape(mode, shape):
+    """Tests the number of pixels covered by a cell in each mode."""
+    assert image.cell_shape(mode) == shape
+
+def test_encode_cells_quadrant_pattern():
+    """Tests that a two-color cell gets the matching quadrant glyph and colors."""
+    red, blue = (200, 0, 0), (0, 0, 50)
+    pixels = np.array([[red, blue], [blue, red]], dtype=np.uint8)
+    chars, fg, bg = image.encode_cells(pixels, "quadrant")
+    assert chars.shape == (1, 1)
+    assert chr(chars[0, 0]) == "▚"
+    assert np.array_equal(fg[0, 0], red)
+    assert np.array_equal(bg[0, 0], blue)
+
+def test_encode_cells_solid_cell():
+    """Tests that a single-color cell uses that color for both fg and bg."""
+    pixels = np.full((4, 2, 3), 77, dtype=np.uint8)
+    chars, fg, bg = image.encode_cells(pixels, "braille")
+    assert chars[0, 0] == 0x2800
+    assert np.all(fg == 77)
+    assert np.all(bg == 77)
+
+def test_encode_cells_sextant_table():
+    """Tests sextant glyph selection, including the half-block special cases."""
+    pixels = np.zeros((3, 6, 3), dtype=np.uint8)
+    pixels[0, 0] = 255          # Top-left only.
+    pixels[:, 2] = 255          # Left column.
+    pixels[:, 4] = 255          # Left column of a dark-on-bright cell.
+    pixels[2, 5] = 255
+    chars, _, _ = image.encode_cells(pixels, "sextant")
+    assert [chr(c) for c in chars[0]] == ["\U0001FB00", "▌", "\U0001FB32"]
+
+def test_encode_cells_braille_dots():
+    """Tests braille dot numbering."""
+    pixels = np.zeros((4, 2, 3), dtype=np.uint8)
+    pixels[3, 1] = 255  # Dot 8.
+    pixels[1, 0] = 255  # Dot 2.
+    chars, _, _ = image.encode_cells(pixels, "braille")
+    assert chars[0, 0] == 0x2800 + 0x80 + 0x02
+
+def test_encode_cells_pads_partial_cells():
+    """Tests that images not a multiple of the cell shape are padded."""
+    pixels = np.full((5, 3, 3), 255, dtype=np.uint8)
+    chars, fg, bg = image.encode_cells(pixels, "quadrant")
+    assert chars.shape == (3, 2)
+    assert np.all(bg[0, 0] == 255)
+    assert chr(chars[2, 1]) == "▘"
+    assert np.all(fg[2, 1] == 255)
+    assert np.all(bg[2, 1] == 0)
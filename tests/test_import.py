@@ -0,0 +1,44 @@
+"""Tests for importing the display_grid package."""
+
+import importlib.util
+import subprocess
+import sys
+
+import pytest
+
+import display_grid as dg
+
+# The package import, not counting numpy, should stay well under this. It is
+# generous because bytecode may not be cached on the machine running the tests.
+IMPORT_BUDGET = 0.5
+
+def _run(code):
+    """Runs code in a fresh interpreter and returns its output."""
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+def test_import_skips_backends():
+    """Tests that importing the package does not import pygame or urwid."""
+    out = _run("import sys, display_grid; print('pygame' in sys.modules, 'urwid' in sys.modules)")
+    assert out.split() == ["False", "False"]
+
+def test_import_time_budget():
+    """Tests that importing the package, apart from numpy, is fast."""
+    out = _run(
+        "import time, numpy\n"
+        "start = time.perf_counter()\n"
+        "import display_grid\n"
+        "print(time.perf_counter() - start)"
+    )
+    assert float(out) < IMPORT_BUDGET
+
+def test_backends_exported_if_installed():
+    """Tests that only the backends whose package is installed are exported."""
+    for name, package in [("TermGrid", "urwid"), ("PygameGrid", "pygame")]:
+        assert (name in dg.__all__) == (importlib.util.find_spec(package) is not None)
+
+def test_backends_load_on_access():
+    """Tests that backends are imported when first accessed."""
+    pytest.importorskip("urwid")
+    out = _run("import sys, display_grid as dg; dg.TermGrid; print('urwid' in sys.modules, 'pygame' in sys.modules)")
+    assert out.split() == ["True", "False"]
+    assert dg.TermGrid is dg.term_grid.TermGrid
@@ -0,0 +1,87 @@
+"""Tests for the layers.py module."""
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+
+@pytest.fixture
+def target(make_grid):
+    """Provides a 6x10 target Grid for compositing."""
+    return make_grid((6, 10))
+
+def test_layer_starts_transparent():
+    """Tests that a new Layer has no visible cells."""
+    layer = dg.Layer((2, 3))
+    assert np.all(layer.chars == 0)
+    assert np.all(layer.alpha == 255)
+
+def test_compositor_stacks_by_z(target):
+    """Tests that higher layers cover lower ones and NUL cells show through."""
+    comp = dg.Compositor(target)
+    top = comp.add_layer((1, 2), pos=(0, 0), z=1)
+    base = comp.add_layer(z=0)
+    base.fill("b", (1, 1, 1), (2, 2, 2))
+    top.print("t", fg=(9, 9, 9))
+    comp.composite()
+
+    assert target.chars[0, 0] == ord("t")
+    assert np.array_equal(target.fg[0, 0], (9, 9, 9))
+    assert target.chars[0, 1] == ord("b")
+    assert target.chars[5, 9] == ord("b")
+
+def test_compositor_alpha_blends_colors(target):
+    """Tests that partial alpha blends a layer's colors with those below."""
+    comp = dg.Compositor(target)
+    base = comp.add_layer()
+    base.fill("x", (0, 0, 0), (200, 0, 0))
+    glass = comp.add_layer((1, 1), z=1)
+    glass.fill(" ", bg=(0, 0, 200))
+    glass.alpha[...] = 128
+    comp.composite()
+
+    assert target.chars[0, 0] == ord(" ")
+    assert np.array_equal(target.bg[0, 0], (100, 0, 100))
+
+def test_compositor_only_updates_changed_regions(target):
+    """Tests that cells outside a layer's changed box are not rewritten."""
+    comp = dg.Compositor(target)
+    layer = comp.add_layer()
+    layer.fill("a")
+    comp.composite()
+
+    target.chars[5, 9] = ord("?")
+    layer.chars[0, 0] = ord("z")
+    comp.composite()
+    assert target.chars[0, 0] == ord("z")
+    assert target.chars[5, 9] == ord("?")
+
+def test_compositor_move_and_hide(target):
+    """Tests that moving or hiding a layer uncovers its old region."""
+    comp = dg.Compositor(target)
+    layer = comp.add_layer((1, 1))
+    layer.fill("#")
+    comp.composite()
+    assert target.chars[0, 0] == ord("#")
+
+    layer.pos = (2, 3)
+    comp.composite()
+    assert target.chars[0, 0] == ord(" ")
+    assert target.chars[2, 3] == ord("#")
+
+    layer.visible = False
+    comp.composite()
+    assert target.chars[2, 3] == ord(" ")
+
+    layer.visible = True
+    comp.composite()
+    comp.remove_layer(layer)
+    assert target.chars[2, 3] == ord(" ")
+
+def test_layer_clipped_to_target(target):
+    """Tests that layers extending past the target are clipped."""
+    comp = dg.Compositor(target)
+    layer = comp.add_layer((3, 3), pos=(4, 8))
+    layer.fill("c")
+    comp.composite()
+    assert np.all(target.chars[4:, 8:] == ord("c"))
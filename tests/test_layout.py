@@ -0,0 +1,78 @@
+"""Tests for the layout.py module."""
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+from display_grid.layout import Size, Slot, Row, Column, Layout, split
+
+@pytest.fixture
+def root(make_grid):
+    """A root module over a 10x40 grid."""
+    return dg.Module(grid=make_grid((10, 40)))
+
+def test_split():
+    """Tests dividing cells between fixed, fractional and bounded sizes."""
+    assert split(10, [Size(cells=3), Size(), Size()]) == [3, 4, 3]
+    assert split(10, [Size(fraction=1), Size(fraction=3)]) == [3, 7]
+    assert split(11, [Size(), Size(), Size()], gap=1) == [3, 3, 3]
+    assert split(20, [Size(max=4), Size(), Size()]) == [4, 8, 8]
+    assert split(10, [Size(min=8), Size(), Size()]) == [8, 1, 1]
+    assert split(4, [Size(cells=3), Size(cells=3)]) == [3, 3]
+    assert sum(split(7, [Size()] * 3)) == 7
+
+def test_layout_boxes(root):
+    """Tests that nested rows and columns compute every box in one pass."""
+    header, sidebar, body, footer = (dg.Module(root) for _ in range(4))
+    layout = Layout(root, Column(
+        Slot(header, 1),
+        Row(Slot(sidebar, Size(fraction=0.25, min=12)), body, gap=1),
+        Slot(footer, 2),
+    ))
+    assert root.layout is layout
+    assert header.box == (0, 0, 1, 40)
+    assert sidebar.box == (1, 0, 8, 12)
+    assert body.box == (1, 13, 8, 40)
+    assert footer.box == (8, 0, 10, 40)
+    assert body.shape == (7, 27)
+    assert np.shares_memory(body.grid.chars, root.grid.chars)
+
+def test_layout_cached(root):
+    """Tests that boxes are only computed again when something changed."""
+    a, b = dg.Module(root), dg.Module(root)
+    layout = Layout(root, Row(a, b))
+    boxes = layout.boxes()
+    assert layout.boxes() is boxes
+    layout.invalidate()
+    assert layout.boxes() is not boxes
+    assert layout.boxes() == boxes
+
+def test_layout_moves_only_changed_modules(root):
+    """Tests that only modules whose box moved get new grids."""
+    a, b, c = dg.Module(root), dg.Module(root), dg.Module(root)
+    slot = Slot(b, 10)
+    layout = Layout(root, Column(Slot(a, 2), Row(slot, c)))
+    grid_a, grid_b = a.grid, b.grid
+    assert layout.set_size(slot, 15) == [b, c]
+    assert a.grid is grid_a
+    assert b.grid is not grid_b
+    assert b.box == (2, 0, 10, 15)
+    assert c.box == (2, 15, 10, 40)
+    assert layout.apply() == []
+
+def test_layout_follows_resize(root, make_grid):
+    """Tests that reflowing the parent places submodules by the layout."""
+    a, b = dg.Module(root), dg.Module(root)
+    Layout(root, Row(Slot(a, 10), b))
+    root.reflow(make_grid((5, 20)))
+    assert a.box == (0, 0, 5, 10)
+    assert b.box == (0, 10, 5, 20)
+    assert b.shape == (5, 10)
+
+def test_layout_mouse_events(root, mocker):
+    """Tests that modules reaching the parent's far edge receive clicks."""
+    a, b = dg.Module(root), dg.Module(root)
+    Layout(root, Row(a, b))
+    handler = mocker.patch.object(b, "_handle_event", return_value=True)
+    assert root.handle_event(dg.MouseEvent(1, True, (9, 39)))
+    handler.assert_called_once_with(dg.MouseEvent(1, True, (9, 19)))
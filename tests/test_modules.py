@@ -1,5 +1,6 @@
 """Tests for the modules.py module."""
 
+import queue
 import time
 import pytest
 import numpy as np
@@ -131,6 +132,189 @@ def test_text_input_module(root_module):
     text_input.handle_event(dg.KeyEvent("!"))
     assert str(text_input) == "hell!o"
 
+def test_text_input_draw(root_module):
+    """Tests that the text field draws its text and cursor."""
+    text_input = dg.modules.TextInputModule(root_module, box=(0, 0, 1, 10), start_text="hi")
+    text_input.draw()
+    assert "".join(map(chr, text_input.grid.chars[0, :3].astype(int))) == "hi "
+    assert np.array_equal(text_input.grid.bg[0, 2], (255, 255, 255))
+
+def test_text_area_editing(root_module):
+    """Tests typing, line splitting and joining in a TextAreaModule."""
+    area = dg.modules.TextAreaModule(root_module, box=(0, 0, 3, 10), text="one\ntwo")
+    area.handle_event(dg.KeyEvent("KEY_END"))
+    area.handle_event(dg.KeyEvent("\n"))
+    for key in "new":
+        area.handle_event(dg.KeyEvent(key))
+    assert area.text == "one\nnew\ntwo"
+    assert area.cursor == (1, 3)
+
+    area.handle_event(dg.KeyEvent("KEY_HOME"))
+    area.handle_event(dg.KeyEvent("backspace"))
+    assert area.text == "onenew\ntwo"
+    assert area.cursor == (0, 3)
+    area.handle_event(dg.KeyEvent("KEY_DOWN"))
+    area.handle_event(dg.KeyEvent("left"))
+    area.handle_event(dg.KeyEvent("KEY_DELETE"))
+    assert area.text == "onenew\ntw"
+
+def test_text_area_viewport(root_module):
+    """Tests that only visible lines are drawn and the view follows the cursor."""
+    area = dg.modules.TextAreaModule(root_module, box=(0, 0, 3, 5), text="\n".join(f"line{i}" for i in range(100000)))
+    area.handle_event(dg.KeyEvent("KEY_PAGEDOWN"))
+    area.handle_event(dg.KeyEvent("KEY_PAGEDOWN"))
+    assert area.cursor == (6, 0)
+    assert area.top == 4
+    area.draw()
+    assert "".join(map(chr, area.grid.chars[0].astype(int))) == "line4"
+
+    area.handle_event(dg.MouseEvent(5, True, (0, 0)))
+    assert area.top == 7
+    area.handle_event(dg.MouseEvent(1, True, (1, 2)))
+    assert area.cursor == (8, 2)
+
+def test_list_view_renders_visible_rows(root_module):
+    """Tests that a ListView only renders rows in view, through its cache."""
+    rendered = []
+    def render(item):
+        rendered.append(item)
+        return f"#{item}"
+
+    view = dg.modules.ListView(root_module, box=(0, 0, 3, 6), source=lambda i: i * 10, length=50000, render=render, cache_size=4)
+    view.draw()
+    assert rendered == [0, 10, 20]
+    assert "".join(map(chr, view.grid.chars[1].astype(int))) == "#10   "
+    assert np.array_equal(view.grid.bg[0], [(255, 255, 255)] * 6)
+
+    view.draw()
+    assert len(rendered) == 3
+    view.invalidate()
+    view.draw()
+    assert len(rendered) == 6
+    assert len(view._rows) <= 4
+
+def test_list_view_callable_needs_length(root_module):
+    """Tests that a function source without a length is rejected."""
+    with pytest.raises(ValueError):
+        dg.modules.ListView(root_module, source=lambda i: i)
+
+def test_list_view_scrolling(root_module):
+    """Tests keyboard selection, wheel scrolling and activation."""
+    selected = []
+    view = dg.modules.ListView(root_module, box=(0, 0, 4, 8), source=[f"song {i}" for i in range(100)], select_fn=selected.append, smoothing=1)
+    view.handle_event(dg.KeyEvent("KEY_PAGEDOWN"))
+    view.handle_event(dg.KeyEvent("down"))
+    assert view.selected == 5
+    assert view.target_top == 2
+    view.tick()
+    assert view.top == 2
+
+    view.handle_event(dg.MouseEvent(5, True, (0, 0)))
+    view.tick()
+    view.handle_event(dg.MouseEvent(1, True, (1, 0)))
+    assert selected == [6]
+    view.handle_event(dg.KeyEvent("KEY_END"))
+    view.handle_event(dg.KeyEvent("\n"))
+    assert selected == [6, 99]
+    assert view.target_top == 96
+
+def test_list_view_smooth_scroll(root_module):
+    """Tests that scrolling moves part of the way on each tick."""
+    view = dg.modules.ListView(root_module, box=(0, 0, 4, 8), source=range(100), smoothing=0.5)
+    view.scroll(8)
+    view.tick()
+    assert view.top == 4
+    for _ in range(4):
+        view.tick()
+    assert view.top == 8
+
+def test_scroll_view(root_module):
+    """Tests that a ScrollView shows the scrolled part of its content."""
+    view = dg.modules.ScrollView(root_module, box=(0, 0, 2, 4), content_shape=(10, 6), smoothing=1)
+    view.content.print("abcdef" * 10)
+    view.content.chars[5, :] = ord("z")
+    view.handle_event(dg.KeyEvent("KEY_PAGEDOWN"))
+    view.handle_event(dg.KeyEvent("KEY_PAGEDOWN"))
+    view.handle_event(dg.KeyEvent("KEY_RIGHT"))
+    view.tick()
+    view.draw()
+    assert "".join(map(chr, view.grid.chars[0].astype(int))) == "bcde"
+    assert "".join(map(chr, view.grid.chars[1].astype(int))) == "zzzz"
+
+def row_text(grid, i):
+    """Returns the characters of one grid row as a string."""
+    return "".join(map(chr, grid.chars[i].astype(int)))
+
+def test_log_view_follows_file(tmp_path, mocker, make_grid):
+    """Tests that a LogViewModule scrolls in only the new lines of a log."""
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"msg {i}\n" for i in range(10)))
+    grid = make_grid((3, 8))
+    log = dg.modules.LogViewModule(dg.Module(grid=grid), source=path)
+    log.draw()
+    assert [row_text(grid, i) for i in range(3)] == ["msg 7   ", "msg 8   ", "msg 9   "]
+
+    with open(path, "a") as f:
+        f.write("msg 10\nmsg")
+    write_rows = mocker.spy(log, "_write_rows")
+    log.tick()
+    log.draw()
+    assert write_rows.call_args.args[0] == 1
+    assert [row_text(grid, i) for i in range(3)] == ["msg 9   ", "msg 10  ", "msg     "]
+
+    with open(path, "a") as f:
+        f.write(" 11")
+    log.tick()
+    log.draw()
+    assert write_rows.call_args.args[0] == 2
+    assert row_text(grid, 2) == "msg 11  "
+
+    log.handle_event(dg.KeyEvent("KEY_HOME"))
+    assert not log.follow
+    log.draw()
+    assert row_text(grid, 0) == "msg 0   "
+    log.index.close()
+
+def test_log_view_from_generator(root_module):
+    """Tests that lines from a generator are spooled and shown."""
+    log = dg.modules.LogViewModule(root_module, box=(0, 0, 2, 10), source=(f"gen {i}" for i in range(100)))
+    log._reader.join()
+    log.tick()
+    assert len(log.index) == 100
+    assert log.top == 98
+    assert log.index.lines(98, 2) == ["gen 98", "gen 99"]
+
+def test_log_view_close(root_module):
+    """Tests that closing a viewer stops spooling and releases its files."""
+    lines = queue.Queue()
+    log = dg.modules.LogViewModule(root_module, box=(0, 0, 2, 10), source=iter(lines.get, None))
+    spool = log._spool_file
+    log.close()
+    assert spool.closed
+    assert log.paused
+    lines.put("late")
+    lines.put(None)
+    log._reader.join(5)
+    assert not log._reader.is_alive()
+
+def test_table_module(root_module):
+    """Tests that a TableModule draws a header and formatted, clipped columns."""
+    table = dg.modules.TableModule(root_module, box=(0, 0, 3, 12), columns=[
+        dg.modules.TableColumn("name", 5, "<"),
+        dg.modules.TableColumn("score", 6, decimals=1, fg=(0, 255, 0)),
+        dg.modules.TableColumn("hidden", 4),
+    ])
+    table.update({"name": ["ann", "bob", "cy"], "score": [9.25, 120.0, -3.0], "hidden": [1, 2, 3]})
+    table.draw()
+    assert [row_text(table.grid, i) for i in range(3)] == ["name   score", "ann      9.2", "bob    120.0"]
+    assert table.grid.attrs[0, 0] == dg.TA_BOLD
+    assert np.array_equal(table.grid.fg[1, 7], (0, 255, 0))
+
+    table.handle_event(dg.KeyEvent("KEY_END"))
+    table.draw()
+    assert table.top == 1
+    assert row_text(table.grid, 2) == "cy      -3.0"
+
 def test_fps_meter(root_module):
     fps_meter = dg.modules.FPSMeter(root_module, box=(0,0,1,8))
     fps_meter.draw()
@@ -197,4 +381,210 @@ def test_button_trigger(root_module, mocker):
 
     # Match up
     trigger.handle_event(dg.MouseEvent(button=1, state=False))
-    up_cb.assert_called_once()
\ No newline at end of file
+    up_cb.assert_called_once()
+
+def test_array_draw_module(root_module):
+    arr = np.arange(4 * 20 * 3, dtype=np.uint8).reshape(4, 20, 3)
+    module = dg.modules.ArrayDrawModule(root_module, box=(0, 0, 2, 20))
+    module.update(arr)
+    assert np.all(module.grid.chars == ord("▀"))
+    assert np.array_equal(module.grid.fg, arr[0::2])
+    assert np.array_equal(module.grid.bg, arr[1::2])
+
+def test_array_draw_module_upscales_pixels(root_module):
+    arr = np.array([[[10, 0, 0], [20, 0, 0]], [[30, 0, 0], [40, 0, 0]]], dtype=np.uint8)
+    module = dg.modules.ArrayDrawModule(root_module, box=(0, 0, 2, 4), res=2)
+    module.update(arr)
+    expected = np.repeat(np.repeat(arr, 2, axis=0), 2, axis=1)
+    assert np.array_equal(module.grid.fg, expected[0::2])
+    assert np.array_equal(module.grid.bg, expected[1::2])
+
+def test_array_draw_module_odd_height(root_module):
+    arr = np.full((3, 4, 3), 200, dtype=np.uint8)
+    module = dg.modules.ArrayDrawModule(root_module, box=(0, 0, 3, 4))
+    module.grid.chars[:] = ord(".")
+    module.update(arr)
+    assert np.all(module.grid.fg[:2] == 200)
+    assert np.all(module.grid.bg[0] == 200)
+    assert np.all(module.grid.bg[1] == 0)
+    assert np.all(module.grid.chars[2] == ord("."))
+
+def test_array_draw_module_skip_unchanged(root_module):
+    arr = np.zeros((4, 4, 3), dtype=np.uint8)
+    module = dg.modules.ArrayDrawModule(root_module, box=(0, 0, 2, 4), skip_unchanged=True)
+    module.update(arr)
+    module.grid.chars[:] = ord(".")
+    arr[3, 1] = (50, 0, 0)
+    module.update(arr)
+    assert np.all(module.grid.chars[0] == ord("."))
+    assert np.all(module.grid.chars[1] == ord("▀"))
+    assert np.array_equal(module.grid.bg[1, 1], (50, 0, 0))
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+def _wait_for_queue(video, n):
+    deadline = time.time() + 2
+    while video._queue.qsize() < n and time.time() < deadline:
+        time.sleep(0.001)
+
+def test_video_module_plays_in_time(root_module):
+    frames = np.arange(5 * 4 * 2 * 3, dtype=np.uint8).reshape(5, 4, 2, 3)
+    clock = FakeClock()
+    video = dg.modules.VideoModule(root_module, box=(0, 0, 2, 2), source=frames, fps=10, prefetch=2, clock=clock)
+    video.play()
+    _wait_for_queue(video, 2)
+    video.tick()
+    assert video.index == 0
+    video.draw()
+    assert np.array_equal(video.grid.fg, frames[0, 0::2])
+
+    clock.t = 0.05
+    video.tick()
+    assert video.index == 0
+    video.close()
+
+def test_video_module_drops_late_frames(root_module):
+    clock = FakeClock()
+    video = dg.modules.VideoModule(root_module, box=(0, 0, 1, 1), source=(np.full((2, 1, 3), i, dtype=np.uint8) for i in range(6)), fps=10, prefetch=8, clock=clock)
+    video.play()
+    _wait_for_queue(video, 7)
+    clock.t = 0.35
+    video.tick()
+    assert video.index == 3
+    assert video.dropped == 3
+    assert video.frame[0, 0, 0] == 3
+
+    clock.t = 10
+    video.tick()
+    assert video.index == 5
+    assert video.finished
+    video.close()
+
+def test_video_module_memmap_source(root_module, tmp_path):
+    path = tmp_path / "frames.rgb"
+    frames = np.random.default_rng(1).integers(0, 256, (3, 2, 2, 3), dtype=np.uint8)
+    frames.tofile(path)
+    clock = FakeClock()
+    video = dg.modules.VideoModule(root_module, box=(0, 0, 1, 2), source=str(path), frame_shape=(2, 2), fps=1, clock=clock)
+    video.play()
+    _wait_for_queue(video, 4)
+    clock.t = 2
+    video.tick()
+    assert video.index == 2
+    assert np.array_equal(video.frame, frames[2])
+    video.close()
+
+def test_array_draw_module_subcell_mode(root_module):
+    arr = np.zeros((4, 4, 3), dtype=np.uint8)
+    arr[:2, :2] = 255
+    module = dg.modules.ArrayDrawModule(root_module, box=(0, 0, 1, 2), mode="braille")
+    module.update(arr)
+    assert module.grid.chars[0, 0] == 0x2800 + 0x1b
+    assert module.grid.chars[0, 1] == 0x2800
+
+def test_bar_chart_module(root_module):
+    chart = dg.modules.BarChartModule(root_module, box=(0, 0, 4, 6), bar_width=2, gap=1, colors=[(255, 0, 0), (0, 255, 0)])
+    assert chart.n_bars == 2
+    chart.update([0.5, 0.25 + 1 / 32])
+    chart.draw()
+    chars = chart.grid.chars
+    # Bars grow up from the bottom row.
+    assert np.all(chars[2:, 0:2] == ord("█"))
+    assert np.all(chars[:2, 0:2] == ord(" "))
+    assert np.all(chars[:, 2] == ord(" "))
+    assert np.all(chars[3, 3:5] == ord("█"))
+    assert np.all(chars[2, 3:5] == ord("▁"))
+    assert np.array_equal(chart.grid.fg[3, 0], (255, 0, 0))
+    assert np.array_equal(chart.grid.fg[2, 3], (0, 255, 0))
+
+def test_bar_chart_module_down(root_module):
+    chart = dg.modules.BarChartModule(root_module, box=(0, 0, 2, 1), direction=0, colors=(9, 9, 9))
+    chart.update([0.25])
+    chart.draw()
+    # A half-filled top cell uses an inverted lower-half block.
+    assert chart.grid.chars[0, 0] == ord("▄")
+    assert np.array_equal(chart.grid.bg[0, 0], (9, 9, 9))
+    assert np.array_equal(chart.grid.fg[0, 0], (0, 0, 0))
+    # An empty cell is a full block in the background color.
+    assert chart.grid.chars[1, 0] == ord("█")
+    assert np.array_equal(chart.grid.fg[1, 0], (0, 0, 0))
+
+def test_bar_chart_module_peaks(root_module):
+    chart = dg.modules.BarChartModule(root_module, box=(0, 0, 4, 1), peak_hold=1, peak_fall=0.25, peak_color=(1, 2, 3))
+    chart.update([1.0])
+    chart.update([0.0])
+    chart.draw()
+    assert chart.grid.chars[0, 0] == ord("▔")
+    assert np.array_equal(chart.grid.fg[0, 0], (1, 2, 3))
+    chart.update([0.0])
+    chart.draw()
+    assert chart.grid.chars[0, 0] == ord(" ")
+    assert chart.grid.chars[1, 0] == ord("▔")
+
+def test_bar_module(root_module):
+    bar = dg.modules.BarModule(root_module, box=(0, 0, 1, 4), direction=1)
+    bar.update(0, 1.5, (255, 0, 0))
+    bar.draw()
+    assert bar.grid.chars[0, 0] == ord(" ")
+    assert np.array_equal(bar.grid.bg[0, 0], (255, 0, 0))
+    assert bar.grid.chars[0, 1] == ord("▌")
+    assert np.array_equal(bar.grid.fg[0, 1], (255, 0, 0))
+
+def test_bar_module_redraws_only_dirty_cells(root_module):
+    bar = dg.modules.BarModule(root_module, box=(0, 0, 1, 4), direction=1)
+    bar.update(0, 4, (255, 0, 0))
+    bar.draw()
+    bar.grid.chars[:] = ord(".")
+    bar.update(2.5, 3, (0, 0, 255))
+    bar.draw()
+    assert np.array_equal(bar.grid.chars[0], [ord("."), ord("."), ord("▌"), ord(".")])
+
+    bar.invalidate()
+    bar.draw()
+    assert bar.grid.chars[0, 0] == ord(" ")
+
+def test_module_reflow(make_grid):
+    """Tests that reflowing re-derives SubGrids, keeping edge-relative boxes."""
+    grid = make_grid((6, 10))
+    root = dg.Module(grid=grid)
+    child = dg.Module(root, (1, 2, -1, -2))
+    bars = dg.modules.BarChartModule(child, bar_width=2)
+    assert child.shape == (4, 6)
+
+    grid.resize((8, 14))
+    root.reflow(grid)
+    assert child.shape == (6, 10)
+    assert child.box == (1, 2, 7, 12)
+    assert bars.shape == (6, 10)
+    assert bars.length == 6
+    bars.update(np.ones(bars.n_bars))
+    bars.draw()
+    assert np.all(grid.chars[1:7, 2:4] == ord("█"))
+
+def test_main_module_resize(mocker, make_grid):
+    """Tests that a resizable MainModule follows resize events in one pass."""
+    main = dg.MainModule((4, 10), mode="terminal", resizable=True)
+    main.grid = make_grid((4, 10))
+    child = dg.Module(main, (0, 0, -1, 10))
+    child.reflow()
+    main.grid.events = mocker.Mock(return_value=[dg.ResizeEvent((6, 12))])
+    main.tick()
+    assert main.shape == main.real_shape == (6, 12)
+    assert child.shape == (5, 10)
+    child.grid.print("x")
+    assert main.grid.chars[0, 0] == ord("x")
+
+def test_main_module_enforce_shape(mocker):
+    """Tests that a fixed-shape MainModule only records the new shape."""
+    main = dg.MainModule((4, 10), mode="terminal")
+    main.grid.events = mocker.Mock(return_value=[dg.ResizeEvent((6, 12)), dg.KeyEvent("a")])
+    handle = mocker.patch.object(main, "handle_event")
+    main.tick()
+    assert main.real_shape == (6, 12)
+    assert main.shape == (4, 10)
+    handle.assert_not_called()
@@ -0,0 +1,41 @@
+"""Tests for the palette.py module."""
+
+import numpy as np
+import pytest
+
+from display_grid import palette
+
+def test_xterm_palette():
+    """Tests a few well-known entries of the xterm 256-color palette."""
+    assert palette.XTERM_PALETTE.shape == (256, 3)
+    assert tuple(palette.XTERM_PALETTE[16]) == (0, 0, 0)
+    assert tuple(palette.XTERM_PALETTE[196]) == (255, 0, 0)
+    assert tuple(palette.XTERM_PALETTE[231]) == (255, 255, 255)
+    assert tuple(palette.XTERM_PALETTE[232]) == (8, 8, 8)
+
+@pytest.mark.parametrize("color, depth, expected", [
+    ((255, 0, 0), 256, 196),
+    ((0, 0, 0), 256, 16),
+    ((255, 255, 255), 256, 231),
+    ((118, 118, 118), 256, 243),
+    ((255, 0, 0), 16, 9),
+    ((0, 0, 0), 16, 0),
+    ((200, 0, 200), 16, 5),
+])
+def test_quantize_nearest(color, depth, expected):
+    """Tests that colors map to their nearest palette entry."""
+    assert palette.quantize(np.array(color, dtype=np.uint8), depth) == expected
+
+def test_quantize_plane_shape():
+    """Tests that a whole color plane is mapped at once."""
+    plane = np.random.default_rng(0).integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    indices = palette.quantize(plane)
+    assert indices.shape == (5, 7)
+    assert indices.dtype == np.uint8
+    assert np.all(indices >= 16)
+
+def test_quantize_dither_breaks_up_bands():
+    """Tests that dithering a flat in-between color mixes palette entries."""
+    plane = np.full((4, 4, 3), (115, 115, 115), dtype=np.uint8)
+    assert len(np.unique(palette.quantize(plane, 256))) == 1
+    assert len(np.unique(palette.quantize(plane, 256, dither=True))) > 1
@@ -22,8 +22,10 @@ def mock_pygame(mocker):
     mock_font_instance.render.return_value = mock_surface # Return a surface-like object
     mock_font = mocker.Mock(return_value=mock_font_instance)
     
-    # Mock pg.font.SysFont
+    # Mock pg.font.SysFont, and the lookup PygameGrid uses instead
     mocker.patch("pygame.font.SysFont", mock_font)
+    mocker.patch("pygame.font.Font", mock_font)
+    mocker.patch("pygame.font.match_font", return_value=None)
     
     # Mock pg.key.get_mods
     mocker.patch("pygame.key.get_mods", return_value=0)
@@ -123,4 +125,50 @@ def test_pygame_grid_events(mocker, mock_pygame):
     assert isinstance(mouse_event, dg.MouseEvent)
     assert mouse_event.button == 1
     assert mouse_event.state is True
-    assert mouse_event.pos == (5, 12)
\ No newline at end of file
+    assert mouse_event.pos == (5, 12)
+
+@pytest.fixture
+def font_cache(mocker, tmp_path):
+    """Empties the font caches and points the cache file at a temporary path."""
+    from display_grid import pygame_grid
+    mocker.patch.object(pygame_grid, "_font_paths", {})
+    mocker.patch.object(pygame_grid, "_font_metrics", {})
+    mocker.patch.object(pygame_grid, "_loaded_cache_path", None)
+    mocker.patch.object(pygame_grid, "FONT_CACHE_PATH", str(tmp_path / "fonts.json"))
+    font = mocker.Mock()
+    font.metrics.return_value = [(1, 9, 0, 12, 8)]
+    font.get_descent.return_value = -3
+    font.get_linesize.return_value = 15
+    mocker.patch("pygame.font.Font", return_value=font)
+    match = mocker.patch("pygame.font.match_font", return_value=str(tmp_path))
+    return pygame_grid, match
+
+def test_font_metrics_cached(font_cache, tmp_path):
+    """Tests that fonts are scanned for and measured only once."""
+    pygame_grid, match = font_cache
+    assert pygame_grid.font_metrics("mono", 24) == (1, 4, 9, 19)
+    assert pygame_grid.font_metrics("mono", 24) == (1, 4, 9, 19)
+    assert pygame_grid.find_font("mono") == str(tmp_path)
+    assert match.call_count == 1
+    assert pygame.font.Font.call_count == 1
+
+def test_font_cache_file(font_cache, mocker):
+    """Tests that a new process can use the font cache file without scanning."""
+    pygame_grid, match = font_cache
+    metrics = pygame_grid.font_metrics("mono", 24)
+
+    mocker.patch.object(pygame_grid, "_font_paths", {})
+    mocker.patch.object(pygame_grid, "_font_metrics", {})
+    mocker.patch.object(pygame_grid, "_loaded_cache_path", None)
+    match.reset_mock()
+    pygame.font.Font.reset_mock()
+    assert pygame_grid.font_metrics("mono", 24) == metrics
+    match.assert_not_called()
+    pygame.font.Font.assert_not_called()
+
+def test_font_cache_stale_path(font_cache, tmp_path):
+    """Tests that a cached font that no longer exists is looked up again."""
+    pygame_grid, match = font_cache
+    pygame_grid._font_paths["mono"] = str(tmp_path / "removed.ttf")
+    assert pygame_grid.find_font("mono") == str(tmp_path)
+    assert match.call_count == 1
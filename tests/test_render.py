@@ -0,0 +1,46 @@
+"""Tests for the render.py module."""
+
+import time
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+
+@pytest.fixture
+def remote_grid(mocker):
+    """Provides a RemoteGrid whose render process is not started."""
+    mocker.patch("multiprocessing.Process")
+    grid = dg.render.RemoteGrid((3, 6))
+    yield grid
+    grid.close()
+
+def test_remote_grid_draw_presents_frame(remote_grid, make_grid):
+    """Tests that draw copies the frame to shared memory and signals it."""
+    remote_grid.print("frame", pos=(1, 0), fg=(9, 8, 7))
+    assert np.all(remote_grid.shared.chars == ord(" "))
+    version = remote_grid.shared.version
+
+    remote_grid.draw()
+    assert remote_grid._frame_ready.is_set()
+    assert remote_grid.shared.version == version + 2
+    out = make_grid((3, 6))
+    assert remote_grid.shared.read_into(out)
+    assert "".join(map(chr, out.chars[1, :5])) == "frame"
+    assert np.array_equal(out.fg[1, 0], (9, 8, 7))
+
+def test_remote_grid_events(remote_grid):
+    """Tests that forwarded events are returned in order."""
+    remote_grid.process.is_alive.return_value = True
+    remote_grid._events.put(dg.KeyEvent("a", dg.KM_NONE))
+    remote_grid._events.put(dg.MouseEvent(1, True, (2, 3), dg.KM_NONE))
+    deadline = time.monotonic() + 5
+    events = []
+    while len(events) < 2 and time.monotonic() < deadline:
+        events += remote_grid.events()
+    assert events == [dg.KeyEvent("a", dg.KM_NONE), dg.MouseEvent(1, True, (2, 3), dg.KM_NONE)]
+    assert remote_grid.get_real_shape() == (3, 6)
+
+    remote_grid.process.is_alive.return_value = False
+    with pytest.raises(SystemExit):
+        remote_grid.events()
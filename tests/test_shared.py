@@ -0,0 +1,62 @@
+"""Tests for the shared.py module."""
+
+import mmap
+import multiprocessing
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+
+@pytest.fixture
+def shared_grid():
+    """Provides a 4x8 SharedGrid in a shared memory block."""
+    grid = dg.shared.SharedGrid.create((4, 8), slots=2)
+    yield grid
+    grid.close()
+    grid.unlink()
+
+def test_shared_grid_over_mmap():
+    """Tests that a grid attached to an existing buffer keeps its contents."""
+    buf = mmap.mmap(-1, dg.shared.SharedGrid.nbytes((3, 5)))
+    grid = dg.shared.SharedGrid(buf, (3, 5))
+    assert np.all(grid.chars == ord(" "))
+    sub = dg.SubGrid(grid, 1, 1, 2, 4)
+    sub.print("abc", fg=(1, 2, 3))
+
+    other = dg.shared.SharedGrid(buf)
+    assert other.shape == (3, 5)
+    assert "".join(map(chr, other.chars[1, 1:4])) == "abc"
+    assert np.array_equal(other.fg[1, 2], (1, 2, 3))
+
+def _produce(name, slot, text):
+    """Writes text into one row of a shared grid from another process."""
+    grid = dg.shared.SharedGrid.attach(name)
+    with grid.writing(slot):
+        grid.print(text, pos=(slot, 0), fg=(0, 255, 0))
+    grid.close()
+
+def test_shared_grid_across_processes(shared_grid, make_grid):
+    """Tests that writes from producer processes are seen by the reader."""
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_produce, args=(shared_grid.name, slot, f"slot{slot}")) for slot in range(2)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+
+    out = make_grid((4, 8))
+    assert shared_grid.read_into(out)
+    assert "".join(map(chr, out.chars[1, :5])) == "slot1"
+    assert np.array_equal(out.fg[0, 0], (0, 255, 0))
+    assert shared_grid.version == 4
+
+def test_shared_grid_torn_read(shared_grid, make_grid):
+    """Tests that a read during a write is reported as inconsistent."""
+    out = make_grid((4, 8))
+    with shared_grid.writing(1):
+        shared_grid.print("half", pos=(0, 0))
+        assert not shared_grid.read_into(out, retries=3)
+    assert shared_grid.read_into(out)
+    assert out.chars[0, 0] == ord("h")
@@ -0,0 +1,85 @@
+"""Tests for the stream.py module."""
+
+import socket
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+
+def assert_grids_equal(a, b):
+    """Asserts that two grids hold the same cells."""
+    assert np.array_equal(a.chars, b.chars)
+    assert np.array_equal(a.colors, b.colors)
+    assert np.array_equal(a.attrs, b.attrs)
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_encode_decode_round_trip(compress, make_grid):
+    """Tests that decoded frames match the encoded grid."""
+    src, dst = make_grid(), make_grid()
+    encoder, decoder = dg.stream.FrameEncoder(compress=compress), dg.stream.FrameDecoder()
+    src.print("Hello", pos=(1, 2), fg=(255, 0, 0), bg=(0, 0, 64), attrs=dg.TA_BOLD)
+    assert decoder.decode(encoder.encode(src), dst)
+    assert_grids_equal(src, dst)
+
+    src.print("世界", pos=(4, 8), fg=(1, 2, 3))
+    src.fill(bg=(9, 9, 9))
+    assert decoder.decode(encoder.encode(src), dst)
+    assert_grids_equal(src, dst)
+
+def test_delta_only_sends_changes(make_grid):
+    """Tests that deltas are much smaller than keyframes."""
+    grid = make_grid((50, 100))
+    encoder = dg.stream.FrameEncoder()
+    keyframe = encoder.encode(grid)
+    grid.print("x", pos=(10, 10))
+    delta = encoder.encode(grid)
+    assert len(delta) < 50 < len(keyframe)
+    assert not delta[2] & dg.stream.FLAG_KEYFRAME
+
+def test_keyframe_interval(make_grid):
+    """Tests that keyframes are sent periodically and on request."""
+    grid = make_grid()
+    encoder = dg.stream.FrameEncoder(keyframe_interval=3)
+    flags = [encoder.encode(grid)[2] & dg.stream.FLAG_KEYFRAME for _ in range(7)]
+    assert [bool(f) for f in flags] == [True, False, False, True, False, False, True]
+
+    encoder.request_keyframe()
+    assert encoder.encode(grid)[2] & dg.stream.FLAG_KEYFRAME
+
+def test_decoder_waits_for_keyframe(make_grid):
+    """Tests that deltas before the first keyframe are ignored."""
+    grid = make_grid()
+    encoder = dg.stream.FrameEncoder()
+    encoder.encode(grid)
+    grid.print("late", pos=(0, 0))
+    dst = make_grid()
+    decoder = dg.stream.FrameDecoder()
+    assert not decoder.decode(encoder.encode(grid), dst)
+    assert dst.chars[0, 0] == ord(" ")
+    with pytest.raises(ValueError):
+        decoder.decode(b"XX" + bytes(10), dst)
+
+def test_streamer_over_socket(mocker, make_grid):
+    """Tests mirroring a grid's draws to another grid over a socket pair."""
+    a, b = socket.socketpair()
+    with a, b, a.makefile("wb") as out, b.makefile("rb") as inp:
+        src, dst = make_grid(), make_grid()
+        streamer = dg.stream.FrameStreamer(src, out)
+        mocker.patch.object(dst, "draw")
+        decoder = dg.stream.FrameDecoder()
+
+        src.print("one", pos=(0, 0))
+        src.draw()
+        src.print("two", pos=(2, 3), fg=(0, 255, 0))
+        src.draw()
+        assert decoder.receive(inp, dst)
+        assert decoder.receive(inp, dst)
+        assert_grids_equal(src, dst)
+        assert dst.draw.call_count == 2
+
+        streamer.detach()
+        src.draw()
+        out.close()
+        a.shutdown(socket.SHUT_WR)
+        assert not decoder.receive(inp, dst)
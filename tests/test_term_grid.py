@@ -1,5 +1,7 @@
 """Tests for the term_grid.py module."""
 
+import os
+
 import pytest
 import numpy as np
 import display_grid as dg
@@ -12,6 +14,15 @@ def mock_urwid_screen(mocker):
     screen.get_input.return_value = []
     return screen
 
+@pytest.fixture
+def output():
+    """Provides a pipe to draw into and a function reading what was drawn."""
+    r, w = os.pipe()
+    os.set_blocking(r, False)
+    yield w, lambda: os.read(r, 1 << 20)
+    os.close(r)
+    os.close(w)
+
 def test_term_grid_init(mock_urwid_screen):
     """Tests the TermGrid constructor."""
     grid = dg.TermGrid(mock_urwid_screen)
@@ -30,16 +41,136 @@ def test_term_grid_get_real_shape(mock_urwid_screen):
     grid = dg.TermGrid(mock_urwid_screen)
     assert grid.get_real_shape() == (24, 80)
 
-def test_term_grid_draw(mock_urwid_screen, mocker):
-    """Tests the draw method to ensure it calls the screen's draw_screen."""
-    mocker.patch('urwid.Text')
-    grid = dg.TermGrid(mock_urwid_screen, shape=(2, 3))
+def test_term_grid_draw(mock_urwid_screen, output):
+    """Tests that draw writes the frame to the output in one piece."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(2, 3), profile=dg.ansi.TermProfile(depth=2**24), fd=fd)
     grid.print("Hi", pos=(0, 0))
     grid.draw()
     
-    mock_urwid_screen.draw_screen.assert_called_once()
-    # We can do more detailed checks on the markup if needed,
-    # but this confirms the core drawing call is made.
+    frame = read()
+    assert b"\x1b[H" in frame
+    assert b"\x1b[0;38;2;255;255;255;48;2;0;0;0mHi " in frame
+    assert frame.endswith(b"\x1b[0m")
+    assert grid.frame_bytes == len(frame)
+    assert grid.total_bytes == len(frame)
+    mock_urwid_screen.flush.assert_called()
+
+def test_term_grid_draw_sync_update(mock_urwid_screen, output):
+    """Tests that frames are wrapped in synchronized updates when supported."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(1, 1), profile=dg.ansi.TermProfile(sync_update=True), fd=fd)
+    grid.draw()
+    frame = read()
+    assert frame.startswith(b"\x1b[?2026h")
+    assert frame.endswith(b"\x1b[?2026l")
+
+    plain = dg.TermGrid(mock_urwid_screen, shape=(1, 1), profile=dg.ansi.TermProfile(), fd=fd)
+    plain.draw()
+    assert b"2026" not in read()
+
+def test_term_grid_draw_style_runs(mock_urwid_screen, output):
+    """Tests that one SGR sequence is written per run of equal style."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(1, 4), profile=dg.ansi.TermProfile(depth=256), fd=fd)
+    grid.fill("x", (255, 0, 0), (0, 0, 0))
+    grid.print("yé", pos=(0, 2), fg=(255, 255, 255), attrs=dg.TA_BOLD)
+    grid.draw()
+
+    assert "\x1b[0;38;5;196;48;5;16mxx\x1b[1;38;5;231myé".encode() in read()
+
+def test_term_grid_draw_wide_chars(mock_urwid_screen, output):
+    """Tests that the cell covered by a wide character is not written."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(1, 4), profile=dg.ansi.TermProfile(depth=16), fd=fd)
+    grid.print("世xab")
+    grid.draw()
+    assert "世ab".encode() in read()
+
+    narrow = dg.TermGrid(mock_urwid_screen, shape=(1, 4), profile=dg.ansi.TermProfile(depth=16, wide_chars=False), fd=fd)
+    narrow.print("世xab")
+    narrow.draw()
+    assert "世xab".encode() in read()
+
+def test_term_grid_draw_only_changes(mock_urwid_screen, output):
+    """Tests that redrawing only sends the cells that changed."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(3, 8), profile=dg.ansi.TermProfile(), fd=fd)
+    grid.draw()
+    read()
+
+    grid.draw()
+    assert grid.frame_bytes == 0
+
+    grid.print("ab", pos=(1, 3))
+    grid.draw()
+    frame = read()
+    assert b"\x1b[2;4H" in frame
+    assert frame.count(b"H") == 1
+    assert b"ab" in frame and b"   " not in frame
+
+    grid.invalidate()
+    grid.draw()
+    assert read().count(b"H") == 3
+
+def test_term_grid_draw_zero_width(mock_urwid_screen, output):
+    """Tests that zero-width and C1 control characters are written as spaces."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(2, 20), profile=dg.ansi.TermProfile(), fd=fd)
+    grid.fill("a")
+    grid.draw()
+    read()
+
+    grid.chars[0, 2] = 0x301
+    grid.chars[0, 10] = ord("X")
+    grid.draw()
+    frame = read()
+    assert "\u0301".encode() not in frame
+    assert frame.endswith(b"m \x1b[7CX" + dg.ansi.RESET)
+
+    codes = np.array([0x7F, 0x85, 0x20DD, 0x200B, ord("a")], dtype=np.int32)
+    assert dg.term_grid._printable(codes).tolist() == [32, 32, 32, 32, ord("a")]
+
+def test_term_grid_draw_scroll(mock_urwid_screen, output):
+    """Tests that scrolling the full width uses a terminal scroll region."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(4, 5), profile=dg.ansi.TermProfile(), fd=fd)
+    for i in range(4):
+        grid.print(str(i) * 5, pos=(i, 0))
+    grid.draw()
+    read()
+
+    grid.scroll(1)
+    grid.print("new!!", pos=(3, 0))
+    grid.draw()
+    frame = read()
+    assert b"\x1b[1;4r\x1b[1S\x1b[r" in frame
+    assert frame.count(b"H") == 1
+    assert b"\x1b[4H" in frame and b"new!!" in frame
+
+    grid.scroll(-1, region=(0, 1, 4, 5))
+    grid.draw()
+    frame = read()
+    assert b"\x1b[r" not in frame
+    assert frame.count(b"H") == 4
+
+def test_term_grid_draw_cursor_motion(mock_urwid_screen, output):
+    """Tests that the cheapest way between changed cells is used."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(3, 20), profile=dg.ansi.TermProfile(), fd=fd)
+    grid.draw()
+    read()
+
+    grid.print("a", pos=(0, 0))
+    grid.print("b", pos=(0, 2))
+    grid.print("c", pos=(0, 12))
+    grid.print("d", pos=(1, 12))
+    grid.draw()
+    frame = read()
+    # The one unchanged cell is rewritten, the larger gap is skipped over,
+    # and the next row is reached by a relative move.
+    assert frame.endswith(b"\x1b[H\x1b[0;38;5;231;48;5;16ma b\x1b[9Cc\x1b[B\x1b[Dd\x1b[0m")
+    assert frame.count(b"\x1b[0;") == 1
 
 def test_term_grid_events_key(mock_urwid_screen):
     """Tests keyboard event translation."""
@@ -80,3 +211,27 @@ def test_term_grid_events_mouse(mock_urwid_screen):
     assert events[1].state is False
     assert events[1].pos == (15, 20)
     assert events[1].mod == dg.KM_CTRL
+
+def test_term_grid_events_resize(mock_urwid_screen, output):
+    """Tests that a terminal resize is reported once and repaints everything."""
+    fd, read = output
+    grid = dg.TermGrid(mock_urwid_screen, shape=(2, 3), profile=dg.ansi.TermProfile(), fd=fd)
+    grid.draw()
+    read()
+    assert grid.get_real_shape() == (24, 80)
+    assert grid.get_real_shape() == (24, 80)
+    assert mock_urwid_screen.get_cols_rows.call_count == 1
+
+    mock_urwid_screen.get_cols_rows.return_value = (100, 30)
+    mock_urwid_screen.get_input.return_value = ["window resize"]
+    assert grid.events() == [dg.ResizeEvent((30, 100))]
+    assert grid.get_real_shape() == (30, 100)
+
+    grid.resize((3, 4))
+    assert grid.shape == (3, 4)
+    grid.draw()
+    data = read()
+    assert dg.ansi.ERASE_SCREEN in data
+    assert data.count(b" ") == 12
+    grid.draw()
+    assert grid.frame_bytes == 0
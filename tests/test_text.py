@@ -0,0 +1,138 @@
+"""Tests for the text.py module."""
+
+import random
+
+import numpy as np
+import pytest
+
+import display_grid as dg
+
+def test_gap_buffer_sequence():
+    """Tests that a GapBuffer behaves like a list."""
+    buf = dg.text.GapBuffer("hello")
+    assert len(buf) == 5
+    assert str(buf) == "hello"
+    assert buf[0] == "h" and buf[-1] == "o"
+    assert buf[1:3] == ["e", "l"]
+
+    buf.insert(2, "X")
+    assert str(buf) == "heXllo"
+    assert buf[1:4] == ["e", "X", "l"]
+    assert buf[::2] == ["h", "X", "l"]
+    buf[0] = "H"
+    assert buf.pop(0) == "H"
+    assert buf.delete(1, 10) == ["X", "l", "l", "o"]
+    assert list(buf) == ["e"]
+    with pytest.raises(IndexError):
+        buf[1]
+
+def test_gap_buffer_matches_list():
+    """Tests random edits against a list."""
+    rng = random.Random(0)
+    buf, ref = dg.text.GapBuffer(range(10)), list(range(10))
+    for n in range(2000):
+        i = rng.randint(0, len(ref))
+        if rng.random() < 0.6 or not ref:
+            buf.insert(i, n)
+            ref.insert(i, n)
+        elif i < len(ref):
+            assert buf.pop(i) == ref.pop(i)
+        if n % 100 == 0:
+            a, b = sorted(rng.randint(0, len(ref)) for _ in range(2))
+            assert buf[a:b] == ref[a:b]
+    assert list(buf) == ref
+
+def test_gap_buffer_insert_many():
+    """Tests inserting several items at once."""
+    buf = dg.text.GapBuffer(["a", "d"])
+    buf.insert_many(1, ["b", "c"])
+    buf.append("e")
+    assert str(buf) == "abcde"
+
+def test_line_index(tmp_path):
+    """Tests finding lines across index strides."""
+    path = tmp_path / "log.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    index = dg.text.LineIndex(path, stride=16)
+    assert len(index) == 1000
+    assert index.lines(0, 2) == ["line 0", "line 1"]
+    assert index.lines(517, 3) == ["line 517", "line 518", "line 519"]
+    assert index.lines(999, 5) == ["line 999"]
+    assert index.lines(1000, 5) == []
+    index.close()
+
+def test_line_index_growth(tmp_path):
+    """Tests indexing appended data, partial lines and truncation."""
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"")
+    index = dg.text.LineIndex(path, stride=4)
+    assert len(index) == 0
+
+    with open(path, "ab") as f:
+        f.write(b"a\tb\nsecond\r\nthi")
+    assert index.update() == 3
+    assert index.lines(0, 3) == ["a       b", "second", "thi"]
+    with open(path, "ab") as f:
+        f.write(b"rd\n" + b"".join(b"%d\n" % i for i in range(10)) + b"\xff\n")
+    assert index.update() == 11
+    assert index.lines(12, 2) == ["9", "�"]
+
+    path.write_bytes(b"new\n")
+    index.update()
+    assert len(index) == 1
+    assert index.lines(0, 5) == ["new"]
+    index.close()
+
+def rows(codes):
+    """Turns a block of character codes into a list of strings."""
+    return ["".join(map(chr, row)) for row in codes]
+
+def test_format_column_numbers():
+    """Tests vectorized integer and float formatting."""
+    assert rows(dg.text.format_column([1, -23, 456789, 0], 5)) == ["    1", "  -23", "#####", "    0"]
+    assert rows(dg.text.format_column([1.5, -0.25, 1234.567, float("nan")], 8, "<")) == [
+        "1.50    ", "-0.25   ", "1234.57 ", "nan     ",
+    ]
+    assert rows(dg.text.format_column([3.14159], 7, "^", decimals=3)) == [" 3.142 "]
+
+def test_format_column_strings():
+    """Tests string alignment and truncation."""
+    assert rows(dg.text.format_column(["ab", "toolongvalue", "é"], 6, "^")) == ["  ab  ", "toolo…", "  é   "]
+    assert dg.text.format_column([], 4).shape == (0, 4)
+
+def test_format_column_limits():
+    """Tests integers beyond int64 and zero-width columns."""
+    big = np.array([2**63 + 5, 7], dtype=np.uint64)
+    assert rows(dg.text.format_column(big, 25)) == ["#" * 25, " " * 24 + "7"]
+    low = np.array([np.iinfo(np.int64).min, -5], dtype=np.int64)
+    assert rows(dg.text.format_column(low, 25)) == ["#" * 25, " " * 23 + "-5"]
+    assert dg.text.format_column([1, 2], 0).shape == (2, 0)
+    assert dg.text.format_column(["a"], 0).shape == (1, 0)
+
+def test_layout_wrap_and_align():
+    """Tests word wrapping, alignment and breaking long words."""
+    assert rows(dg.text.layout("the quick brown fox", 10)) == ["the quick ", "brown fox "]
+    assert rows(dg.text.layout("the quick brown fox", 10, ">")) == [" the quick", " brown fox"]
+    assert rows(dg.text.layout("ab\nc", 4, "^")) == [" ab ", " c  "]
+    assert rows(dg.text.layout("abcdefghij", 4)) == ["abcd", "efgh", "ij  "]
+
+def test_layout_truncate():
+    """Tests ellipsis truncation without wrapping or past max_lines."""
+    assert rows(dg.text.layout("hello world", 8, wrap=False)) == ["hello w…"]
+    assert rows(dg.text.layout("one two three four", 8, max_lines=2)) == ["one two ", "three…  "]
+
+def test_layout_wide_chars():
+    """Tests that wide characters take two cells."""
+    block = dg.text.layout("世界 ok", 5)
+    assert rows(block) == ["世 界  ", "ok   "]
+    assert dg.text.text_width("世界 ok") == 7
+
+def test_layout_is_cached():
+    """Tests that layouts are memoized and read-only."""
+    assert dg.text.layout("cached", 10) is dg.text.layout("cached", 10)
+    assert not dg.text.layout("cached", 10).flags.writeable
+
+def test_layout_wide_char_in_narrow_line():
+    """Tests that a wide character too wide for the line becomes a space."""
+    assert rows(dg.text.layout("漢", 1)) == [" "]
+    assert rows(dg.text.layout("a漢b", 1)) == ["a", " ", "b"]